@@ -0,0 +1,182 @@
+"""Vectorised player performance analytics over columnar NumPy arrays."""
+import numpy as np
+import database
+import instrumentation
+
+PERFORMANCE_COLUMNS = [
+    'raid_start', 'encounter_id', 'boss', 'difficulty', 'player',
+    'player_class', 'spec', 'role', 'dps', 'hps', 'percentile',
+]
+
+@instrumentation.timed
+def load_performance(start_time, end_time, tenant=None):
+    """Load player_performance for a week or season into a dict of NumPy columns.
+
+    Text keys (boss, player, spec, ...) are object arrays, metrics are float arrays
+    with NaN for missing values. Rows stay in chronological order.
+    """
+    rows = database.get_performance_samples(start_time, end_time, tenant)
+    columns = list(zip(*rows)) if rows else [()] * len(PERFORMANCE_COLUMNS)
+    data = {}
+    for name, values in zip(PERFORMANCE_COLUMNS, columns):
+        if name in ('dps', 'hps', 'percentile'):
+            data[name] = np.array([np.nan if v is None else v for v in values], dtype=float)
+        elif name in ('raid_start', 'encounter_id'):
+            data[name] = np.array([-1 if v is None else v for v in values], dtype=np.int64)
+        else:
+            data[name] = np.array([v or '' for v in values], dtype=object)
+    return data
+
+def select(data, mask):
+    """Return a copy of the columns filtered by a boolean mask."""
+    return {name: values[mask] for name, values in data.items()}
+
+def group_index(*keys):
+    """Group rows by one or more key columns.
+
+    Returns (group_keys, inverse) where group_keys is an array of tuples (or plain
+    values for a single key) and inverse maps every row to its group number.
+    """
+    if len(keys) == 1:
+        return np.unique(keys[0].astype(str), return_inverse=True)
+    combined = keys[0].astype(str)
+    for key in keys[1:]:
+        combined = np.char.add(np.char.add(combined, '\x1f'), key.astype(str))
+    group_keys, inverse = np.unique(combined, return_inverse=True)
+    return np.array([tuple(k.split('\x1f')) for k in group_keys], dtype=object), inverse
+
+def group_quantiles(labels, values, quantiles=(0.0, 0.25, 0.5, 0.75, 1.0)):
+    """Compute per-group quantiles in one sort, ignoring NaNs.
+
+    Returns (group_labels, counts, table) where table has one row per group and one
+    column per requested quantile (linear interpolation, same as np.quantile).
+    """
+    mask = ~np.isnan(values)
+    labels, values = labels[mask], values[mask]
+    if values.size == 0:
+        return labels[:0], np.array([], dtype=int), np.empty((0, len(quantiles)))  # keeps the labels dtype
+
+    group_labels, group_idx = np.unique(labels, return_inverse=True)
+    order = np.lexsort((values, group_idx))
+    sorted_values = values[order]
+    counts = np.bincount(group_idx, minlength=len(group_labels))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    pos = starts[:, None] + np.asarray(quantiles)[None, :] * (counts[:, None] - 1)
+    lo = np.floor(pos).astype(int)
+    hi = np.ceil(pos).astype(int)
+    frac = pos - lo
+    table = sorted_values[lo] * (1 - frac) + sorted_values[hi] * frac
+    return group_labels, counts, table
+
+def group_mean_std(group_idx, values, n_groups):
+    """Per-group count, mean and population std via bincount, ignoring NaNs."""
+    mask = ~np.isnan(values)
+    idx, vals = group_idx[mask], values[mask]
+    counts = np.bincount(idx, minlength=n_groups)
+    sums = np.bincount(idx, weights=vals, minlength=n_groups)
+    sq_sums = np.bincount(idx, weights=vals * vals, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / counts
+        std = np.sqrt(np.maximum(sq_sums / counts - mean * mean, 0))
+    return counts, mean, std
+
+def spec_zscores(data, metric='dps'):
+    """Z-score every row's metric against its (boss, difficulty, spec) population.
+
+    Rows in a population of one, or with zero spread, get a z-score of 0.
+    """
+    values = data[metric]
+    group_keys, inverse = group_index(data['boss'], data['difficulty'], data['spec'])
+    _, mean, std = group_mean_std(inverse, values, len(group_keys))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = (values - mean[inverse]) / std[inverse]
+    z[~np.isnan(values) & ~np.isfinite(z)] = 0.0
+    return z
+
+def rolling_mean(group_idx, values, window=4):
+    """Trailing rolling mean of values within each group, in row order.
+
+    Each row gets the mean of the last `window` non-NaN values of its group up to
+    and including itself; NaN rows yield NaN.
+    """
+    n = values.size
+    if n == 0:
+        return np.array([], dtype=float)
+    valid = ~np.isnan(values)
+    order = np.lexsort((np.arange(n), group_idx))
+    g = group_idx[order]
+    v = np.where(valid, values, 0.0)[order]
+    c = valid[order].astype(float)
+
+    csum_v = np.cumsum(v)
+    csum_c = np.cumsum(c)
+    new_group = np.concatenate(([True], g[1:] != g[:-1]))
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(n), 0))
+
+    # Window start is `window` valid samples back, but never before the group start
+    lo = np.searchsorted(csum_c, csum_c - window, side='right')
+    lo = np.maximum(lo, group_start)
+    base_v = np.where(lo > 0, csum_v[lo - 1], 0.0)
+    base_c = np.where(lo > 0, csum_c[lo - 1], 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result_sorted = (csum_v - base_v) / (csum_c - base_c)
+    result_sorted[~valid[order]] = np.nan
+
+    result = np.empty(n, dtype=float)
+    result[order] = result_sorted
+    return result
+
+def player_metric_summary(data, metric='dps'):
+    """Summarise a metric per player: samples, median, p75, CV and mean spec z-score.
+
+    CV is computed on output relative to the (boss, difficulty) median so a player
+    isn't penalised for clearing both an easy and a hard DPS check in one week.
+    """
+    values = data[metric]
+    if not np.any(~np.isnan(values)):
+        return []
+    boss_keys, boss_idx = group_index(data['boss'], data['difficulty'])
+    boss_present, _, boss_q = group_quantiles(boss_idx, values, (0.5,))
+    boss_median = np.full(len(boss_keys), np.nan)
+    boss_median[boss_present] = boss_q[:, 0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        relative = values / boss_median[boss_idx]
+
+    players, player_idx = group_index(data['player'])
+    counts, rel_mean, rel_std = group_mean_std(player_idx, relative, len(players))
+    _, z_mean, _ = group_mean_std(player_idx, spec_zscores(data, metric), len(players))
+    sampled, _, quantiles = group_quantiles(player_idx, values, (0.5, 0.75))
+    first_row = np.zeros(len(players), dtype=int)
+    first_row[player_idx[::-1]] = np.arange(player_idx.size)[::-1]
+
+    summary = []
+    for i, q_row in zip(sampled, quantiles):
+        first = first_row[i]
+        summary.append({
+            'name': str(players[i]),
+            'class': data['player_class'][first],
+            'spec': data['spec'][first],
+            'samples': int(counts[i]),
+            'median': float(q_row[0]),
+            'p75': float(q_row[1]),
+            'cv': float(rel_std[i] / rel_mean[i]) if rel_mean[i] else float('nan'),
+            'z': float(z_mean[i]),
+        })
+    return summary
+
+@instrumentation.timed
+def get_consistency_leaderboard(start_time, end_time, metric='dps', difficulty='Heroic', limit=5, min_samples=3,
+                                data=None, tenant=None):
+    """Rank the most consistent players (lowest CV) who perform at or above their spec average."""
+    if data is None:
+        data = load_performance(start_time, end_time, tenant)
+    role = 'Healer' if metric == 'hps' else 'DPS'
+    data = select(data, (data['difficulty'] == difficulty) & (data['role'] == role))
+
+    summary = [
+        player for player in player_metric_summary(data, metric)
+        if player['samples'] >= min_samples and player['z'] >= 0 and not np.isnan(player['cv'])
+    ]
+    summary.sort(key=lambda player: (player['cv'], -player['median']))
+    return summary[:limit]
@@ -0,0 +1,77 @@
+"""Async access to database.py for code running on an asyncio loop (the Discord bot).
+
+Every call runs on a small dedicated thread pool, so sqlite3 never blocks the
+loop (and the gateway heartbeat) while main.py is ingesting:
+
+    db = async_db.AsyncDatabase()
+    bosses = await db.get_boss_statistics(week_start, week_end)
+    stats = await db.call(stats_cache.load_week_stats, tenant)
+
+At most DB_READ_WORKERS queries run at once; further calls wait for a slot.
+Each call gets DB_QUERY_TIMEOUT seconds in total (waiting included). When it
+runs out the caller gets asyncio.TimeoutError and SQLite interrupts the
+statement, so an abandoned query doesn't keep holding a worker.
+"""
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+import config
+import database
+import instrumentation
+
+class AsyncDatabase:
+    """Awaitable database.get_* calls on a bounded pool of read-only worker threads."""
+
+    def __init__(self, workers=None, timeout=None):
+        self.workers = workers or config.DB_READ_WORKERS
+        self.timeout = timeout or config.DB_QUERY_TIMEOUT
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='db-read')
+        self._slots = asyncio.Semaphore(self.workers)
+
+    async def call(self, func, *args, timeout=None, **kwargs):
+        """Run func(*args, **kwargs) on the pool; raises asyncio.TimeoutError past the timeout."""
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        instrumentation.count('db.async.calls')
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            instrumentation.count('db.async.timeouts')
+            raise
+
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, functools.partial(
+                _run_with_deadline, deadline, func, args, kwargs))
+            return await asyncio.wait_for(future, max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            instrumentation.count('db.async.timeouts')
+            raise
+        finally:
+            self._slots.release()
+
+    def __getattr__(self, name):
+        """db.get_weekly_summary(...) etc. - awaitable versions of the database.get_* reads."""
+        if not name.startswith('get_'):
+            raise AttributeError(name)
+        func = getattr(database, name)
+        return functools.partial(self.call, func)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+def _run_with_deadline(deadline, func, args, kwargs):
+    """Worker-thread side: expose the deadline to database.connect_readonly while func runs."""
+    database._read_deadline.at = deadline
+    try:
+        with instrumentation.span('db.async.query'):
+            return func(*args, **kwargs)
+    except Exception as e:
+        # connect_readonly's progress handler fired - report it as the timeout it is
+        if 'interrupted' in str(e) and time.monotonic() > deadline:
+            raise asyncio.TimeoutError() from e
+        raise
+    finally:
+        database._read_deadline.at = None
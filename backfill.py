@@ -0,0 +1,77 @@
+"""Backfill the database with a guild's full report history.
+
+Pages through WarcraftLogs' report list server-side (time window and zone
+filtered), parsing and storing one report at a time so memory stays bounded.
+The next page is saved after every page, so an interrupted backfill resumes
+where it stopped:
+
+    python backfill.py --since 2024-08-27 [--until 2025-01-01] [--zone 38] [--restart]
+
+Without --zone each tenant is backfilled for its own zone_id, like the weekly run.
+"""
+import argparse
+import sys
+from datetime import datetime
+import config
+import database
+import fetch_data
+import progression
+
+def parse_date(value):
+    """Parse YYYY-MM-DD as local midnight in epoch milliseconds."""
+    return int(datetime.strptime(value, '%Y-%m-%d').timestamp() * 1000)
+
+def backfill_tenant(api, tenant, start_time, end_time=None, zone_id=None, restart=False):
+    """Load every report for one tenant in [start_time, end_time]. Returns the number of raids stored."""
+    label = tenant['key'] or tenant['guild_name']
+    cursor = None if restart else database.get_backfill_cursor(tenant['key'], start_time, zone_id)
+
+    # Pages are only stable for a fixed window, so a resumed run keeps the original end time
+    if cursor and end_time is not None and cursor['end_time'] != end_time:
+        print(f"[{label}] End time changed since the last run - restarting from page 1")
+        cursor = None
+    if cursor and cursor['completed']:
+        print(f"[{label}] Backfill already complete (use --restart to reload)")
+        return 0
+
+    end_time = cursor['end_time'] if cursor else (end_time or int(datetime.now().timestamp() * 1000))
+    start_page = cursor['next_page'] if cursor else 1
+    if start_page > 1:
+        print(f"[{label}] Resuming backfill at page {start_page}")
+
+    raids_stored = 0
+    for page, reports in api.iter_guild_reports(start_time, end_time, zone_id, tenant, start_page):
+        print(f"\n[{label}] Page {page}: {len(reports)} report(s)")
+        for report in reports:
+            parsed_data = fetch_data.new_parsed_data()
+            fetch_data.parse_report(api, report, parsed_data, tenant)
+            database.store_parsed_data(parsed_data)
+            progression.update_progression([raid['raid_id'] for raid in parsed_data['raids']])
+            raids_stored += len(parsed_data['raids'])
+        database.save_backfill_cursor(tenant['key'], start_time, zone_id, end_time, page + 1)
+
+    database.save_backfill_cursor(tenant['key'], start_time, zone_id, end_time, page + 1, completed=True)
+    print(f"✓ [{label}] Backfill complete - {raids_stored} raid(s) stored")
+    return raids_stored
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Backfill raid history from WarcraftLogs.')
+    parser.add_argument('--since', required=True, help='first day to load (YYYY-MM-DD)')
+    parser.add_argument('--until', help='last day to load (YYYY-MM-DD), defaults to now')
+    parser.add_argument('--zone', type=int, help="WarcraftLogs zone ID to restrict to, defaults to each tenant's zone_id")
+    parser.add_argument('--restart', action='store_true', help='ignore any saved cursor and start from page 1')
+    args = parser.parse_args(argv)
+
+    config.validate_config()
+    database.init_database()
+
+    start_time = parse_date(args.since)
+    end_time = parse_date(args.until) + 24 * 60 * 60 * 1000 - 1 if args.until else None
+
+    api = fetch_data.WarcraftLogsAPI()
+    for tenant in config.load_tenants():
+        backfill_tenant(api, tenant, start_time, end_time, args.zone or tenant['zone_id'], args.restart)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,391 @@
+"""Offline benchmarks for every pipeline stage: fetch, ingest, query and render.
+
+Data comes from synthetic_data.py. The fetch stage replays a fixture set recorded
+from synthetic responses (or a real recording via --fixtures), so no network or
+credentials are needed:
+
+    python benchmark.py                            # all scales, results in output/benchmark.json
+    python benchmark.py --scales week --save-baseline
+    python benchmark.py --scales week              # exits 1 if a stage regressed vs the baseline
+    python benchmark.py --startup-only             # import-time guard for the CLI entry points
+
+Every run also renders a week where one difficulty was only wiped on
+(check_wipe_only_render) and exits 1 if that render fails.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+import analytics
+import config
+import database
+import death_analysis
+import fetch_data
+import generate_pptx
+import progression
+import replay
+import synthetic_data
+
+# name -> raid weeks of history in the database
+SCALES = {
+    'week': 1,
+    'season': 26,
+    'five-seasons': 130,
+}
+
+BASELINE_PATH = 'benchmark_baseline.json'
+
+# Entry point -> (the imports it performs, heavy modules it must not pull in)
+STARTUP_ENTRY_POINTS = {
+    'main': ('import main', ['fetch_data', 'generate_pptx', 'requests', 'aiohttp', 'numpy', 'pptx', 'discord']),
+    'main.render_only': ('import main, database, generate_pptx', ['fetch_data', 'requests', 'aiohttp', 'discord']),
+    'fetch_data': ('import fetch_data', ['asyncio', 'aiohttp', 'numpy', 'pptx', 'discord']),
+    'discord_bot.post': ('import discord_bot, requests', ['discord', 'aiohttp', 'fetch_data', 'numpy', 'pptx']),
+}
+
+def time_call(func, repeat=5):
+    """Run func `repeat` times with its output discarded; returns (timings_ms, last_result)."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings, result
+
+def summarise(timings):
+    return {
+        'runs': len(timings),
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+def measure_import(statement):
+    """Import time (ms) and loaded module names for `statement` in a fresh interpreter."""
+    code = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        f"{statement}\n"
+        "print((time.perf_counter() - started) * 1000)\n"
+        "print(' '.join(sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    elapsed, modules = result.stdout.strip().splitlines()[-2:]
+    return float(elapsed), set(modules.split())
+
+def bench_startup(repeat):
+    """Time each entry point's imports cold (new process per run) and check none loads a forbidden module.
+
+    Returns (results, violations).
+    """
+    results, violations = {}, []
+    for entry, (statement, forbidden) in STARTUP_ENTRY_POINTS.items():
+        timings = []
+        for _ in range(repeat):
+            elapsed, modules = measure_import(statement)
+            timings.append(elapsed)
+        results[f'startup/{entry}'] = summarise(timings)
+        loaded = sorted(name for name in forbidden if name in modules)
+        if loaded:
+            violations.append(f"{entry} imports {', '.join(loaded)}")
+    return results, violations
+
+def benchmark_tenant():
+    """The .env tenant with team/difficulty filters off, so every synthetic report is kept."""
+    return dict(config.default_tenant(), raid_team_filter=None, difficulty_filter=None, zone_id=None)
+
+def record_synthetic_fixtures(fixtures_dir, pulls, raiders, seed):
+    """Record a fixture set for one synthetic raid week ending just before the recording's clock."""
+    now = synthetic_data.last_wednesday() - timedelta(hours=4)  # Tuesday night: a full raid week behind it
+    week_start = (now - timedelta(days=fetch_data.raid_week_days_back(now))).replace(hour=0, minute=0)
+    team = synthetic_data.SyntheticTeam(seed=seed, raiders=raiders)
+    respond = synthetic_data.graphql_responder(team.raid_week(week_start, pulls))
+
+    api = fetch_data.WarcraftLogsAPI(
+        fixtures=replay.FixtureStore(fixtures_dir, mode='record', recorded_at=now.timestamp())
+    )
+    api._live_query = respond
+    with contextlib.redirect_stdout(io.StringIO()):
+        fetch_data.fetch_weekly_data(api, benchmark_tenant())
+
+def bench_fetch(fixtures_dir, latency_ms, repeat):
+    """Time the sync and async fetch paths against a recorded fixture set."""
+    tenant = benchmark_tenant()
+
+    def fetch_sync():
+        store = replay.FixtureStore(fixtures_dir, mode='replay', latency_ms=latency_ms, error_rate=0)
+        return fetch_data.fetch_weekly_data(fetch_data.WarcraftLogsAPI(fixtures=store), tenant)
+
+    async def fetch_async():
+        store = replay.FixtureStore(fixtures_dir, mode='replay', latency_ms=latency_ms, error_rate=0)
+        async with fetch_data.AsyncWarcraftLogsAPI(fixtures=store) as api:
+            return await fetch_data.fetch_weekly_data_async(api, tenant)
+
+    results = {}
+    timings, parsed_data = time_call(fetch_sync, repeat)
+    results['fetch/fetch_weekly_data'] = summarise(timings)
+    timings, _ = time_call(lambda: asyncio.run(fetch_async()), repeat)
+    results['fetch/fetch_weekly_data_async'] = summarise(timings)
+    return results, parsed_data
+
+def bench_ingest(weeks, args):
+    """Generate `weeks` of synthetic history and time storing it into a fresh database."""
+    weekly_data = [
+        synthetic_data.parse_reports(reports, tenant_key)
+        for tenant_key, _, reports in synthetic_data.generate_season(
+            weeks, 1, args.raiders, args.pulls, args.nights, seed=args.seed)
+    ]
+
+    def store_all():
+        for parsed_data in weekly_data:
+            database.store_parsed_data(parsed_data)
+            progression.update_progression([raid['raid_id'] for raid in parsed_data['raids']])
+
+    database.init_database()
+    timings, _ = time_call(store_all, 1)
+    pulls = sum(len(data['encounters']) for data in weekly_data)
+    result = summarise(timings)
+    result['pulls'] = pulls
+    return {'ingest/store_parsed_data': result}
+
+def bench_queries(week_start, week_end, season_start, repeat):
+    """Time every reporting query for the latest week, plus the season-wide analytics load."""
+    difficulty = 'Heroic'
+    queries = {
+        'init_database.current': database.init_database,
+        'get_weekly_summary': lambda: database.get_weekly_summary(week_start, week_end),
+        'get_boss_statistics': lambda: database.get_boss_statistics(week_start, week_end),
+        'get_boss_mvps': lambda: database.get_boss_mvps(week_start, week_end),
+        'get_top_performers.dps': lambda: database.get_top_performers(week_start, week_end, 'dps', 5, difficulty),
+        'get_top_performers.hps': lambda: database.get_top_performers(week_start, week_end, 'hps', 5, difficulty),
+        'get_leaderboards': lambda: database.get_leaderboards(week_start, 10),
+        'get_top_death_causes': lambda: database.get_top_death_causes(week_start, week_end, 10),
+        'get_player_death_count': lambda: database.get_player_death_count(week_start, week_end),
+        'get_performance_samples': lambda: database.get_performance_samples(week_start, week_end),
+        'get_encounter_pulls': lambda: database.get_encounter_pulls(week_start, week_end),
+        'analytics.load_performance.all_weeks': lambda: analytics.load_performance(season_start, week_end),
+    }
+    return {f'query/{name}': summarise(time_call(query, repeat)[0]) for name, query in queries.items()}
+
+def bench_render(week_start, week_end, repeat):
+    """Time each slide builder, the slideshow and the .pptx deck for the latest week.
+
+    Per-difficulty slides are timed for the hardest difficulty pulled.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = database.get_weekly_summary(week_start, week_end)
+        boss_stats = database.get_boss_statistics(week_start, week_end)
+        boss_mvps = database.get_boss_mvps(week_start, week_end)
+        leaderboards = database.get_leaderboards(week_start, 5)
+        death_causes = database.get_top_death_causes(week_start, week_end, 10)
+    perf, pull = generate_pptx.load_chart_data(week_start, week_end)
+    sections = generate_pptx.difficulty_sections(boss_stats, boss_mvps, leaderboards, perf, week_start, week_end)
+    section = sections[0]
+    difficulty = section['difficulty']
+    progress = progression.load_progression()
+    timeline = death_analysis.load_death_timeline(week_start, week_end)
+    os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+    generate_pptx.create_shared_css()
+
+    renders = {
+        'load_chart_data': lambda: generate_pptx.load_chart_data(week_start, week_end),
+        'get_consistency_leaderboard': lambda: analytics.get_consistency_leaderboard(
+            week_start, week_end, 'dps', difficulty, data=perf),
+        'create_title_slide': lambda: generate_pptx.create_title_slide(week_start, week_end),
+        'create_summary_slide': lambda: generate_pptx.create_summary_slide(summary),
+        'difficulty_sections': lambda: generate_pptx.difficulty_sections(
+            boss_stats, boss_mvps, leaderboards, perf, week_start, week_end),
+        'create_boss_breakdown_slide': lambda: generate_pptx.create_boss_breakdown_slide(
+            section['boss_stats'], difficulty),
+        'create_top_performers_slide': lambda: generate_pptx.create_top_performers_slide(
+            section['dps_top'], section['hps_top'], difficulty),
+        'create_boss_mvp_slide': lambda: generate_pptx.create_boss_mvp_slide(section['boss_mvps'], difficulty),
+        'create_death_causes_slide': lambda: generate_pptx.create_death_causes_slide(death_causes),
+        'create_distribution_slide': lambda: generate_pptx.create_distribution_slide(perf),
+        'create_progression_slide': lambda: generate_pptx.create_progression_slide(pull),
+        'create_consistency_slide': lambda: generate_pptx.create_consistency_slide(
+            section['dps_consistent'], section['hps_consistent'], difficulty),
+        'load_progression': progression.load_progression,
+        'create_season_progression_slide': lambda: generate_pptx.create_season_progression_slide(progress),
+        'load_death_timeline': lambda: death_analysis.load_death_timeline(week_start, week_end),
+        'create_death_timeline_slide': lambda: generate_pptx.create_death_timeline_slide(timeline),
+        'create_slideshow': generate_pptx.create_slideshow,
+        'create_pptx_deck': lambda: generate_pptx.create_pptx_deck(
+            week_start, week_end, summary, sections, death_causes, progress, timeline),
+    }
+    return {f'render/{name}': summarise(time_call(render, repeat)[0]) for name, render in renders.items()}
+
+def check_wipe_only_render(work_dir):
+    """Render a week where one difficulty was only wiped on. Returns a list of failures.
+
+    Player rows are only stored for kills, so that difficulty has boss slides but no
+    performer data - a full render must still succeed.
+    """
+    check_dir = os.path.join(work_dir, 'render-check')
+    config.DATABASE_PATH = os.path.join(work_dir, 'render-check.db')
+    config.SLIDES_DIR = os.path.join(check_dir, 'slides')
+    config.SLIDESHOW_PATH = os.path.join(check_dir, 'slideshow.html')
+    config.OUTPUT_DIR = os.path.join(check_dir, 'output')
+    config.TENANT = None
+    week_start = synthetic_data.last_wednesday()
+    farm = synthetic_data.SyntheticTeam(seed=1).raid_week(week_start, pulls=20, nights=1)
+    progress = synthetic_data.SyntheticTeam(seed=2, difficulty='Mythic').raid_week(week_start, pulls=3, nights=1)
+    for fight in progress[0]['report']['fights']:
+        fight.update(kill=False, fightPercentage=max(fight['fightPercentage'], 40.0))
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            database.init_database()
+            for reports in (farm, progress):
+                parsed_data = synthetic_data.parse_reports(reports)
+                database.store_parsed_data(parsed_data)
+                progression.update_progression([raid['raid_id'] for raid in parsed_data['raids']])
+            generate_pptx.generate_presentation()
+    except Exception as e:
+        return [f"render with a wipe-only difficulty failed: {e!r}"]
+    if not os.path.exists(os.path.join(config.SLIDES_DIR, 'slide3-heroic.html')):
+        return ["render with a wipe-only difficulty skipped the Heroic slides"]
+    return []
+
+def run_benchmarks(args, work_dir):
+    """Run every requested scale in work_dir and return {'<scale>/<stage>/<name>': timing}."""
+    config.SLIDES_DIR = os.path.join(work_dir, 'slides')
+    config.SLIDESHOW_PATH = os.path.join(work_dir, 'slideshow.html')
+    config.OUTPUT_DIR = os.path.join(work_dir, 'output')
+    config.TENANT = None
+
+    results = {}
+    fixtures_dir = args.fixtures
+    if not fixtures_dir:
+        fixtures_dir = os.path.join(work_dir, 'fixtures')
+        record_synthetic_fixtures(fixtures_dir, args.pulls, args.raiders, args.seed)
+    print(f"Benchmarking fetch against {fixtures_dir} ...")
+    fetch_results, parsed_data = bench_fetch(fixtures_dir, args.latency_ms, args.repeat)
+    print(f"  {len(parsed_data['encounters'])} pulls fetched per run")
+    results.update({f'week/{name}': timing for name, timing in fetch_results.items()})
+
+    week_start_dt = synthetic_data.last_wednesday()
+    week_start = int(week_start_dt.timestamp() * 1000)
+    week_end = int((week_start_dt + timedelta(weeks=1)).timestamp() * 1000) - 1
+    for scale in args.scales:
+        weeks = SCALES[scale]
+        print(f"Benchmarking {scale} ({weeks} week(s) of history) ...")
+        config.DATABASE_PATH = os.path.join(work_dir, f'{scale}.db')
+        season_start = int((week_start_dt - timedelta(weeks=weeks - 1)).timestamp() * 1000)
+
+        scale_results = bench_ingest(weeks, args)
+        scale_results.update(bench_queries(week_start, week_end, season_start, args.repeat))
+        scale_results.update(bench_render(week_start, week_end, args.repeat))
+        results.update({f'{scale}/{name}': timing for name, timing in scale_results.items()})
+
+    return results
+
+def compare_to_baseline(results, baseline, threshold, floor_ms=1.0):
+    """Print each stage against the baseline and return the keys that regressed.
+
+    Best-of-N (min) times are compared since they are the least noisy. A stage
+    regresses when it is more than `threshold` (a fraction) slower and at least
+    floor_ms slower, so sub-millisecond jitter doesn't fail the run.
+    """
+    regressions = []
+    print(f"\n{'stage':<64} {'baseline':>10} {'now':>10} {'change':>8}")
+    for key, timing in results.items():
+        before = baseline.get(key)
+        now = timing['min_ms']
+        if not before:
+            print(f"{key:<64} {'-':>10} {now:>10.2f} {'new':>8}")
+            continue
+        before = before['min_ms']
+        change = (now - before) / before if before else 0.0
+        regressed = change > threshold and now - before >= floor_ms
+        if regressed:
+            regressions.append(key)
+        print(f"{key:<64} {before:>10.2f} {now:>10.2f} {change:>+7.0%}{' ✗' if regressed else ''}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark fetch, ingest, query and render stages offline.')
+    parser.add_argument('--scales', default=','.join(SCALES),
+                        help=f"comma-separated scales to run ({', '.join(SCALES)})")
+    parser.add_argument('--repeat', type=int, default=5, help='runs per fetch/query/render timing')
+    parser.add_argument('--pulls', type=int, default=120, help='boss pulls per synthetic week')
+    parser.add_argument('--raiders', type=int, default=30)
+    parser.add_argument('--nights', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fixtures', help='replay a real WCL_MODE=record fixture set instead of a synthetic one')
+    parser.add_argument('--latency-ms', type=float, default=0, help='injected latency per replayed request')
+    parser.add_argument('--output', help=f'where to write the JSON results (default {config.OUTPUT_DIR}/benchmark.json)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='write these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown vs baseline (0.25 = 25%%)')
+    parser.add_argument('--startup-only', action='store_true', help='only run the import-time benchmark and the render check')
+    args = parser.parse_args(argv)
+
+    args.scales = [scale.strip() for scale in args.scales.split(',') if scale.strip()]
+    unknown = [scale for scale in args.scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    output_dir = config.OUTPUT_DIR
+    print("Benchmarking entry point startup ...")
+    results, startup_violations = bench_startup(args.repeat)
+    with tempfile.TemporaryDirectory(prefix='raid-bench-') as work_dir:
+        print("Checking a render with a wipe-only difficulty ...")
+        render_failures = check_wipe_only_render(work_dir)
+        if not args.startup_only:
+            results.update(run_benchmarks(args, work_dir))
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'scales': args.scales, 'repeat': args.repeat, 'pulls': args.pulls, 'raiders': args.raiders,
+                     'nights': args.nights, 'seed': args.seed, 'latency_ms': args.latency_ms},
+        'results': results,
+    }
+    output_path = args.output or os.path.join(output_dir, 'benchmark.json')
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results written to {output_path}")
+
+    for violation in startup_violations:
+        print(f"✗ Startup: {violation}")
+    for failure in render_failures:
+        print(f"✗ Render: {failure}")
+    failures = startup_violations + render_failures
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Baseline saved to {args.baseline}")
+        return 1 if failures else 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} - run with --save-baseline to create one")
+        return 1 if failures else 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if failures:
+        return 1
+    if regressions:
+        print(f"\n✗ {len(regressions)} stage(s) regressed more than {args.threshold:.0%}")
+        return 1
+    print("\n✓ No regressions against baseline")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
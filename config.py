@@ -1,13 +1,27 @@
 """Configuration management for WoW raid stats automation."""
 import os
-from dotenv import load_dotenv
+import re
+from contextlib import contextmanager
 
-load_dotenv()
+# .env lives next to this file; python-dotenv is only imported when there is one to read
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+if os.path.exists(ENV_FILE):
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
 
 # API Configuration
 WARCRAFTLOGS_CLIENT_ID = os.getenv('WARCRAFTLOGS_CLIENT_ID')
 WARCRAFTLOGS_CLIENT_SECRET = os.getenv('WARCRAFTLOGS_CLIENT_SECRET')
 WARCRAFTLOGS_API_URL = 'https://www.warcraftlogs.com/api/v2/client'
+# OAuth token cache so short runs reuse one token until it expires - keep it out of git
+WARCRAFTLOGS_TOKEN_CACHE = os.getenv('WARCRAFTLOGS_TOKEN_CACHE', '.wcl_token.json')
+
+# Offline record/replay of API responses (see replay.py): live, record or replay
+WCL_MODE = os.getenv('WCL_MODE', 'live')
+WCL_FIXTURES_DIR = os.getenv('WCL_FIXTURES_DIR', os.path.join('fixtures', 'wcl'))
+WCL_REPLAY_LATENCY_MS = float(os.getenv('WCL_REPLAY_LATENCY_MS', '0'))
+WCL_REPLAY_ERROR_RATE = float(os.getenv('WCL_REPLAY_ERROR_RATE', '0'))
+WCL_REPLAY_SEED = int(os.getenv('WCL_REPLAY_SEED', '0'))
 
 # Guild Configuration
 GUILD_NAME = os.getenv('GUILD_NAME', 'YourGuild')
@@ -17,13 +31,20 @@ GUILD_REGION = os.getenv('GUILD_REGION', 'us')  # us, eu, kr, tw, cn
 # Discord Configuration
 DISCORD_BOT_TOKEN = os.getenv('DISCORD_BOT_TOKEN')
 DISCORD_CHANNEL_ID = os.getenv('DISCORD_CHANNEL_ID')
+DISCORD_WEBHOOK_URL = os.getenv('DISCORD_WEBHOOK_URL')  # scheduled posts (discord_bot.py publish)
+DECK_URL = os.getenv('DECK_URL')  # where the slideshow is hosted, linked from the webhook post
+PREVIEW_SLIDES = ['slide2', 'slide4', 'slide5']  # summary, top performers, MVPs - shown inline on Discord
 
 # Database Configuration
 DATABASE_PATH = 'raid_stats.db'
+DB_READ_WORKERS = int(os.getenv('DB_READ_WORKERS', '2'))  # bot-side query threads (async_db.py)
+DB_QUERY_TIMEOUT = float(os.getenv('DB_QUERY_TIMEOUT', '10'))  # seconds before a bot query is abandoned
 
 # Output Configuration
 OUTPUT_DIR = 'output'
 SLIDES_DIR = 'slides'
+CHROME_PATH = os.getenv('CHROME_PATH')  # headless browser for slide images (rasterise.py), else found on PATH
+EXPORT_DIR = os.getenv('EXPORT_DIR', 'exports')  # columnar warehouse export (export_data.py)
 
 # Presentation Configuration
 PRESENTATION_TITLE = f'{GUILD_NAME} Weekly Raid Stats'
@@ -34,20 +55,166 @@ DIFFICULTY_FILTER = os.getenv('DIFFICULTY_FILTER', None)
 if DIFFICULTY_FILTER:
     DIFFICULTY_FILTER = int(DIFFICULTY_FILTER)
 
+# Per-difficulty slides (slideN-<difficulty>.html) come in this order, hardest first
+DIFFICULTY_ORDER = ['Mythic', 'Heroic', 'Normal', 'LFR']
+
+# WarcraftLogs zone ID (the raid tier) - passed to the report search so M+ and old-tier logs never download
+ZONE_FILTER = os.getenv('ZONE_FILTER', None)
+if ZONE_FILTER:
+    ZONE_FILTER = int(ZONE_FILTER)
+
 # Raid team filter to filter reports by owner name
 RAID_TEAM_FILTER = os.getenv('RAID_TEAM_FILTER')
 
-def validate_config():
-    """Validate that required configuration is present."""
+# Live raid-night tracking (live_tracker.py)
+LIVE_POLL_SECONDS = float(os.getenv('LIVE_POLL_SECONDS', '15'))
+LIVE_IDLE_MINUTES = float(os.getenv('LIVE_IDLE_MINUTES', '30'))  # report counts as finished after this long without new data
+
+# Multi-team runs - if this file exists, each [[tenant]] entry gets its own fetch and slide set
+TENANTS_FILE = os.getenv('TENANTS_FILE', 'tenants.toml')
+SLIDESHOW_PATH = 'slideshow.html'
+TENANT = None  # key of the tenant currently being rendered, None for the classic single-team run
+
+def slide_sort_key(filename):
+    """Numeric order (slide10 after slide9), then slideN before its -<difficulty> variants, hardest first."""
+    number, difficulty = re.fullmatch(r'slide(\d+)(?:-([a-z]+))?\.html', filename).groups()
+    variants = [d.lower() for d in DIFFICULTY_ORDER]
+    rank = 0 if not difficulty else 1 + (variants.index(difficulty) if difficulty in variants else len(variants))
+    return int(number), rank, difficulty or ''
+
+def slide_files(slides_dir):
+    """slideN.html and slideN-<difficulty>.html paths in deck order."""
+    names = [f for f in os.listdir(slides_dir) if re.fullmatch(r'slide\d+(-[a-z]+)?\.html', f)]
+    return [os.path.join(slides_dir, f) for f in sorted(names, key=slide_sort_key)]
+
+def default_tenant():
+    """Build the single tenant described by the .env guild settings."""
+    return {
+        'key': None,
+        'guild_name': GUILD_NAME,
+        'guild_realm': GUILD_REALM,
+        'guild_region': GUILD_REGION,
+        'raid_team_filter': RAID_TEAM_FILTER,
+        'difficulty_filter': DIFFICULTY_FILTER,
+        'zone_id': ZONE_FILTER,
+    }
+
+def load_tenants():
+    """Load the guild/team list from TENANTS_FILE, falling back to the .env guild.
+
+    Example tenants.toml:
+
+        [[tenant]]
+        key = "main"
+        guild_name = "Limeknighters"
+        guild_realm = "Frostmourne"
+        raid_team_filter = "vkf00"
+        difficulty_filter = 4
+        zone_id = 44
+    """
+    if not os.path.exists(TENANTS_FILE):
+        return [default_tenant()]
+
+    import tomllib
+    with open(TENANTS_FILE, 'rb') as f:
+        entries = tomllib.load(f).get('tenant', [])
+
+    tenants = []
+    for entry in entries:
+        tenant = default_tenant()
+        tenant.update({
+            'key': entry.get('key'),
+            'guild_name': entry.get('guild_name'),
+            'guild_realm': entry.get('guild_realm'),
+            'guild_region': entry.get('guild_region', GUILD_REGION),
+            'raid_team_filter': entry.get('raid_team_filter'),
+            'difficulty_filter': entry.get('difficulty_filter'),
+            'zone_id': entry.get('zone_id'),
+        })
+        tenants.append(tenant)
+    return tenants
+
+def find_tenant(key=None):
+    """The tenant with this key from load_tenants(), the first one if no key is given, else None."""
+    tenants = load_tenants()
+    if key is None:
+        return tenants[0] if tenants else None
+    return next((tenant for tenant in tenants if tenant['key'] == key), None)
+
+@contextmanager
+def tenant_context(tenant):
+    """Temporarily point the module-level guild and output settings at one tenant.
+
+    Rendering reads these globals, so tenants must be rendered one at a time.
+    """
+    global GUILD_NAME, GUILD_REALM, GUILD_REGION, RAID_TEAM_FILTER, DIFFICULTY_FILTER, ZONE_FILTER
+    global SLIDES_DIR, SLIDESHOW_PATH, PRESENTATION_TITLE, TENANT
+
+    saved = (GUILD_NAME, GUILD_REALM, GUILD_REGION, RAID_TEAM_FILTER, DIFFICULTY_FILTER, ZONE_FILTER,
+             SLIDES_DIR, SLIDESHOW_PATH, PRESENTATION_TITLE, TENANT)
+    base_slides_dir = SLIDES_DIR
+    GUILD_NAME = tenant['guild_name']
+    GUILD_REALM = tenant['guild_realm']
+    GUILD_REGION = tenant['guild_region']
+    RAID_TEAM_FILTER = tenant['raid_team_filter']
+    DIFFICULTY_FILTER = tenant['difficulty_filter']
+    ZONE_FILTER = tenant['zone_id']
+    PRESENTATION_TITLE = f'{GUILD_NAME} Weekly Raid Stats'
+    TENANT = tenant['key']
+    if TENANT:
+        SLIDES_DIR = f'{base_slides_dir}-{TENANT}'
+        SLIDESHOW_PATH = f'slideshow-{TENANT}.html'
+    try:
+        yield tenant
+    finally:
+        (GUILD_NAME, GUILD_REALM, GUILD_REGION, RAID_TEAM_FILTER, DIFFICULTY_FILTER, ZONE_FILTER,
+         SLIDES_DIR, SLIDESHOW_PATH, PRESENTATION_TITLE, TENANT) = saved
+
+def tenants_overlap(tenant, other):
+    """True if both tenants could match the same report.
+
+    Same guild, zones that can coincide, and raid team filters that aren't
+    two different owners (an unset filter matches every owner).
+    """
+    def guild(t):
+        return tuple((t[field] or '').lower() for field in ('guild_name', 'guild_realm', 'guild_region'))
+
+    if guild(tenant) != guild(other):
+        return False
+    if tenant['zone_id'] and other['zone_id'] and tenant['zone_id'] != other['zone_id']:
+        return False
+    filters = (tenant['raid_team_filter'], other['raid_team_filter'])
+    return not all(filters) or filters[0].lower() == filters[1].lower()
+
+def validate_config(require_credentials=True):
+    """Validate that required configuration is present.
+
+    Pass require_credentials=False for runs that never call WarcraftLogs (e.g. --render-only).
+    """
     required = {
         'WARCRAFTLOGS_CLIENT_ID': WARCRAFTLOGS_CLIENT_ID,
         'WARCRAFTLOGS_CLIENT_SECRET': WARCRAFTLOGS_CLIENT_SECRET,
-        'GUILD_NAME': GUILD_NAME,
-        'GUILD_REALM': GUILD_REALM,
-    }
+    } if require_credentials and WCL_MODE != 'replay' else {}  # replays never touch the API
     
     missing = [key for key, value in required.items() if not value]
-    
+
+    tenants = load_tenants()
+    if not tenants:
+        missing.append(f'[[tenant]] entries in {TENANTS_FILE}')
+    keys = [tenant['key'] for tenant in tenants]
+    for tenant in tenants:
+        label = f"tenant '{tenant['key']}'" if tenant['key'] else 'guild'
+        missing += [f"{label} {field}" for field in ('guild_name', 'guild_realm') if not tenant[field]]
+        if os.path.exists(TENANTS_FILE) and (not tenant['key'] or keys.count(tenant['key']) > 1):
+            missing.append(f"unique key for {label} {tenant['guild_name']}")
+
+    # raids.raid_id is unique, so a report two tenants both match would end up with whichever stored it last
+    for i, tenant in enumerate(tenants):
+        for other in tenants[i + 1:]:
+            if tenants_overlap(tenant, other):
+                missing.append(f"non-overlapping raid_team_filter for tenants '{tenant['key']}' and '{other['key']}' "
+                               f"(same guild and zone - give both a different filter)")
+
     if missing:
         raise ValueError(f"Missing required configuration: {', '.join(missing)}")
     
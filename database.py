@@ -1,14 +1,93 @@
 """SQLite database operations for raid statistics."""
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import json
 import config
+import instrumentation
+
+BACKFILL_BATCH = 200  # rows (or raids) per backfill transaction
 
 def init_database():
-    """Initialize the database with required tables."""
-    conn = sqlite3.connect(config.DATABASE_PATH)
-    cursor = conn.cursor()
-    
+    """Create the database or bring its schema up to SCHEMA_VERSION.
+
+    The version lives in PRAGMA user_version, so a current database costs one
+    pragma read. Each pending migration's schema changes commit together with
+    its version bump. A migration's backfill runs after the schema change, in
+    short batches, so the bot's readers aren't locked out. The version is only
+    bumped once the backfill is done, so an interrupted one resumes next run.
+    """
+    conn = sqlite3.connect(config.DATABASE_PATH, isolation_level=None)
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        for number, (description, schema, backfill) in enumerate(MIGRATIONS[version:], version + 1):
+            with instrumentation.span('db.migrate'):
+                if schema:
+                    conn.execute('BEGIN IMMEDIATE')
+                    try:
+                        if conn.execute('PRAGMA user_version').fetchone()[0] >= number:
+                            conn.execute('ROLLBACK')  # another process migrated while we waited for the lock
+                            continue
+                        schema(conn.cursor())
+                        if not backfill:
+                            conn.execute(f'PRAGMA user_version = {number}')
+                        conn.execute('COMMIT')
+                    except BaseException:
+                        conn.execute('ROLLBACK')
+                        raise
+                if backfill:
+                    backfill(conn)
+                    conn.execute(f'PRAGMA user_version = {number}')
+            print(f"✓ Database schema at version {number}: {description}")
+    finally:
+        conn.close()
+
+def _add_column(cursor, table, column, declaration):
+    """ALTER TABLE ... ADD COLUMN, skipped when the column is already there."""
+    cursor.execute(f'PRAGMA table_info({table})')
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+
+def backfill_column(conn, table, column, source_columns, compute, batch_size=BACKFILL_BATCH):
+    """Fill a derived column from other columns of the same row, in rowid order.
+
+    Each batch is its own short transaction, and only rows still NULL are
+    touched, so an interrupted backfill picks up where it stopped.
+    """
+    last_rowid = 0
+    while True:
+        rows = conn.execute(f'''
+            SELECT rowid, {', '.join(source_columns)} FROM {table}
+            WHERE {column} IS NULL AND rowid > ?
+            ORDER BY rowid LIMIT ?
+        ''', (last_rowid, batch_size)).fetchall()
+        if not rows:
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany(f'UPDATE {table} SET {column} = ? WHERE rowid = ?',
+                         [(compute(*row[1:]), row[0]) for row in rows])
+        conn.execute('COMMIT')
+        last_rowid = rows[-1][0]
+        instrumentation.count('db.migrate.rows', len(rows))
+
+def _raid_batches(conn):
+    """Every raid_id in start order, BACKFILL_BATCH at a time."""
+    raid_ids = [row[0] for row in conn.execute('SELECT raid_id FROM raids ORDER BY start_time')]
+    return [raid_ids[i:i + BACKFILL_BATCH] for i in range(0, len(raid_ids), BACKFILL_BATCH)]
+
+def _create_schema(cursor):
+    """Version 1: every table, column and index in use when versioning was introduced.
+
+    Idempotent, because a database from an earlier release (user_version 0)
+    can have any subset of them: missing tables are created and missing
+    columns added (_add_column), bringing it to the same shape as a new one.
+    Later schema changes get their own MIGRATIONS entry instead.
+    """
     # Raids table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS raids (
@@ -19,6 +98,7 @@ def init_database():
             end_time INTEGER NOT NULL,
             zone_name TEXT,
             difficulty TEXT,
+            tenant TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
@@ -35,6 +115,9 @@ def init_database():
             wipe_count INTEGER DEFAULT 0,
             kill_duration_ms INTEGER,
             is_kill BOOLEAN DEFAULT 0,
+            fight_percentage REAL,
+            last_phase INTEGER,
+            pull_number INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (raid_id) REFERENCES raids(raid_id)
         )
@@ -93,99 +176,369 @@ def init_database():
         )
     ''')
 
+    # Resumable page cursors for history backfills (backfill.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS backfill_cursors (
+            tenant TEXT NOT NULL DEFAULT '',
+            start_time INTEGER NOT NULL,
+            zone_id INTEGER NOT NULL DEFAULT 0,
+            end_time INTEGER NOT NULL,
+            next_page INTEGER NOT NULL DEFAULT 1,
+            completed BOOLEAN DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (tenant, start_time, zone_id)
+        )
+    ''')
+
+    # Season progression per boss, folded forward on every ingest (progression.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS boss_progression (
+            tenant TEXT NOT NULL DEFAULT '',
+            boss_name TEXT NOT NULL,
+            difficulty TEXT NOT NULL DEFAULT '',
+            pulls INTEGER NOT NULL DEFAULT 0,
+            kills INTEGER NOT NULL DEFAULT 0,
+            best_percentage REAL,
+            best_pull INTEGER,
+            first_kill_pull INTEGER,
+            first_kill_time INTEGER,
+            phase_counts TEXT,
+            last_pull_end INTEGER,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (tenant, boss_name, difficulty)
+        )
+    ''')
 
+    # Per-week player leaderboards, rebuilt for the touched weeks after every ingest
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS leaderboards (
+            tenant TEXT NOT NULL DEFAULT '',
+            week TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            rank INTEGER NOT NULL,
+            player_name TEXT NOT NULL,
+            player_class TEXT,
+            role TEXT,
+            avg_value REAL,
+            max_value REAL,
+            samples INTEGER,
+            PRIMARY KEY (tenant, week, difficulty, metric, rank)
+        )
+    ''')
 
+    # Columns added to tables that older databases already had
+    _add_column(cursor, 'encounters', 'difficulty', 'TEXT')
+    _add_column(cursor, 'raids', 'tenant', 'TEXT')
+    _add_column(cursor, 'encounters', 'fight_percentage', 'REAL')
+    _add_column(cursor, 'encounters', 'last_phase', 'INTEGER')
+    _add_column(cursor, 'encounters', 'pull_number', 'INTEGER')
 
-    # Migrations if needed - shouldnt if it's autocreating, but if I persist the db in the future it might need it
-    migrations = [
-        "ALTER TABLE encounters ADD COLUMN difficulty TEXT",
-    ]
-    for migration in migrations:
-        try:
-            cursor.execute(migration)
-        except sqlite3.OperationalError:
-            pass  # column already exists
+    # Every report query filters raids by tenant and week
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_raids_tenant_start ON raids(tenant, start_time)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_encounters_boss ON encounters(boss_name, difficulty)')
+    # Death timelines walk each pull's deaths in time order
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_deaths_pull ON deaths(raid_id, fight_id, timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_encounters_pull ON encounters(raid_id, fight_id)')
 
-    conn.commit()
-    conn.close()
+def _add_raid_week(cursor):
+    """Version 2: raids.week, the raid week's Wednesday (see week_key)."""
+    _add_column(cursor, 'raids', 'week', 'TEXT')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_raids_tenant_week ON raids(tenant, week)')
 
-def store_raid(raid_data):
+def _backfill_raid_week(conn):
+    backfill_column(conn, 'raids', 'week', ['start_time'], week_key)
+
+def _number_existing_pulls(conn):
+    """Version 3: number pulls stored before progression tracking and fill boss_progression.
+
+    One boss at a time: its pulls are folded in memory, its progression row is
+    written, then its pull numbers BACKFILL_BATCH per transaction. A boss left
+    with unnumbered pulls by an interruption is simply replayed next run.
+    """
+    import progression  # progression imports this module
+    bosses = conn.execute('''
+        SELECT DISTINCT r.tenant, e.boss_name, e.difficulty
+        FROM encounters e
+        JOIN raids r ON e.raid_id = r.raid_id
+        WHERE e.pull_number IS NULL
+    ''').fetchall()
+
+    for tenant, boss, difficulty in bosses:
+        progress = progression.new_progress(boss, difficulty)
+        pull_numbers = progression.fold_pulls(progress, get_progression_pulls(tenant, boss, difficulty))
+        save_boss_progression(tenant, progress, {})
+
+        updates = [(number, encounter_id) for encounter_id, number in pull_numbers.items()]
+        for i in range(0, len(updates), BACKFILL_BATCH):
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany('UPDATE encounters SET pull_number = ? WHERE id = ?', updates[i:i + BACKFILL_BATCH])
+            conn.execute('COMMIT')
+            instrumentation.count('db.migrate.rows', len(updates[i:i + BACKFILL_BATCH]))
+
+def _build_leaderboards(conn):
+    """Version 4: materialise the leaderboards of weeks stored before they existed."""
+    for raid_ids in _raid_batches(conn):
+        refresh_leaderboards(raid_ids)
+
+# Ordered schema migrations: (description, schema change, backfill). Append only -
+# a database at user_version N has had the first N applied.
+MIGRATIONS = [
+    ('base schema', _create_schema, None),
+    ('raid week column', _add_raid_week, _backfill_raid_week),
+    ('season pull numbers for stored pulls', None, _number_existing_pulls),
+    ('leaderboards for stored weeks', None, _build_leaderboards),
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+@contextmanager
+def write_cursor(cursor=None):
+    """Cursor for a store_* call.
+
+    A caller's cursor is used as-is, so several stores share the caller's
+    transaction; otherwise a new connection is opened and committed on exit.
+    """
+    if cursor is not None:
+        yield cursor
+        return
+    conn = sqlite3.connect(config.DATABASE_PATH)
+    try:
+        yield conn.cursor()
+        conn.commit()
+    finally:
+        conn.close()
+
+@instrumentation.timed
+def store_raid(raid_data, cursor=None):
     """Store raid information in database."""
+    with write_cursor(cursor) as cursor:
+        cursor.execute('''
+            INSERT OR REPLACE INTO raids 
+            (raid_id, raid_name, start_time, end_time, zone_name, difficulty, tenant, week)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            raid_data['raid_id'],
+            raid_data['raid_name'],
+            raid_data['start_time'],
+            raid_data['end_time'],
+            raid_data.get('zone_name'),
+            raid_data.get('difficulty'),
+            raid_data.get('tenant'),
+            week_key(raid_data['start_time'])
+        ))
+
+@instrumentation.timed
+def store_encounter(encounter_data, cursor=None):
+    """Store boss encounter data."""
+    with write_cursor(cursor) as cursor:
+        cursor.execute('''
+            INSERT INTO encounters
+            (raid_id, fight_id, boss_name, difficulty, kill_time, wipe_count, kill_duration_ms, is_kill,
+             fight_percentage, last_phase)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            encounter_data['raid_id'],
+            encounter_data.get('fight_id'),
+            encounter_data['boss_name'],
+            encounter_data.get('difficulty'),
+            encounter_data.get('kill_time'),
+            encounter_data.get('wipe_count', 0),
+            encounter_data.get('kill_duration_ms'),
+            encounter_data.get('is_kill', False),
+            encounter_data.get('fight_percentage'),
+            encounter_data.get('last_phase')
+        ))
+        return cursor.lastrowid
+
+@instrumentation.timed
+def store_player_performance(performance_data, cursor=None):
+    """Store player performance data."""
+    with write_cursor(cursor) as cursor:
+        cursor.execute('''
+            INSERT INTO player_performance
+            (raid_id, encounter_id, boss_name, difficulty, player_name, player_class, spec, role, dps, hps, percentile, deaths)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            performance_data['raid_id'],
+            performance_data.get('encounter_id'),
+            performance_data.get('boss_name'),
+            performance_data.get('difficulty'),
+            performance_data['player_name'],
+            performance_data.get('player_class'),
+            performance_data.get('spec'),
+            performance_data.get('role'),
+            performance_data.get('dps'),
+            performance_data.get('hps'),
+            performance_data.get('percentile'),
+            performance_data.get('deaths', 0)
+        ))
+
+@instrumentation.timed
+def store_parsed_data(data):
+    """Replace any existing rows for the fetched raids and store the new data.
+
+    Deletes and inserts commit together, so readers never see the raids missing.
+    """
     conn = sqlite3.connect(config.DATABASE_PATH)
     cursor = conn.cursor()
     
-    cursor.execute('''
-        INSERT OR REPLACE INTO raids 
-        (raid_id, raid_name, start_time, end_time, zone_name, difficulty)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (
-        raid_data['raid_id'],
-        raid_data['raid_name'],
-        raid_data['start_time'],
-        raid_data['end_time'],
-        raid_data.get('zone_name'),
-        raid_data.get('difficulty')
-    ))
-    
-    conn.commit()
-    conn.close()
+    # Delete existing data for these raid_ids to prevent duplicates
+    raid_ids = [raid['raid_id'] for raid in data['raids']]
+    if raid_ids:
+        placeholders = ','.join('?' * len(raid_ids))
+        print(f"  Cleaning existing data for {len(raid_ids)} raid(s)...")
+        
+        cursor.execute(f'DELETE FROM deaths WHERE raid_id IN ({placeholders})', raid_ids)
+        cursor.execute(f'DELETE FROM player_performance WHERE raid_id IN ({placeholders})', raid_ids)
+        cursor.execute(f'DELETE FROM encounters WHERE raid_id IN ({placeholders})', raid_ids)
+        cursor.execute(f'DELETE FROM raids WHERE raid_id IN ({placeholders})', raid_ids)
 
-def store_encounter(encounter_data):
-    """Store boss encounter data."""
+    try:
+        store_rows(data, cursor)
+        conn.commit()
+    finally:
+        conn.close()
+
+    refresh_leaderboards(raid_ids)
+
+@instrumentation.timed
+def store_pull(data):
+    """Store one live-tracked pull, replacing any earlier copy of the same fights.
+
+    Unlike store_parsed_data this leaves the rest of the raid alone, so a report
+    can be ingested pull by pull while it is still being logged. The raids row
+    is upserted so its end time follows the report. Leaderboards are not
+    rebuilt here - that costs a scan of the whole week, so the live tracker
+    refreshes them once the raid is over.
+    """
     conn = sqlite3.connect(config.DATABASE_PATH)
     cursor = conn.cursor()
+
+    for raid_id, fight_id in {(e['raid_id'], e['fight_id']) for e in data['encounters']}:
+        cursor.execute('''
+            DELETE FROM player_performance WHERE encounter_id IN
+                (SELECT id FROM encounters WHERE raid_id = ? AND fight_id = ?)
+        ''', (raid_id, fight_id))
+        cursor.execute('DELETE FROM deaths WHERE raid_id = ? AND fight_id = ?', (raid_id, fight_id))
+        cursor.execute('DELETE FROM encounters WHERE raid_id = ? AND fight_id = ?', (raid_id, fight_id))
+
+    try:
+        store_rows(data, cursor)
+        conn.commit()
+    finally:
+        conn.close()
+
+def store_rows(data, cursor):
+    """Insert parsed raids, encounters, players and deaths (no de-duplication) in the caller's transaction."""
+    for table in ('raids', 'encounters', 'players', 'deaths'):
+        instrumentation.count(f'db.rows.{table}', len(data[table]))
+
+    # Store raids first
+    for raid in data['raids']:
+        store_raid(raid, cursor)
     
-    cursor.execute('''
-        INSERT INTO encounters
-        (raid_id, fight_id, boss_name, difficulty, kill_time, wipe_count, kill_duration_ms, is_kill)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        encounter_data['raid_id'],
-        encounter_data.get('fight_id'),
-        encounter_data['boss_name'],
-        encounter_data.get('difficulty'),
-        encounter_data.get('kill_time'),
-        encounter_data.get('wipe_count', 0),
-        encounter_data.get('kill_duration_ms'),
-        encounter_data.get('is_kill', False)
-    ))
+    # Store encounters and create encounter_id map
+    encounter_map = {}  # (raid_id, boss_name, fight_id) -> encounter_id
+    for encounter in data['encounters']:
+        encounter_id = store_encounter(encounter, cursor)
+        key = (encounter['raid_id'], encounter['boss_name'], encounter.get('fight_id'))
+        encounter_map[key] = encounter_id
     
-    encounter_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    # Store player performance with encounter_id
+    for player in data['players']:
+        key = (player['raid_id'], player['boss_name'], player.get('fight_id'))
+        player['encounter_id'] = encounter_map.get(key)
+        store_player_performance(player, cursor)
     
-    return encounter_id
+    # Store deaths
+    print(f"  Storing {len(data['deaths'])} deaths...")
+    for death in data['deaths']:
+        try:
+            store_death(death, cursor)
+        except Exception as e:
+            print(f"    Error storing death: {e}")
+            print(f"    Death data: {death}")
+            break  # Stop after first error to see it
+
+LEADERBOARD_METRICS = ('dps', 'hps', 'percentile')
+
+@instrumentation.timed
+def refresh_leaderboards(raid_ids):
+    """Rebuild the leaderboards of every (tenant, week) the given raids fall in.
+
+    Each week is replaced in one transaction, so readers see either the old
+    ranking or the new one. Returns the number of weeks rebuilt.
+    """
+    if not raid_ids:
+        return 0
 
-def store_player_performance(performance_data):
-    """Store player performance data."""
     conn = sqlite3.connect(config.DATABASE_PATH)
     cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT INTO player_performance
-        (raid_id, encounter_id, boss_name, difficulty, player_name, player_class, spec, role, dps, hps, percentile, deaths)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        performance_data['raid_id'],
-        performance_data.get('encounter_id'),
-        performance_data.get('boss_name'),
-        performance_data.get('difficulty'),
-        performance_data['player_name'],
-        performance_data.get('player_class'),
-        performance_data.get('spec'),
-        performance_data.get('role'),
-        performance_data.get('dps'),
-        performance_data.get('hps'),
-        performance_data.get('percentile'),
-        performance_data.get('deaths', 0)
-    ))
-    
-    conn.commit()
+    weeks = set()
+    for i in range(0, len(raid_ids), 500):  # stay under SQLite's bound-parameter limit
+        chunk = raid_ids[i:i + 500]
+        cursor.execute(f'SELECT tenant, week FROM raids WHERE raid_id IN ({",".join("?" * len(chunk))})', chunk)
+        weeks.update(cursor.fetchall())
+
+    with conn:
+        for tenant, week in sorted(weeks, key=lambda key: (key[0] or '', key[1])):
+            week_start = datetime.strptime(week, '%Y-%m-%d')
+            bounds = (int(week_start.timestamp() * 1000), int((week_start + timedelta(days=7)).timestamp() * 1000))
+            cursor.execute('DELETE FROM leaderboards WHERE tenant = ? AND week = ?', (tenant or '', week))
+            for metric in LEADERBOARD_METRICS:
+                cursor.execute(f'''
+                    INSERT INTO leaderboards
+                    (tenant, week, difficulty, metric, rank, player_name, player_class, role,
+                     avg_value, max_value, samples)
+                    SELECT ?, ?, p.difficulty, ?,
+                           ROW_NUMBER() OVER (PARTITION BY p.difficulty
+                                              ORDER BY AVG(p.{metric}) DESC, p.player_name, p.role),
+                           p.player_name, p.player_class, p.role,
+                           AVG(p.{metric}), MAX(p.{metric}), COUNT(*)
+                    FROM player_performance p
+                    JOIN raids r ON p.raid_id = r.raid_id
+                    WHERE r.tenant IS ? AND r.start_time >= ? AND r.start_time < ?
+                    AND p.{metric} IS NOT NULL AND p.difficulty IS NOT NULL
+                    GROUP BY p.difficulty, p.player_name, p.player_class, p.role
+                ''', (tenant or '', week, metric, tenant, *bounds))
     conn.close()
 
-def get_weekly_summary(week_start, week_end):
+    instrumentation.count('db.leaderboards.weeks', len(weeks))
+    return len(weeks)
+
+_read_deadline = threading.local()  # set by async_db around each query it runs
+
+def connect_readonly():
+    """Open a read-only connection so long scans never take the writer's lock.
+
+    If the calling thread has a query deadline (see async_db), SQLite aborts the
+    statement with OperationalError('interrupted') once it passes.
+    """
+    conn = sqlite3.connect(f'file:{config.DATABASE_PATH}?mode=ro', uri=True)
+    deadline = getattr(_read_deadline, 'at', None)
+    if deadline is not None:
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+    return conn
+
+def current_week_range(now=None):
+    """(start_ms, end_ms) from midnight of the most recent past Wednesday to now.
+    If today is Wednesday, uses last Wednesday so the full raid week is included.
+    """
+    now = now or datetime.now()
+    days_back = (now.weekday() - 2) % 7 or 7  # 2 = Wednesday
+    week_start = (now - timedelta(days=days_back)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    return int(week_start.timestamp() * 1000), int(now.timestamp() * 1000)
+
+def week_key(timestamp_ms):
+    """The raid week a timestamp falls in, as its Wednesday's date (YYYY-MM-DD, local time)."""
+    day = datetime.fromtimestamp(timestamp_ms / 1000)
+    return (day - timedelta(days=(day.weekday() - 2) % 7)).strftime('%Y-%m-%d')
+
+@instrumentation.timed
+def get_weekly_summary(week_start, week_end, tenant=None):
     """Get summary statistics for a given week."""
-    conn = sqlite3.connect(config.DATABASE_PATH)
+    conn = connect_readonly()
     cursor = conn.cursor()
     
     # Get raids in date range, using first pull start to last pull end for accurate raid time
@@ -199,8 +552,8 @@ def get_weekly_summary(week_start, week_end):
             FROM encounters
             GROUP BY raid_id
         ) e ON e.raid_id = r.raid_id
-        WHERE r.start_time >= ? AND r.start_time <= ?
-    ''', (week_start, week_end))
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
+    ''', (week_start, week_end, tenant))
 
     raid_stats = cursor.fetchone()
     total_raids = raid_stats[0] or 0
@@ -213,8 +566,8 @@ def get_weekly_summary(week_start, week_end):
             SUM(wipe_count) as wipes
         FROM encounters e
         JOIN raids r ON e.raid_id = r.raid_id
-        WHERE r.start_time >= ? AND r.start_time <= ?
-    ''', (week_start, week_end))
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
+    ''', (week_start, week_end, tenant))
     
     encounter_stats = cursor.fetchone()
     total_kills = encounter_stats[0] or 0
@@ -229,33 +582,27 @@ def get_weekly_summary(week_start, week_end):
         'total_raid_time_hours': total_time_ms / (1000 * 60 * 60) if total_time_ms else 0
     }
 
-def get_top_performers(week_start, week_end, metric='dps', limit=5, difficulty='Heroic'):
-    """Get top performers for a given metric, filtered by difficulty."""
-    conn = sqlite3.connect(config.DATABASE_PATH)
-    cursor = conn.cursor()
+@instrumentation.timed
+def get_top_performers(week_start, week_end, metric='dps', limit=5, difficulty='Heroic', tenant=None):
+    """Get top performers for a given metric, filtered by difficulty.
 
-    order_column = metric if metric in ['dps', 'hps', 'percentile'] else 'dps'
+    Reads the precomputed leaderboard of the raid week containing week_start.
+    """
+    metric = metric if metric in LEADERBOARD_METRICS else 'dps'
+    conn = connect_readonly()
+    cursor = conn.cursor()
 
-    cursor.execute(f'''
-        SELECT
-            player_name,
-            player_class,
-            role,
-            AVG({order_column}) as avg_performance,
-            MAX({order_column}) as max_performance
-        FROM player_performance p
-        JOIN raids r ON p.raid_id = r.raid_id
-        WHERE r.start_time >= ? AND r.start_time <= ?
-        AND {order_column} IS NOT NULL
-        AND p.difficulty = ?
-        GROUP BY player_name, player_class, role
-        ORDER BY avg_performance DESC
+    cursor.execute('''
+        SELECT player_name, player_class, role, avg_value, max_value
+        FROM leaderboards
+        WHERE tenant = ? AND week = ? AND difficulty = ? AND metric = ?
+        ORDER BY rank
         LIMIT ?
-    ''', (week_start, week_end, difficulty, limit))
-    
+    ''', (tenant or '', week_key(week_start), difficulty, metric, limit))
+
     results = cursor.fetchall()
     conn.close()
-    
+
     return [
         {
             'name': row[0],
@@ -267,9 +614,35 @@ def get_top_performers(week_start, week_end, metric='dps', limit=5, difficulty='
         for row in results
     ]
 
-def get_boss_statistics(week_start, week_end):
+@instrumentation.timed
+def get_leaderboards(week_start, limit=5, tenant=None):
+    """Top performers for every metric and difficulty of a raid week in one read.
+
+    Returns {(metric, difficulty): [performer, ...]} shaped like get_top_performers.
+    """
+    conn = connect_readonly()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT metric, difficulty, player_name, player_class, role, avg_value, max_value
+        FROM leaderboards
+        WHERE tenant = ? AND week = ? AND rank <= ?
+        ORDER BY metric, difficulty, rank
+    ''', (tenant or '', week_key(week_start), limit))
+
+    results = cursor.fetchall()
+    conn.close()
+
+    leaderboards = {}
+    for metric, difficulty, name, player_class, role, avg_value, max_value in results:
+        leaderboards.setdefault((metric, difficulty), []).append(
+            {'name': name, 'class': player_class, 'role': role, 'avg': avg_value, 'max': max_value})
+    return leaderboards
+
+@instrumentation.timed
+def get_boss_statistics(week_start, week_end, tenant=None):
     """Get statistics per boss for the week."""
-    conn = sqlite3.connect(config.DATABASE_PATH)
+    conn = connect_readonly()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -281,10 +654,10 @@ def get_boss_statistics(week_start, week_end):
             AVG(CASE WHEN e.is_kill = 1 THEN e.kill_duration_ms END) / 1000 as avg_kill_time_sec
         FROM encounters e
         JOIN raids r ON e.raid_id = r.raid_id
-        WHERE r.start_time >= ? AND r.start_time <= ?
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
         GROUP BY e.boss_name, e.difficulty
         ORDER BY e.boss_name, e.difficulty
-    ''', (week_start, week_end))
+    ''', (week_start, week_end, tenant))
 
     results = cursor.fetchall()
     conn.close()
@@ -300,22 +673,23 @@ def get_boss_statistics(week_start, week_end):
         for row in results
     ]
 
-def get_boss_mvps(week_start, week_end):
+@instrumentation.timed
+def get_boss_mvps(week_start, week_end, tenant=None):
     """Get the highest parser per boss. Uses parse percentile where available, falls back to top DPS."""
-    conn = sqlite3.connect(config.DATABASE_PATH)
+    conn = connect_readonly()
     cursor = conn.cursor()
 
     cursor.execute('''
         SELECT p.boss_name, p.difficulty, p.player_name, p.player_class, p.role, p.percentile, p.dps, p.hps
         FROM player_performance p
         JOIN raids r ON p.raid_id = r.raid_id
-        WHERE r.start_time >= ? AND r.start_time <= ?
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
           AND p.percentile IS NOT NULL
           AND p.percentile = (
               SELECT MAX(p2.percentile)
               FROM player_performance p2
               JOIN raids r2 ON p2.raid_id = r2.raid_id
-              WHERE r2.start_time >= ? AND r2.start_time <= ?
+              WHERE r2.start_time >= ? AND r2.start_time <= ? AND r2.tenant IS ?
                 AND p2.boss_name = p.boss_name
                 AND p2.difficulty = p.difficulty
           )
@@ -325,12 +699,12 @@ def get_boss_mvps(week_start, week_end):
         SELECT p.boss_name, p.difficulty, p.player_name, p.player_class, p.role, p.percentile, p.dps, p.hps
         FROM player_performance p
         JOIN raids r ON p.raid_id = r.raid_id
-        WHERE r.start_time >= ? AND r.start_time <= ?
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
           AND p.dps IS NOT NULL AND p.dps > 0
           AND NOT EXISTS (
               SELECT 1 FROM player_performance p3
               JOIN raids r3 ON p3.raid_id = r3.raid_id
-              WHERE r3.start_time >= ? AND r3.start_time <= ?
+              WHERE r3.start_time >= ? AND r3.start_time <= ? AND r3.tenant IS ?
                 AND p3.boss_name = p.boss_name
                 AND p3.difficulty = p.difficulty
                 AND p3.percentile IS NOT NULL
@@ -339,17 +713,17 @@ def get_boss_mvps(week_start, week_end):
               SELECT MAX(p4.dps)
               FROM player_performance p4
               JOIN raids r4 ON p4.raid_id = r4.raid_id
-              WHERE r4.start_time >= ? AND r4.start_time <= ?
+              WHERE r4.start_time >= ? AND r4.start_time <= ? AND r4.tenant IS ?
                 AND p4.boss_name = p.boss_name
                 AND p4.difficulty = p.difficulty
           )
 
         ORDER BY 1, 2
-    ''', (week_start, week_end,
-          week_start, week_end,
-          week_start, week_end,
-          week_start, week_end,
-          week_start, week_end))
+    ''', (week_start, week_end, tenant,
+          week_start, week_end, tenant,
+          week_start, week_end, tenant,
+          week_start, week_end, tenant,
+          week_start, week_end, tenant))
 
     results = cursor.fetchall()
     conn.close()
@@ -368,31 +742,79 @@ def get_boss_mvps(week_start, week_end):
         for row in results
     ]
 
-def store_death(death_data):
-    """Store death event data."""
-    conn = sqlite3.connect(config.DATABASE_PATH)
+@instrumentation.timed
+def get_performance_samples(start_time, end_time, tenant=None):
+    """Get every per-fight player performance row in a time range as raw rows.
+
+    Rows are (raid_start, encounter_id, boss_name, difficulty, player_name,
+    player_class, spec, role, dps, hps, percentile) tuples in chronological order,
+    so callers can load them straight into columnar arrays.
+    """
+    conn = connect_readonly()
     cursor = conn.cursor()
-    
+
     cursor.execute('''
-        INSERT INTO deaths 
-        (raid_id, fight_id, boss_name, player_name, ability_name, ability_id, timestamp)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        death_data['raid_id'],
-        death_data.get('fight_id'),
-        death_data.get('boss_name'),
-        death_data['player_name'],
-        death_data.get('ability_name'),
-        death_data.get('ability_id'),
-        death_data.get('timestamp')
-    ))
-    
-    conn.commit()
+        SELECT r.start_time, p.encounter_id, p.boss_name, p.difficulty, p.player_name,
+               p.player_class, p.spec, p.role, p.dps, p.hps, p.percentile
+        FROM player_performance p
+        JOIN raids r ON p.raid_id = r.raid_id
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
+        ORDER BY r.start_time, p.encounter_id, p.id
+    ''', (start_time, end_time, tenant))
+
+    results = cursor.fetchall()
+    conn.close()
+
+    return results
+
+@instrumentation.timed
+def get_encounter_pulls(week_start, week_end, tenant=None):
+    """Get every pull for the week in chronological order as raw rows.
+
+    Rows are (boss_name, difficulty, is_kill, pull_end_ms, duration_ms, fight_percentage)
+    tuples, where pull_end_ms is absolute (report start + fight end offset) and
+    fight_percentage is the boss health left when the pull ended.
+    """
+    conn = connect_readonly()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT e.boss_name, e.difficulty, e.is_kill,
+               r.start_time + e.kill_time as pull_end_ms,
+               e.kill_duration_ms, e.fight_percentage
+        FROM encounters e
+        JOIN raids r ON e.raid_id = r.raid_id
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
+        ORDER BY pull_end_ms
+    ''', (week_start, week_end, tenant))
+
+    results = cursor.fetchall()
     conn.close()
 
-def get_top_death_causes(week_start, week_end, limit=10):
+    return results
+
+@instrumentation.timed
+def store_death(death_data, cursor=None):
+    """Store death event data."""
+    with write_cursor(cursor) as cursor:
+        cursor.execute('''
+            INSERT INTO deaths 
+            (raid_id, fight_id, boss_name, player_name, ability_name, ability_id, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            death_data['raid_id'],
+            death_data.get('fight_id'),
+            death_data.get('boss_name'),
+            death_data['player_name'],
+            death_data.get('ability_name'),
+            death_data.get('ability_id'),
+            death_data.get('timestamp')
+        ))
+
+@instrumentation.timed
+def get_top_death_causes(week_start, week_end, limit=10, tenant=None):
     """Get the top causes of death with boss information."""
-    conn = sqlite3.connect(config.DATABASE_PATH)
+    conn = connect_readonly()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -404,13 +826,13 @@ def get_top_death_causes(week_start, week_end, limit=10):
             ability_id
         FROM deaths d
         JOIN raids r ON d.raid_id = r.raid_id
-        WHERE r.start_time >= ? AND r.start_time <= ?
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
         AND ability_name IS NOT NULL
         AND ability_id != 0
         GROUP BY ability_name, boss_name, ability_id
         ORDER BY death_count DESC
         LIMIT ?
-    ''', (week_start, week_end, limit))
+    ''', (week_start, week_end, tenant, limit))
     
     results = cursor.fetchall()
     conn.close()
@@ -426,9 +848,10 @@ def get_top_death_causes(week_start, week_end, limit=10):
         for row in results
     ]
 
-def get_player_death_count(week_start, week_end):
+@instrumentation.timed
+def get_player_death_count(week_start, week_end, tenant=None):
     """Get death counts per player."""
-    conn = sqlite3.connect(config.DATABASE_PATH)
+    conn = connect_readonly()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -437,15 +860,266 @@ def get_player_death_count(week_start, week_end):
             COUNT(*) as death_count
         FROM deaths d
         JOIN raids r ON d.raid_id = r.raid_id
-        WHERE r.start_time >= ? AND r.start_time <= ?
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
         GROUP BY player_name
         ORDER BY death_count DESC
-    ''', (week_start, week_end))
+    ''', (week_start, week_end, tenant))
     
     results = cursor.fetchall()
     conn.close()
     
     return [{'player': row[0], 'deaths': row[1]} for row in results]
 
+@instrumentation.timed
+def get_death_timeline(week_start, week_end, tenant=None):
+    """Every death of the week with its pull, ordered by pull and then time.
+
+    Returns (raid_id, fight_id, boss_name, difficulty, is_kill, pull_start, player_name,
+    ability_name, timestamp) rows. pull_start and timestamp share the report's clock.
+    """
+    conn = connect_readonly()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT
+            d.raid_id,
+            d.fight_id,
+            e.boss_name,
+            e.difficulty,
+            e.is_kill,
+            e.kill_time - e.kill_duration_ms as pull_start,
+            d.player_name,
+            d.ability_name,
+            d.timestamp
+        FROM deaths d
+        JOIN encounters e ON e.raid_id = d.raid_id AND e.fight_id = d.fight_id
+        JOIN raids r ON d.raid_id = r.raid_id
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
+        ORDER BY d.raid_id, d.fight_id, d.timestamp
+    ''', (week_start, week_end, tenant))
+
+    results = cursor.fetchall()
+    conn.close()
+
+    return results
+
+def get_pull_count(week_start, week_end, tenant=None):
+    """Number of pulls (kills and wipes) in the week."""
+    conn = connect_readonly()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT COUNT(*)
+        FROM encounters e
+        JOIN raids r ON e.raid_id = r.raid_id
+        WHERE r.start_time >= ? AND r.start_time <= ? AND r.tenant IS ?
+    ''', (week_start, week_end, tenant))
+
+    count = cursor.fetchone()[0]
+    conn.close()
+
+    return count
+
+EXPORT_TABLES = ['raids', 'encounters', 'player_performance', 'deaths']
+
+def get_raid_weeks():
+    """Get raid_ids grouped by raid week, keyed by the week's Wednesday (YYYY-MM-DD)."""
+    conn = connect_readonly()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT week, raid_id
+        FROM raids
+        ORDER BY week, start_time
+    ''')
+
+    weeks = {}
+    for week, raid_id in cursor.fetchall():
+        weeks.setdefault(week, []).append(raid_id)
+    conn.close()
+
+    return weeks
+
+def get_table_columns(table):
+    """Get (column_name, declared_type) pairs for one of the export tables."""
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table: {table}")
+
+    conn = connect_readonly()
+    cursor = conn.cursor()
+    cursor.execute(f'PRAGMA table_info({table})')
+    columns = [(row[1], row[2]) for row in cursor.fetchall()]
+    conn.close()
+
+    return columns
+
+def get_table_rows(table, raid_ids):
+    """Get every row of an export table belonging to the given raids."""
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    if not raid_ids:
+        return []
+
+    conn = connect_readonly()
+    cursor = conn.cursor()
+    placeholders = ','.join('?' * len(raid_ids))
+    cursor.execute(f'SELECT * FROM {table} WHERE raid_id IN ({placeholders}) ORDER BY id', raid_ids)
+    results = cursor.fetchall()
+    conn.close()
+
+    return results
+
+def get_table_marker(table, raid_ids):
+    """Cheap change marker for one table's rows in the given raids.
+
+    (row count, max id) catches inserts, deletes and re-stored raids (fresh
+    AUTOINCREMENT ids); encounters also sum pull_number to catch renumbering.
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    if not raid_ids:
+        return [0, None]
+
+    conn = connect_readonly()
+    cursor = conn.cursor()
+    placeholders = ','.join('?' * len(raid_ids))
+    pull_total = ', TOTAL(pull_number)' if table == 'encounters' else ''
+    cursor.execute(f'SELECT COUNT(*), MAX(id){pull_total} FROM {table} WHERE raid_id IN ({placeholders})', raid_ids)
+    marker = list(cursor.fetchone())
+    conn.close()
+
+    return marker
+
+def get_backfill_cursor(tenant, start_time, zone_id=None):
+    """Get the saved backfill position for a tenant/start/zone, or None if never started."""
+    conn = sqlite3.connect(config.DATABASE_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT end_time, next_page, completed
+        FROM backfill_cursors
+        WHERE tenant = ? AND start_time = ? AND zone_id = ?
+    ''', (tenant or '', start_time, zone_id or 0))
+
+    row = cursor.fetchone()
+    conn.close()
+
+    if row is None:
+        return None
+    return {'end_time': row[0], 'next_page': row[1], 'completed': bool(row[2])}
+
+def save_backfill_cursor(tenant, start_time, zone_id, end_time, next_page, completed=False):
+    """Record the next page to fetch so an interrupted backfill can resume."""
+    conn = sqlite3.connect(config.DATABASE_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        INSERT OR REPLACE INTO backfill_cursors
+        (tenant, start_time, zone_id, end_time, next_page, completed, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ''', (tenant or '', start_time, zone_id or 0, end_time, next_page, completed))
+
+    conn.commit()
+    conn.close()
+
+@instrumentation.timed
+def get_progression_groups(raid_ids):
+    """(tenant, boss_name, difficulty, earliest pull end) for the not yet numbered pulls in the given raids."""
+    if not raid_ids:
+        return []
+
+    conn = connect_readonly()
+    cursor = conn.cursor()
+    placeholders = ','.join('?' * len(raid_ids))
+    cursor.execute(f'''
+        SELECT r.tenant, e.boss_name, e.difficulty, MIN(r.start_time + e.kill_time)
+        FROM encounters e
+        JOIN raids r ON e.raid_id = r.raid_id
+        WHERE e.raid_id IN ({placeholders}) AND e.pull_number IS NULL
+        GROUP BY r.tenant, e.boss_name, e.difficulty
+    ''', raid_ids)
+    results = cursor.fetchall()
+    conn.close()
+
+    return results
+
+@instrumentation.timed
+def get_progression_pulls(tenant, boss_name, difficulty, after=None):
+    """Get one boss's pulls for a tenant, oldest first, optionally only those ending after `after`.
+
+    Rows are (encounter_id, pull_end_ms, is_kill, fight_percentage, last_phase, pull_number) tuples.
+    """
+    conn = connect_readonly()
+    cursor = conn.cursor()
 
+    cursor.execute('''
+        SELECT e.id, r.start_time + e.kill_time as pull_end_ms, e.is_kill,
+               e.fight_percentage, e.last_phase, e.pull_number
+        FROM encounters e
+        JOIN raids r ON e.raid_id = r.raid_id
+        WHERE r.tenant IS ? AND e.boss_name = ? AND e.difficulty IS ? AND r.start_time + e.kill_time > ?
+        ORDER BY pull_end_ms, e.id
+    ''', (tenant, boss_name, difficulty, after if after is not None else -1))
+
+    results = cursor.fetchall()
+    conn.close()
+
+    return results
+
+@instrumentation.timed
+def get_boss_progression(tenant=None):
+    """Get a tenant's stored per-boss progression, most recently pulled first."""
+    conn = connect_readonly()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT boss_name, difficulty, pulls, kills, best_percentage, best_pull,
+               first_kill_pull, first_kill_time, phase_counts, last_pull_end
+        FROM boss_progression
+        WHERE tenant = ?
+        ORDER BY last_pull_end DESC
+    ''', (tenant or '',))
+
+    results = cursor.fetchall()
+    conn.close()
 
+    return [
+        {
+            'boss': row[0],
+            'difficulty': row[1] or None,
+            'pulls': row[2],
+            'kills': row[3],
+            'best_percentage': row[4],
+            'best_pull': row[5],
+            'first_kill_pull': row[6],
+            'first_kill_time': row[7],
+            'phase_counts': {int(phase): count for phase, count in json.loads(row[8] or '{}').items()},
+            'last_pull_end': row[9],
+        }
+        for row in results
+    ]
+
+@instrumentation.timed
+def save_boss_progression(tenant, progress, pull_numbers):
+    """Upsert one boss's progression row and write the pull numbers it assigned.
+
+    pull_numbers maps encounter id -> season pull number.
+    """
+    conn = sqlite3.connect(config.DATABASE_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        INSERT OR REPLACE INTO boss_progression
+        (tenant, boss_name, difficulty, pulls, kills, best_percentage, best_pull,
+         first_kill_pull, first_kill_time, phase_counts, last_pull_end, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ''', (
+        tenant or '', progress['boss'], progress['difficulty'] or '', progress['pulls'], progress['kills'],
+        progress['best_percentage'], progress['best_pull'], progress['first_kill_pull'],
+        progress['first_kill_time'], json.dumps(progress['phase_counts'], sort_keys=True), progress['last_pull_end']
+    ))
+    cursor.executemany('UPDATE encounters SET pull_number = ? WHERE id = ?',
+                       [(number, encounter_id) for encounter_id, number in pull_numbers.items()])
+
+    conn.commit()
+    conn.close()
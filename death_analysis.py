@@ -0,0 +1,91 @@
+"""Death timelines: who dies first, when each ability kills, and which death lost the pull.
+
+The week's deaths come back from one query already ordered by pull and time,
+so every pull is a single forward walk over its deaths:
+
+    first death      the pull's earliest death (first_deaths counts them per player)
+    time into pull   death timestamp minus pull start, per ability (ability_timing quantiles)
+    wipe cause       on a wipe, the first death of the final cascade - the run of deaths
+                     no more than CASCADE_GAP_MS apart that ends the pull. A wipe whose
+                     last run is shorter than CASCADE_MIN_DEATHS was called, not caused.
+"""
+from itertools import groupby
+import numpy as np
+import analytics
+import database
+import instrumentation
+
+CASCADE_GAP_MS = 8000
+CASCADE_MIN_DEATHS = 3
+
+def analyse_deaths(rows, total_pulls=None):
+    """Summarise get_death_timeline rows (sorted by pull, then time).
+
+    First-death shares are of total_pulls, the week's pull count; pulls
+    without a death never show up in rows, so it defaults to those that had one.
+    """
+    pulls = wipes = called_wipes = 0
+    first_deaths, deaths_per_player, wipe_causes = {}, {}, {}
+    abilities, bosses, offsets = [], [], []
+
+    for _, pull_rows in groupby(rows, key=lambda row: (row[0], row[1])):
+        pulls += 1
+        run_start, previous = 0, None
+        pull_rows = list(pull_rows)
+        for i, (_, _, boss, _, _, pull_start, player, ability, timestamp) in enumerate(pull_rows):
+            if i == 0:
+                first_deaths[player] = first_deaths.get(player, 0) + 1
+            elif timestamp - previous > CASCADE_GAP_MS:
+                run_start = i
+            previous = timestamp
+            deaths_per_player[player] = deaths_per_player.get(player, 0) + 1
+            abilities.append(ability or 'Unknown')
+            bosses.append(boss)
+            offsets.append(max(timestamp - pull_start, 0) if pull_start is not None else np.nan)
+
+        _, _, boss, _, is_kill, _, player, ability, _ = pull_rows[run_start]
+        if is_kill:
+            continue
+        wipes += 1
+        if len(pull_rows) - run_start < CASCADE_MIN_DEATHS:
+            called_wipes += 1
+            continue
+        key = (player, ability or 'Unknown', boss)
+        wipe_causes[key] = wipe_causes.get(key, 0) + 1
+
+    share_of = max(total_pulls or 0, pulls)
+    return {
+        'pulls': pulls,
+        'wipes': wipes,
+        'called_wipes': called_wipes,
+        'first_deaths': sorted((
+            {'player': player, 'first_deaths': count, 'deaths': deaths_per_player[player], 'share': count / share_of}
+            for player, count in first_deaths.items()
+        ), key=lambda row: (-row['first_deaths'], -row['share'], row['player'])),
+        'ability_timing': ability_timing(np.array(abilities, dtype=object), np.array(bosses, dtype=object),
+                                         np.array(offsets, dtype=float)),
+        'wipe_causes': sorted((
+            {'player': player, 'ability': ability, 'boss': boss, 'wipes': count}
+            for (player, ability, boss), count in wipe_causes.items()
+        ), key=lambda row: (-row['wipes'], row['player'])),
+    }
+
+def ability_timing(abilities, bosses, offsets):
+    """Per (ability, boss): deaths and the 25th/50th/75th percentile time into the pull in ms."""
+    if abilities.size == 0:
+        return []
+    keys, inverse = analytics.group_index(abilities, bosses)
+    present, counts, table = analytics.group_quantiles(inverse, offsets, (0.25, 0.5, 0.75))
+    timing = [
+        {'ability': keys[i][0], 'boss': keys[i][1], 'deaths': int(count),
+         'p25': float(row[0]), 'median': float(row[1]), 'p75': float(row[2])}
+        for i, count, row in zip(present, counts, table)
+    ]
+    timing.sort(key=lambda row: (-row['deaths'], row['median']))
+    return timing
+
+@instrumentation.timed
+def load_death_timeline(week_start, week_end, tenant=None):
+    """Death analysis for one tenant's week."""
+    return analyse_deaths(database.get_death_timeline(week_start, week_end, tenant),
+                          database.get_pull_count(week_start, week_end, tenant))
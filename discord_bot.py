@@ -1,89 +1,395 @@
-"""Discord bot to post the weekly raid stats PowerPoint."""
+"""Discord bot to post the weekly raid stats PowerPoint.
+
+`python discord_bot.py publish [deck URL]` announces the week through
+DISCORD_WEBHOOK_URL with the key slides inline, and `python discord_bot.py post`
+uploads the latest deck as the bot - both are plain HTTP calls and never import
+discord.py. The interactive bot (`python discord_bot.py`) loads discord.py and
+the WarcraftLogs client on start.
+
+Bot commands: /player, /boss, /deaths and /top answer from stats_cache (the
+current week held in memory), !raidstats posts the latest deck and !reports
+lists this week's logs. With a tenants.toml, each bot serves one team - pick it
+with `--tenant KEY` (defaults to the first).
+"""
+import json
 import os
-import discord
-from discord.ext import commands
+import re
+import time
+from datetime import datetime, timezone
 import config
 
-# Initialize bot
-intents = discord.Intents.default()
-intents.message_content = True
-bot = commands.Bot(command_prefix='!', intents=intents)
+DISCORD_API_URL = 'https://discord.com/api/v10'
+MAX_RETRIES = 5  # 429 retries per request
+
+_latest_presentation = {}  # (output dir, tenant) -> (dir mtime, newest deck path)
+_session = None
 
-@bot.event
-async def on_ready():
-    """Bot startup event."""
-    print(f'{bot.user} has connected to Discord!')
+def latest_presentation():
+    """Path of the current tenant's most recent deck in OUTPUT_DIR, or None if there isn't one.
 
-@bot.command(name='raidstats')
-async def post_raid_stats(ctx):
-    """Post the latest raid stats presentation."""
-    # Find the most recent PowerPoint file
+    The directory is only rescanned when its mtime changes (a deck was added or removed).
+    """
     output_dir = config.OUTPUT_DIR
-    
-    if not os.path.exists(output_dir):
-        await ctx.send("No raid stats found. Please generate the presentation first.")
-        return
-    
-    files = [f for f in os.listdir(output_dir) if f.endswith('.pptx')]
-    
-    if not files:
-        await ctx.send("No raid stats found. Please generate the presentation first.")
-        return
-    
-    # Get most recent file
-    latest_file = max(files, key=lambda f: os.path.getctime(os.path.join(output_dir, f)))
-    filepath = os.path.join(output_dir, latest_file)
-    
-    # Send the file
-    await ctx.send(
-        f"📊 **{config.GUILD_NAME} Weekly Raid Stats**\n"
-        f"Here's this week's performance breakdown!",
-        file=discord.File(filepath)
+    try:
+        dir_mtime = os.stat(output_dir).st_mtime_ns
+    except OSError:
+        return None
+
+    cache_key = (output_dir, config.TENANT)
+    cached = _latest_presentation.get(cache_key)
+    if cached and cached[0] == dir_mtime:
+        return cached[1]
+
+    # raid-stats-<week>.pptx, or raid-stats-<tenant>-<week>.pptx for a tenant's deck
+    tenant_label = f'{re.escape(config.TENANT)}-' if config.TENANT else ''
+    pattern = re.compile(rf'raid-stats-{tenant_label}\d{{4}}-\d{{2}}-\d{{2}}\.pptx')
+    with os.scandir(output_dir) as entries:
+        decks = [(entry.stat().st_ctime, entry.path) for entry in entries if pattern.fullmatch(entry.name)]
+    latest = max(decks)[1] if decks else None
+    _latest_presentation[cache_key] = (dir_mtime, latest)
+    return latest
+
+def format_player(player):
+    """Reply text for /player."""
+    lines = [f"**{player['name']}** - {player['spec']} {player['class']} ({player['role']}), "
+             f"{player.get('deaths', 0)} death(s) this week"]
+    metric = 'hps' if player['role'] == 'Healer' else 'dps'
+    for (boss, difficulty), best in sorted(player['bosses'].items()):
+        parse = f", best parse {best['percentile']:.0f}" if best['percentile'] is not None else ''
+        lines.append(f"• {boss} ({difficulty}): {best[metric]:,.0f} {metric.upper()}{parse} "
+                     f"over {best['pulls']} kill(s)")
+    return '\n'.join(lines)
+
+def format_boss(stats, bosses):
+    """Reply text for /boss."""
+    lines = []
+    for boss in bosses:
+        kill_time = f", avg kill {boss['avg_kill_time'] // 60:.0f}:{boss['avg_kill_time'] % 60:02.0f}" \
+            if boss['avg_kill_time'] else ''
+        lines.append(f"**{boss['boss']}** ({boss['difficulty']}): {boss['kills']} kill(s), "
+                     f"{boss['wipes']} wipe(s){kill_time}")
+        # One MVP per kill - show who earned it most often
+        awards = {}
+        for mvp in stats['mvps'].get((boss['boss'], boss['difficulty']), []):
+            awards[mvp['player_name']] = awards.get(mvp['player_name'], 0) + 1
+        if awards:
+            ranked = sorted(awards.items(), key=lambda item: -item[1])[:3]
+            lines.append("  MVP: " + ", ".join(f"{name} x{kills}" for name, kills in ranked))
+    return '\n'.join(lines)
+
+def format_deaths(stats, limit=5):
+    """Reply text for /deaths."""
+    lines = ["**Top causes of death**"]
+    lines += [f"• {cause['ability']} ({cause['boss']}): {cause['deaths']} deaths, "
+              f"{cause['players_affected']} players" for cause in stats['death_causes']]
+    most = sorted((p for p in stats['players'].values() if p.get('deaths')), key=lambda p: -p['deaths'])[:limit]
+    if most:
+        lines.append("**Most deaths**")
+        lines += [f"• {player['name']}: {player['deaths']}" for player in most]
+    return '\n'.join(lines)
+
+def format_top(players, metric, difficulty):
+    """Reply text for /top."""
+    lines = [f"**Top {metric.upper()} - {difficulty}**"]
+    lines += [f"{rank}. {player['name']} ({player['class']}) - {player['avg']:,.0f} avg, {player['max']:,.0f} best"
+              for rank, player in enumerate(players, start=1)]
+    return '\n'.join(lines)
+
+def create_bot(tenant=None):
+    """Build the interactive command bot for one tenant (defaults to the .env guild)."""
+    import asyncio
+    import discord
+    from discord import app_commands
+    from discord.ext import commands
+    import async_db
+    import fetch_data
+    import stats_cache
+
+    tenant = tenant or config.default_tenant()
+    intents = discord.Intents.default()
+    intents.message_content = True
+    bot = commands.Bot(command_prefix='!', intents=intents)
+
+    # Shared async WarcraftLogs client - its aiohttp session is created lazily on the bot's event loop
+    wcl_api = fetch_data.AsyncWarcraftLogsAPI()
+    db = async_db.AsyncDatabase()  # every SQLite read runs on this pool, never on the event loop
+    cache = stats_cache.StatsCache(tenant['key'], db=db)
+    posted_decks = {}  # (deck path, mtime) -> jump URL of the message it was uploaded in
+
+    async def setup_hook():
+        await bot.tree.sync()
+    bot.setup_hook = setup_hook
+
+    @bot.event
+    async def on_ready():
+        """Bot startup event - warm the stats cache so the first command is instant."""
+        print(f'{bot.user} has connected to Discord!')
+        await cache.get()
+
+    @bot.tree.error
+    async def on_app_command_error(interaction, error):
+        original = getattr(error, 'original', error)
+        if isinstance(original, asyncio.TimeoutError):
+            message = "The stats database is busy (probably mid-import) - try again in a minute."
+        else:
+            print(f"✗ /{interaction.command.name if interaction.command else '?'} failed: {original!r}")
+            message = "Something went wrong fetching stats."
+        if interaction.response.is_done():
+            await interaction.followup.send(message, ephemeral=True)
+        else:
+            await interaction.response.send_message(message, ephemeral=True)
+
+    @bot.command(name='raidstats')
+    async def post_raid_stats(ctx):
+        """Post the latest raid stats presentation."""
+        filepath = latest_presentation()
+        if not filepath:
+            await ctx.send("No raid stats found. Please generate the presentation first.")
+            return
+
+        # Link to an earlier upload of the same deck instead of sending the file again
+        deck_key = (filepath, os.path.getmtime(filepath))
+        if deck_key in posted_decks:
+            await ctx.send(f"📊 This week's deck is already posted: {posted_decks[deck_key]}")
+            return
+
+        message = await ctx.send(
+            f"📊 **{tenant['guild_name']} Weekly Raid Stats**\n"
+            f"Here's this week's performance breakdown!",
+            file=discord.File(filepath)
+        )
+        posted_decks[deck_key] = message.jump_url
+
+    async def player_names(interaction, current):
+        stats = await cache.get()
+        current = current.lower()
+        return [app_commands.Choice(name=player['name'], value=player['name'])
+                for key, player in sorted(stats['players'].items()) if current in key][:25]
+
+    async def boss_names(interaction, current):
+        stats = await cache.get()
+        names = sorted({boss['boss'] for boss in stats['bosses']})
+        return [app_commands.Choice(name=name, value=name) for name in names if current.lower() in name.lower()][:25]
+
+    @bot.tree.command(name='player', description="A raider's best output and parses this week")
+    @app_commands.autocomplete(name=player_names)
+    async def player_command(interaction, name: str):
+        stats = await cache.get()
+        player = stats_cache.find_player(stats, name)
+        if not player:
+            await interaction.response.send_message(f"No logged pulls for '{name}' this week.", ephemeral=True)
+            return
+        await interaction.response.send_message(format_player(player)[:2000])
+
+    @bot.tree.command(name='boss', description="Kills, wipes and MVP for a boss this week")
+    @app_commands.autocomplete(name=boss_names)
+    async def boss_command(interaction, name: str):
+        stats = await cache.get()
+        bosses = stats_cache.find_boss(stats, name)
+        if not bosses:
+            await interaction.response.send_message(f"No pulls on '{name}' this week.", ephemeral=True)
+            return
+        await interaction.response.send_message(format_boss(stats, bosses)[:2000])
+
+    @bot.tree.command(name='deaths', description="This week's deadliest mechanics and who died most")
+    async def deaths_command(interaction):
+        stats = await cache.get()
+        await interaction.response.send_message(format_deaths(stats)[:2000])
+
+    @bot.tree.command(name='top', description="Top performers this week")
+    @app_commands.choices(
+        metric=[app_commands.Choice(name=m.upper(), value=m) for m in ('dps', 'hps')],
+        difficulty=[app_commands.Choice(name=d, value=d) for d in config.DIFFICULTY_ORDER],
     )
+    async def top_command(interaction, metric: str = 'dps', difficulty: str = 'Heroic'):
+        stats = await cache.get()
+        players = stats['top'].get((metric, difficulty))
+        if not players:
+            await interaction.response.send_message(f"No {difficulty} {metric.upper()} logged this week.", ephemeral=True)
+            return
+        await interaction.response.send_message(format_top(players, metric, difficulty)[:2000])
+
+    @bot.command(name='reports')
+    async def list_reports(ctx):
+        """List this raid week's WarcraftLogs reports without blocking the bot."""
+        try:
+            reports = await wcl_api.get_guild_reports(days_back=fetch_data.raid_week_days_back(), tenant=tenant)
+        except Exception as e:
+            await ctx.send(f"Couldn't reach WarcraftLogs: {e}")
+            return
+
+        if not reports:
+            await ctx.send("No logs found for this raid week yet.")
+            return
+
+        lines = [
+            f"• [{report['title']}](https://www.warcraftlogs.com/reports/{report['code']}) - "
+            f"{len(report.get('fights', []))} boss pulls"
+            for report in reports
+        ]
+        await ctx.send(f"📜 **This week's logs**\n" + "\n".join(lines))
+
+    return bot
+
+def http_session():
+    """One requests.Session for every REST/webhook call in this process (keeps the TLS connection)."""
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+def discord_request(method, url, **kwargs):
+    """Make a Discord HTTP request, waiting out 429s for as long as Discord asks.
+
+    Also sleeps after a response that empties the rate-limit bucket, so the
+    next call doesn't earn a 429 of its own. Returns the final response.
+    """
+    kwargs.setdefault('timeout', 60)
+    for attempt in range(MAX_RETRIES + 1):
+        response = http_session().request(method, url, **kwargs)
+        if response.status_code != 429 or attempt == MAX_RETRIES:
+            break
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is None:
+            try:
+                retry_after = response.json().get('retry_after', 1)
+            except ValueError:  # e.g. an HTML error page from a proxy
+                retry_after = 1
+        print(f"  Discord rate limited - retrying in {float(retry_after):.1f}s")
+        time.sleep(float(retry_after))
+
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        time.sleep(float(response.headers.get('X-RateLimit-Reset-After', 0)))
+    return response
+
+def multipart(payload, paths):
+    """data/files kwargs for a message with attachments (read up front so a retry can resend them)."""
+    payload = dict(payload, attachments=[
+        {'id': i, 'filename': os.path.basename(path)} for i, path in enumerate(paths)
+    ])
+    files = []
+    for i, path in enumerate(paths):
+        with open(path, 'rb') as f:
+            files.append((f'files[{i}]', (os.path.basename(path), f.read())))
+    return {'data': {'payload_json': json.dumps(payload)}, 'files': files}
+
+def report_failure(response, target):
+    if response.status_code == 404:
+        print(f"Could not find {target}")
+    elif response.status_code >= 300:
+        print(f"✗ Discord post failed ({response.status_code}): {response.text}")
+    return response.status_code < 300
+
+def send_channel_message(content, filepath=None):
+    """Post a message (and optionally one file) to DISCORD_CHANNEL_ID as the bot, over REST.
+
+    Returns True on success. No gateway connection, so callers only need `requests`.
+    """
+    url = f'{DISCORD_API_URL}/channels/{config.DISCORD_CHANNEL_ID}/messages'
+    headers = {'Authorization': f'Bot {config.DISCORD_BOT_TOKEN}'}
+    payload = {'content': content}
+    body = multipart(payload, [filepath]) if filepath else {'json': payload}
+    response = discord_request('POST', url, headers=headers, **body)
+    return report_failure(response, f"channel {config.DISCORD_CHANNEL_ID}")
+
+def send_webhook_message(content, paths=(), embeds=None, webhook_url=None):
+    """Post through DISCORD_WEBHOOK_URL, with optional attachments and embeds. Returns True on success."""
+    url = f"{webhook_url or config.DISCORD_WEBHOOK_URL}?wait=true"
+    payload = {'content': content, 'embeds': embeds or []}
+    body = multipart(payload, paths) if paths else {'json': payload}
+    return report_failure(discord_request('POST', url, **body), "the Discord webhook")
 
-async def post_to_channel(filepath=None):
-    """Post raid stats to configured channel."""
+def preview_images():
+    """PNG previews of the key slides (PREVIEW_SLIDES) that exist in SLIDES_DIR."""
+    paths = [os.path.join(config.SLIDES_DIR, f'{slide}.png') for slide in config.PREVIEW_SLIDES]
+    return [path for path in paths if os.path.exists(path)]
+
+def tenant_deck_url(deck_url):
+    """Point a slideshow URL at the current tenant's slideshow (slideshow.html -> slideshow-<key>.html)."""
+    default_name = 'slideshow.html'
+    if deck_url and config.TENANT and deck_url.endswith(default_name):
+        return deck_url[:-len(default_name)] + os.path.basename(config.SLIDESHOW_PATH)
+    return deck_url
+
+def publish_weekly(deck_url=None, webhook_url=None):
+    """Announce the week's stats through the webhook: deck link plus key slide previews inline.
+
+    Without a deck URL the latest .pptx is attached instead.
+    """
+    if not (webhook_url or config.DISCORD_WEBHOOK_URL):
+        print("DISCORD_WEBHOOK_URL not set. Skipping Discord post.")
+        return False
+
+    previews = preview_images()
+    paths = list(previews)
+    lines = [f"📊 **{config.GUILD_NAME} Weekly Raid Stats**"]
+    if deck_url:
+        lines.append(f"View the full deck: {deck_url}")
+    else:
+        deck = latest_presentation()
+        if deck:
+            paths.append(deck)
+    lines.append(f"Updated: {datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC")
+
+    # One embed per preview; embeds sharing a url are shown as a single gallery
+    embeds = [{'image': {'url': f'attachment://{os.path.basename(path)}'}} for path in previews]
+    if deck_url:
+        for embed in embeds:
+            embed['url'] = deck_url
+    if send_webhook_message('\n'.join(lines), paths, embeds, webhook_url):
+        print(f"✓ Posted raid stats to Discord ({len(previews)} preview(s))")
+        return True
+    return False
+
+def post_to_channel(filepath=None):
+    """Post raid stats to the configured channel."""
     if not config.DISCORD_BOT_TOKEN or not config.DISCORD_CHANNEL_ID:
         print("Discord configuration missing. Skipping Discord post.")
         return
-    
+
     # Get the most recent file if not specified
-    if filepath is None:
-        output_dir = config.OUTPUT_DIR
-        files = [f for f in os.listdir(output_dir) if f.endswith('.pptx')]
-        if not files:
-            print("No presentation files found.")
-            return
-        latest_file = max(files, key=lambda f: os.path.getctime(os.path.join(output_dir, f)))
-        filepath = os.path.join(output_dir, latest_file)
-    
-    # Connect to Discord
-    client = discord.Client(intents=intents)
-    
-    @client.event
-    async def on_ready():
-        channel = client.get_channel(int(config.DISCORD_CHANNEL_ID))
-        if channel:
-            await channel.send(
-                f"📊 **{config.GUILD_NAME} Weekly Raid Stats**\n"
-                f"This week's performance breakdown is ready!",
-                file=discord.File(filepath)
-            )
-            print(f"Posted raid stats to Discord channel {config.DISCORD_CHANNEL_ID}")
-        else:
-            print(f"Could not find channel {config.DISCORD_CHANNEL_ID}")
-        
-        await client.close()
-    
-    await client.start(config.DISCORD_BOT_TOKEN)
+    filepath = filepath or latest_presentation()
+    if not filepath:
+        print("No presentation files found.")
+        return
+
+    content = (f"📊 **{config.GUILD_NAME} Weekly Raid Stats**\n"
+               f"This week's performance breakdown is ready!")
+    if send_channel_message(content, filepath):
+        print(f"Posted raid stats to Discord channel {config.DISCORD_CHANNEL_ID}")
 
 if __name__ == '__main__':
     import sys
-    import asyncio
-    
-    if len(sys.argv) > 1 and sys.argv[1] == 'post':
+
+    args = sys.argv[1:]
+    tenant_key = None
+    if '--tenant' in args:
+        i = args.index('--tenant')
+        tenant_key = args[i + 1] if i + 1 < len(args) else ''
+        del args[i:i + 2]
+    tenant = config.find_tenant(tenant_key)
+    if tenant is None:
+        print(f"✗ Unknown tenant '{tenant_key}'")
+        sys.exit(1)
+    # post/publish cover every team unless one is named; the bot always serves a single team
+    tenants = [tenant] if tenant_key is not None else config.load_tenants()
+
+    if args and args[0] == 'post':
         # Direct posting mode
-        asyncio.run(post_to_channel())
+        for tenant in tenants:
+            with config.tenant_context(tenant):
+                post_to_channel()
+    elif args and args[0] == 'publish':
+        # Scheduled webhook post: python discord_bot.py publish [deck URL]
+        deck_url = args[1] if len(args) > 1 else config.DECK_URL
+        published = True
+        for tenant in tenants:
+            # Slides, deck and guild name all come from the tenant's settings
+            with config.tenant_context(tenant):
+                published = publish_weekly(tenant_deck_url(deck_url)) and published
+        sys.exit(0 if published else 1)
     else:
         # Bot mode (for interactive use)
-        bot.run(config.DISCORD_BOT_TOKEN)
+        with config.tenant_context(tenant):
+            create_bot(tenant).run(config.DISCORD_BOT_TOKEN)
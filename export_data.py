@@ -0,0 +1,152 @@
+"""Export the stats warehouse to week-partitioned Parquet / Arrow IPC files.
+
+Layout is Hive-style so Arrow, DuckDB, Polars and pandas can scan it directly:
+
+    exports/<table>/week=YYYY-MM-DD/part-0.parquet   (or part-0.arrow)
+
+Exports are incremental: exports/_manifest.json records, per partition, a fingerprint
+of the table schema and a cheap marker of the rows it was written from (row count and
+max id, plus the pull number total for encounters). A partition is only rewritten when
+either changes - new columns, re-stored raids, renumbered pulls. Partitions of weeks
+that are no longer in the database are removed.
+"""
+import hashlib
+import json
+import os
+import sys
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import config
+import database
+
+FORMATS = {
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+# SQLite declared type -> Arrow type, so every partition of a table shares one schema
+ARROW_TYPES = {
+    'INTEGER': pa.int64(),
+    'REAL': pa.float64(),
+    'TEXT': pa.string(),
+    'BOOLEAN': pa.int64(),
+    'TIMESTAMP': pa.string(),
+}
+
+def table_schema(table):
+    """Build the Arrow schema for an export table from its SQLite declaration."""
+    return pa.schema([
+        (name, ARROW_TYPES.get(decl_type.upper(), pa.string()))
+        for name, decl_type in database.get_table_columns(table)
+    ])
+
+def fingerprint(value):
+    """Short stable hash of a table schema for the manifest."""
+    return hashlib.sha256(repr(value).encode()).hexdigest()[:16]
+
+def manifest_path(export_dir):
+    """Path of the manifest recording what each partition was written from."""
+    return os.path.join(export_dir, '_manifest.json')
+
+def load_manifest(export_dir):
+    """Load the export manifest, or an empty one for a fresh export directory."""
+    path = manifest_path(export_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(export_dir, manifest):
+    """Write the manifest atomically, like the partitions it describes."""
+    os.makedirs(export_dir, exist_ok=True)
+    path = manifest_path(export_dir)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+def partition_path(export_dir, table, week, fmt):
+    """Path of one table's partition file for a raid week."""
+    return os.path.join(export_dir, table, f'week={week}', f'part-0{FORMATS[fmt]}')
+
+def write_partition(path, arrow_table, fmt):
+    """Write one partition atomically (temp file + rename) so readers never see half a file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    if fmt == 'parquet':
+        pq.write_table(arrow_table, tmp_path, compression='zstd')
+    else:
+        # Uncompressed IPC can be memory-mapped without a decode step
+        feather.write_feather(arrow_table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+
+def remove_partition(path):
+    """Delete a partition file and its week directory once that is empty."""
+    if os.path.exists(path):
+        os.remove(path)
+    week_dir = os.path.dirname(path)
+    if os.path.isdir(week_dir) and not os.listdir(week_dir):
+        os.rmdir(week_dir)
+
+def export_warehouse(export_dir=None, fmt='parquet', full=False):
+    """Export raids, encounters, player_performance and deaths partitioned by raid week.
+
+    Returns the list of weeks that were written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of: {', '.join(FORMATS)}")
+    export_dir = export_dir or config.EXPORT_DIR
+
+    weeks = database.get_raid_weeks()
+    if not weeks:
+        print("No raids in database - nothing to export.")
+        return []
+
+    schemas = {table: table_schema(table) for table in database.EXPORT_TABLES}
+    schema_prints = {table: fingerprint(str(schema)) for table, schema in schemas.items()}
+    manifest = load_manifest(export_dir)
+    exported = manifest.setdefault(fmt, {})
+    written = []
+
+    # Weeks whose raids were all deleted or re-stored into another week
+    stale = [key for key in exported if key.split('/week=')[1] not in weeks]
+    for key in stale:
+        table, week = key.split('/week=')
+        remove_partition(partition_path(export_dir, table, week, fmt))
+        del exported[key]
+    if stale:
+        save_manifest(export_dir, manifest)
+        print(f"  Removed {len(stale)} partition(s) of weeks no longer in the database")
+
+    for week, raid_ids in sorted(weeks.items()):
+        changed = 0
+        for table in database.EXPORT_TABLES:
+            schema = schemas[table]
+            entry = {'schema': schema_prints[table], 'rows': database.get_table_marker(table, raid_ids)}
+            path = partition_path(export_dir, table, week, fmt)
+            key = f'{table}/week={week}'
+            if not full and exported.get(key) == entry and os.path.exists(path):
+                continue
+
+            rows = database.get_table_rows(table, raid_ids)
+            columns = list(zip(*rows)) if rows else [()] * len(schema)
+            arrow_table = pa.table(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            )
+            write_partition(path, arrow_table, fmt)
+            exported[key] = entry
+            changed += 1
+
+        if changed:
+            save_manifest(export_dir, manifest)
+            written.append(week)
+            print(f"  Exported week {week} ({len(raid_ids)} raid(s), {changed} table(s) changed)")
+
+    print(f"✓ Exported {len(written)} week(s) to {export_dir}/ as {fmt}")
+    return written
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    export_format = 'arrow' if '--arrow' in args else 'parquet'
+    export_warehouse(fmt=export_format, full='--full' in args)
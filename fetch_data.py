@@ -1,6 +1,14 @@
+import hashlib
+import json
+import os
+import threading
+import time
 import requests
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 import config
+import instrumentation
+import replay
 
 DIFFICULTY_MAP = {
     3: 'Normal',
@@ -9,6 +17,9 @@ DIFFICULTY_MAP = {
     14: 'LFR'
 }
 
+REPORT_PAGE_SIZE = 25  # reports per page when paging through guild history
+LIVE_FIGHT_WINDOW = 10  # fight IDs asked for per live poll (live_tracker.py)
+
 # boss filter - only these bosses will be included - difficulty filter has been added to env. update in yml as well for midnight
 BOSS_FILTER = [
     "Imperator Averzian",
@@ -22,399 +33,930 @@ BOSS_FILTER = [
     "Midnight Falls"
 ]
 
+OAUTH_TOKEN_URL = 'https://www.warcraftlogs.com/oauth/token'
+
+GUILD_REPORTS_QUERY = """
+query($guildName: String!, $serverSlug: String!, $serverRegion: String!,
+      $startTime: Float, $endTime: Float, $zoneID: Int, $limit: Int, $page: Int) {
+  reportData {
+    reports(
+      guildName: $guildName
+      guildServerSlug: $serverSlug
+      guildServerRegion: $serverRegion
+      startTime: $startTime
+      endTime: $endTime
+      zoneID: $zoneID
+      limit: $limit
+      page: $page
+    ) {
+      data {
+        code
+        title
+        owner {
+          name
+        }
+        startTime
+        endTime
+        zone {
+          name
+        }
+      }
+      has_more_pages
+    }
+  }
+}
+"""
+
+ACTOR_MAPPINGS_QUERY = """
+query($code: String!) {
+  reportData {
+    report(code: $code) {
+      masterData {
+        actors {
+          id
+          name
+          type
+          subType
+        }
+        abilities {
+          gameID
+          name
+        }
+      }
+    }
+  }
+}
+"""
+
+FIGHT_DETAILS_QUERY = """
+query($code: String!, $fightIDs: [Int]!) {
+  reportData {
+    report(code: $code) {
+      table(fightIDs: $fightIDs, dataType: DamageDone)
+      healingTable: table(fightIDs: $fightIDs, dataType: Healing)
+      rankings(fightIDs: $fightIDs)
+      deaths: events(fightIDs: $fightIDs, dataType: Deaths, limit: 1000) {
+        data
+      }
+    }
+  }
+}
+"""
+
+# Live tracking: only the fight IDs after the last one seen, so a poll costs the same
+# at the first pull of the night and the three hundredth. Trash is included (encounterID 0)
+# so the cursor can move past it.
+LIVE_FIGHTS_QUERY = """
+query($code: String!, $fightIDs: [Int]!) {
+  reportData {
+    report(code: $code) {
+      code
+      title
+      startTime
+      endTime
+      zone {
+        name
+      }
+      fights(fightIDs: $fightIDs) {
+        id
+        encounterID
+        name
+        difficulty
+        kill
+        fightPercentage
+        lastPhase
+        startTime
+        endTime
+      }
+    }
+  }
+}
+"""
+
+def report_fights_query(count):
+    """Build an aliased query fetching boss-encounter fights for `count` reports at once."""
+    params = ', '.join(f'$c{i}: String!' for i in range(count))
+    selections = ''.join(
+        f"""
+    r{i}: report(code: $c{i}) {{
+      fights(killType: Encounters) {{
+        id
+        name
+        difficulty
+        kill
+        fightPercentage
+        lastPhase
+        startTime
+        endTime
+      }}
+    }}"""
+        for i in range(count)
+    )
+    return f"""
+query({params}) {{
+  reportData {{{selections}
+  }}
+}}
+"""
+
+def guild_report_variables(tenant, start_time, end_time, page=1, zone_id=None, limit=REPORT_PAGE_SIZE):
+    """Variables for GUILD_REPORTS_QUERY."""
+    return {
+        'guildName': tenant['guild_name'],
+        'serverSlug': tenant['guild_realm'].lower().replace(' ', '-'),
+        'serverRegion': tenant['guild_region'].upper(),
+        'startTime': start_time,
+        'endTime': end_time,
+        'zoneID': zone_id,
+        'limit': limit,
+        'page': page,
+    }
+
+def secret_hash(client_secret):
+    """Fingerprint of the client secret, so a rotated secret never reuses the old secret's token."""
+    return hashlib.sha256((client_secret or '').encode()).hexdigest()[:16]
+
+def load_cached_token(client_id, client_secret):
+    """Get (token, expires) from the token cache file if it belongs to these credentials and is still valid."""
+    try:
+        with open(config.WARCRAFTLOGS_TOKEN_CACHE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (cached.get('client_id') != client_id or cached.get('secret_hash') != secret_hash(client_secret)
+            or cached.get('expires_at', 0) <= time.time()):
+        return None
+    return cached['access_token'], datetime.fromtimestamp(cached['expires_at'])
+
+def save_cached_token(client_id, client_secret, token, expires):
+    """Write the token cache atomically, readable only by the current user."""
+    tmp_path = config.WARCRAFTLOGS_TOKEN_CACHE + '.tmp'
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'client_id': client_id, 'secret_hash': secret_hash(client_secret),
+                       'access_token': token, 'expires_at': expires.timestamp()}, f)
+        os.replace(tmp_path, config.WARCRAFTLOGS_TOKEN_CACHE)
+    except OSError as e:
+        print(f"  Warning: Could not cache access token: {e}")
+
+def discard_cached_token(token):
+    """Delete the token cache if it still holds a token the API has rejected."""
+    try:
+        with open(config.WARCRAFTLOGS_TOKEN_CACHE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('access_token') == token:
+            os.remove(config.WARCRAFTLOGS_TOKEN_CACHE)
+    except (OSError, ValueError):
+        pass
+
+def raid_week_days_back(now=None):
+    """Days back to the start of the raid week (last Wednesday; a full week if today is Wednesday)."""
+    return ((now or datetime.now()).weekday() - 2) % 7 or 7
+
+def week_window(days_back, now=None):
+    """(start_ms, end_ms) from midnight `days_back` days ago until now."""
+    now = now or datetime.now()
+    end_time = int(now.timestamp() * 1000)
+    week_start = (now - timedelta(days=days_back)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return int(week_start.timestamp() * 1000), end_time
+
+def parse_report_page(result, tenant):
+    """Pull (team-filtered reports, has_more_pages) out of a GUILD_REPORTS_QUERY result."""
+    pagination = result.get('reportData', {}).get('reports', {}) or {}
+    return filter_team_reports(pagination.get('data', []), tenant), bool(pagination.get('has_more_pages'))
+
+def parse_report_fights(result, report_codes):
+    """Map report code -> fight list from a report_fights_query result."""
+    report_data = result.get('reportData', {})
+    return {
+        code: (report_data.get(f'r{i}') or {}).get('fights', [])
+        for i, code in enumerate(report_codes)
+    }
+
+def parse_actor_mappings(result):
+    """Build (actor_id -> name, ability_id -> name) maps from an ACTOR_MAPPINGS_QUERY result."""
+    master_data = result.get('reportData', {}).get('report', {}).get('masterData', {})
+    actor_map = {actor['id']: actor['name'] for actor in master_data.get('actors', [])}
+    ability_map = {ability['gameID']: ability['name'] for ability in master_data.get('abilities', [])}
+    return actor_map, ability_map
+
 class WarcraftLogsAPI:
     """WarcraftLogs API client."""
     
-    def __init__(self):
+    def __init__(self, fixtures=None):
         self.client_id = config.WARCRAFTLOGS_CLIENT_ID
         self.client_secret = config.WARCRAFTLOGS_CLIENT_SECRET
         self.token = None
         self.token_expires = None
+        self._token_lock = threading.Lock()
+        # One pooled session per client so tenants fetched in parallel share keep-alive connections
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        # Record/replay layer (WCL_MODE); None means plain live requests
+        self.fixtures = fixtures if fixtures is not None else replay.fixture_store_for(config.WCL_MODE)
+
+    def now(self):
+        """Wall clock for week windows - the recording's clock when recording or replaying."""
+        return self.fixtures.now() if self.fixtures else datetime.now()
     
+    def _token_valid(self):
+        return self.token and self.token_expires and datetime.now() < self.token_expires
+
     def _get_access_token(self):
-        """Get OAuth2 access token."""
-        if self.token and self.token_expires and datetime.now() < self.token_expires:
+        """Get OAuth2 access token.
+
+        Reuses the in-memory token, then the on-disk cache, and only then asks
+        /oauth/token. Threads that arrive during a refresh wait for it instead of
+        starting their own.
+        """
+        if self._token_valid():
             return self.token
         
-        auth_url = 'https://www.warcraftlogs.com/oauth/token'
-        
-        response = requests.post(
-            auth_url,
-            auth=(self.client_id, self.client_secret),
-            data={'grant_type': 'client_credentials'}
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"Failed to get access token: {response.text}")
-        
-        data = response.json()
-        self.token = data['access_token']
-        self.token_expires = datetime.now() + timedelta(seconds=data['expires_in'] - 60)
-        
-        return self.token
+        with self._token_lock:
+            if self._token_valid():  # refreshed by another thread while we waited
+                return self.token
+
+            cached = load_cached_token(self.client_id, self.client_secret)
+            if cached:
+                instrumentation.count('wcl.token_cache_hits')
+                self.token, self.token_expires = cached
+                return self.token
+            instrumentation.count('wcl.token_refreshes')
+
+            response = self.session.post(
+                OAUTH_TOKEN_URL,
+                auth=(self.client_id, self.client_secret),
+                data={'grant_type': 'client_credentials'}
+            )
+            
+            if response.status_code != 200:
+                raise Exception(f"Failed to get access token: {response.text}")
+            
+            data = response.json()
+            self.token = data['access_token']
+            self.token_expires = datetime.now() + timedelta(seconds=data['expires_in'] - 60)
+            save_cached_token(self.client_id, self.client_secret, self.token, self.token_expires)
+            
+            return self.token
+
+    def ensure_token(self):
+        """Authenticate now (a no-op when replaying), so bad credentials fail before any fan-out."""
+        if not self.fixtures or self.fixtures.mode != 'replay':
+            self._get_access_token()
+
+    def _drop_token(self, rejected):
+        """Forget a token the API answered 401 to, so the next _get_access_token fetches a new one."""
+        with self._token_lock:
+            if self.token == rejected:  # not already replaced by another thread
+                self.token = self.token_expires = None
+                discard_cached_token(rejected)
     
     def _graphql_query(self, query, variables=None):
-        """Execute a GraphQL query against WarcraftLogs API."""
-        token = self._get_access_token()
-        
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json',
-        }
-        
-        response = requests.post(
-            config.WARCRAFTLOGS_API_URL,
-            headers=headers,
-            json={'query': query, 'variables': variables or {}}
-        )
+        """Execute a GraphQL query against WarcraftLogs API, or the fixture store when replaying."""
+        with instrumentation.span('wcl.graphql'):
+            if self.fixtures and self.fixtures.mode == 'replay':
+                instrumentation.count('wcl.replayed')
+                time.sleep(self.fixtures.next_delay())
+                return self.fixtures.replay(query, variables)
+
+            data = self._live_query(query, variables)
+            if self.fixtures:
+                self.fixtures.record(query, variables, data)
+            return data
+
+    def _live_query(self, query, variables=None):
+        """POST a GraphQL query to WarcraftLogs, refreshing the token once if it was revoked."""
+        for attempt in range(2):
+            token = self._get_access_token()
+
+            headers = {
+                'Authorization': f'Bearer {token}',
+                'Content-Type': 'application/json',
+            }
+
+            response = self.session.post(
+                config.WARCRAFTLOGS_API_URL,
+                headers=headers,
+                json={'query': query, 'variables': variables or {}}
+            )
+            instrumentation.count('wcl.requests')
+            instrumentation.count('wcl.bytes_received', len(response.content))
+
+            if response.status_code != 401 or attempt:
+                break
+            instrumentation.count('wcl.token_rejected')
+            self._drop_token(token)
         
         if response.status_code != 200:
+            instrumentation.count('wcl.errors')
             raise Exception(f"GraphQL query failed: {response.text}")
         
         data = response.json()
         if 'errors' in data:
+            instrumentation.count('wcl.errors')
             raise Exception(f"GraphQL errors: {data['errors']}")
         
         return data['data']
     
-    def get_guild_reports(self, days_back=7):
-        """Get recent guild raid reports."""
-        
-        query = """
-        query($guildName: String!, $serverSlug: String!, $serverRegion: String!) {
-          reportData {
-            reports(
-              guildName: $guildName
-              guildServerSlug: $serverSlug
-              guildServerRegion: $serverRegion
-              limit: 50
-            ) {
-              data {
-                code
-                title
-                owner {
-                  name
-                }
-                startTime
-                endTime
-                zone {
-                  name
-                }
-                fights {
-                  id
-                  name
-                  difficulty
-                  kill
-                  fightPercentage
-                  startTime
-                  endTime
-                }
-              }
-            }
-          }
-        }
+    def get_guild_reports(self, days_back=7, tenant=None):
+        """Get recent guild raid reports for a tenant (defaults to the .env guild).
+
+        The time window and zone are filtered server-side and fights are only
+        fetched for reports that pass the team filter.
         """
-        
-        variables = {
-            'guildName': config.GUILD_NAME,
-            'serverSlug': config.GUILD_REALM.lower().replace(' ', '-'),
-            'serverRegion': config.GUILD_REGION.upper()
-        }
-        
-        result = self._graphql_query(query, variables)
-        
-        reports = result.get('reportData', {}).get('reports', {}).get('data', [])
-        
-        if hasattr(config, 'RAID_TEAM_FILTER') and config.RAID_TEAM_FILTER:
-            reports = [r for r in reports if r.get('owner', {}).get('name', '').lower() == config.RAID_TEAM_FILTER.lower()]
-            print(f"Filtered to {len(reports)} reports by owner '{config.RAID_TEAM_FILTER}'")
-        
-        if config.RAID_TEAM_FILTER:
-            desired = config.RAID_TEAM_FILTER.lower()
-            reports = [
-            r for r in reports
-            if desired in r.get('owner', {}).get('name', '').lower()
-                or desired in r.get('title', '').lower()
-            ]
-
-        # Filter to requested time range — anchor start to midnight of last Wednesday
-        now = datetime.now()
-        end_time = int(now.timestamp() * 1000)
-        week_start = (now - timedelta(days=days_back)).replace(hour=0, minute=0, second=0, microsecond=0)
-        start_time = int(week_start.timestamp() * 1000)
-        
-        filtered_reports = [
-            r for r in reports 
-            if start_time <= r['startTime'] <= end_time
+        tenant = tenant or config.default_tenant()
+
+        # Anchor start to midnight of last Wednesday
+        start_time, end_time = week_window(days_back, self.now())
+
+        reports = [
+            report
+            for _, page_reports in self.iter_guild_reports(start_time, end_time, tenant['zone_id'], tenant)
+            for report in page_reports
+            if start_time <= report['startTime'] <= end_time
         ]
-        
-        print(f"Found {len(reports)} total reports, {len(filtered_reports)} in last {days_back} days")
-        
-        print(f"got {len(reports)} reports from WCL, owner list: {[r.get('owner', {}).get('name') for r in reports]}")
 
+        print(f"Found {len(reports)} reports in last {days_back} days")
+        print(f"got {len(reports)} reports from WCL, owner list: {[(r.get('owner') or {}).get('name') for r in reports]}")
+
+        return reports
+
+    def get_guild_report_page(self, start_time, end_time, page=1, zone_id=None, tenant=None, limit=REPORT_PAGE_SIZE):
+        """Get one page of guild reports in [start_time, end_time], filtered server-side.
+
+        Returns (reports, has_more_pages). Reports carry metadata only - use
+        get_report_fights for the fight lists of the ones worth keeping.
+        """
+        tenant = tenant or config.default_tenant()
+        variables = guild_report_variables(tenant, start_time, end_time, page, zone_id, limit)
+        return parse_report_page(self._graphql_query(GUILD_REPORTS_QUERY, variables), tenant)
+
+    def get_report_fights(self, report_codes):
+        """Get boss-encounter fights for several reports in one aliased query.
+
+        Returns {report_code: [fight, ...]}. Trash is excluded server-side.
+        """
+        if not report_codes:
+            return {}
+
+        variables = {f'c{i}': code for i, code in enumerate(report_codes)}
+        result = self._graphql_query(report_fights_query(len(report_codes)), variables)
+        return parse_report_fights(result, report_codes)
+
+    def iter_guild_reports(self, start_time, end_time, zone_id=None, tenant=None, start_page=1):
+        """Page through the guild's report history, yielding (page, reports) one page at a time.
+
+        Each yielded report has its fight list attached. Only one page is held in
+        memory, and the page number lets callers resume.
+        """
+        page = start_page
+        while True:
+            reports, has_more = self.get_guild_report_page(start_time, end_time, page, zone_id, tenant)
+            fights = self.get_report_fights([report['code'] for report in reports])
+            for report in reports:
+                report['fights'] = fights.get(report['code'], [])
+            yield page, reports
+            if not has_more:
+                return
+            page += 1
+
+    def get_fights_after(self, report_code, last_fight_id, window=LIVE_FIGHT_WINDOW):
+        """Get (report, fights) for the next `window` fight IDs after last_fight_id.
+
+        The report carries its current metadata (endTime grows while it is live
+        logged). Fights include trash (encounterID 0) and come back in ID order;
+        a full window means there may be more waiting.
+        """
+        variables = {'code': report_code, 'fightIDs': list(range(last_fight_id + 1, last_fight_id + 1 + window))}
+        report = self._graphql_query(LIVE_FIGHTS_QUERY, variables).get('reportData', {}).get('report') or {}
+        fights = sorted(report.pop('fights', None) or [], key=lambda fight: fight['id'])
+        return report, fights
 
-        return filtered_reports
-    
     def get_actor_mappings(self, report_code):
         """Get actor ID to name mappings for the report."""
-        query = """
-        query($code: String!) {
-          reportData {
-            report(code: $code) {
-              masterData {
-                actors {
-                  id
-                  name
-                  type
-                  subType
-                }
-                abilities {
-                  gameID
-                  name
-                }
-              }
-            }
-          }
-        }
-        """
-        
         try:
-            result = self._graphql_query(query, {'code': report_code})
-            master_data = result.get('reportData', {}).get('report', {}).get('masterData', {})
-            
-            # Create mappings
-            actor_map = {actor['id']: actor['name'] for actor in master_data.get('actors', [])}
-            ability_map = {ability['gameID']: ability['name'] for ability in master_data.get('abilities', [])}
-            
-            return actor_map, ability_map
+            result = self._graphql_query(ACTOR_MAPPINGS_QUERY, {'code': report_code})
+            return parse_actor_mappings(result)
         except Exception as e:
             print(f"  Warning: Could not fetch actor mappings: {e}")
             return {}, {}
     
     def get_fight_details(self, report_code, fight_id):
         """Get detailed fight information including DPS, HPS, and deaths."""
-        query = """
-        query($code: String!, $fightIDs: [Int]!) {
-          reportData {
-            report(code: $code) {
-              table(fightIDs: $fightIDs, dataType: DamageDone)
-              healingTable: table(fightIDs: $fightIDs, dataType: Healing)
-              rankings(fightIDs: $fightIDs)
-              deaths: events(fightIDs: $fightIDs, dataType: Deaths, limit: 1000) {
-                data
-              }
-            }
-          }
-        }
-        """
-        
         variables = {
             'code': report_code,
             'fightIDs': [fight_id]
         }
         
         try:
-            result = self._graphql_query(query, variables)
+            result = self._graphql_query(FIGHT_DETAILS_QUERY, variables)
             return result.get('reportData', {}).get('report', {})
         except Exception as e:
             print(f"  Warning: Could not fetch details for fight {fight_id}: {e}")
             return {}
 
 
-def fetch_weekly_data():
-    """Fetch and parse weekly raid data with detailed performance metrics."""
-    api = WarcraftLogsAPI()
+class AsyncWarcraftLogsAPI:
+    """asyncio WarcraftLogs API client over one shared aiohttp session.
 
-    today = datetime.now()
-    days_back = (today.weekday() - 2) % 7 or 7  # anchor to last Wednesday; if today is Wed, go back a full week
-    reports = api.get_guild_reports(days_back=days_back)
-    
-    parsed_data = {
+    Mirrors WarcraftLogsAPI's methods as coroutines. Requests are capped by a
+    semaphore and token refreshes are single-flight, so it can be shared by many
+    concurrent tasks (e.g. the Discord bot's event loop) without blocking.
+
+        async with AsyncWarcraftLogsAPI() as api:
+            reports = await api.get_guild_reports()
+    """
+
+    def __init__(self, session=None, max_concurrency=8, fixtures=None):
+        self.client_id = config.WARCRAFTLOGS_CLIENT_ID
+        self.client_secret = config.WARCRAFTLOGS_CLIENT_SECRET
+        self.token = None
+        self.token_expires = None
+        self.session = session
+        self._owns_session = session is None
+        import asyncio  # asyncio and aiohttp load on first use, keeping sync-only startup fast
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._token_lock = asyncio.Lock()
+        self.fixtures = fixtures if fixtures is not None else replay.fixture_store_for(config.WCL_MODE)
+
+    def now(self):
+        """Wall clock for week windows - the recording's clock when recording or replaying."""
+        return self.fixtures.now() if self.fixtures else datetime.now()
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self):
+        """Create the shared session lazily, inside the running event loop."""
+        import aiohttp  # only the async client needs aiohttp, so sync runs skip its import cost
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=16),
+                timeout=aiohttp.ClientTimeout(total=60)
+            )
+            self._owns_session = True
+        return self.session
+
+    async def close(self):
+        """Close the session if this client created it."""
+        if self._owns_session and self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    def _token_valid(self):
+        return self.token and self.token_expires and datetime.now() < self.token_expires
+
+    async def _get_access_token(self):
+        """Get OAuth2 access token; concurrent callers wait on a single refresh."""
+        if self._token_valid():
+            return self.token
+
+        import asyncio
+        async with self._token_lock:
+            if self._token_valid():  # refreshed by another task while we waited
+                return self.token
+
+            # Cache file I/O runs off the event loop so other tasks keep going meanwhile
+            cached = await asyncio.to_thread(load_cached_token, self.client_id, self.client_secret)
+            if cached:
+                instrumentation.count('wcl.token_cache_hits')
+                self.token, self.token_expires = cached
+                return self.token
+            instrumentation.count('wcl.token_refreshes')
+
+            from aiohttp import BasicAuth
+            async with self._get_session().post(
+                OAUTH_TOKEN_URL,
+                auth=BasicAuth(self.client_id, self.client_secret),
+                data={'grant_type': 'client_credentials'}
+            ) as response:
+                if response.status != 200:
+                    raise Exception(f"Failed to get access token: {await response.text()}")
+                data = await response.json()
+
+            self.token = data['access_token']
+            self.token_expires = datetime.now() + timedelta(seconds=data['expires_in'] - 60)
+            await asyncio.to_thread(save_cached_token, self.client_id, self.client_secret,
+                                    self.token, self.token_expires)
+            return self.token
+
+    async def _drop_token(self, rejected):
+        """Forget a token the API answered 401 to, so the next _get_access_token fetches a new one."""
+        import asyncio
+        async with self._token_lock:
+            if self.token == rejected:  # not already replaced by another task
+                self.token = self.token_expires = None
+                await asyncio.to_thread(discard_cached_token, rejected)
+
+    async def _graphql_query(self, query, variables=None):
+        """Execute a GraphQL query against WarcraftLogs API, or the fixture store when replaying."""
+        with instrumentation.span('wcl.graphql'):
+            if self.fixtures and self.fixtures.mode == 'replay':
+                import asyncio
+                instrumentation.count('wcl.replayed')
+                async with self._semaphore:
+                    await asyncio.sleep(self.fixtures.next_delay())
+                    return self.fixtures.replay(query, variables)
+
+            data = await self._live_query(query, variables)
+            if self.fixtures:
+                self.fixtures.record(query, variables, data)
+            return data
+
+    async def _live_query(self, query, variables=None):
+        """POST a GraphQL query to WarcraftLogs, refreshing the token once if it was revoked."""
+        for attempt in range(2):
+            token = await self._get_access_token()
+
+            headers = {
+                'Authorization': f'Bearer {token}',
+                'Content-Type': 'application/json',
+            }
+
+            async with self._semaphore:
+                async with self._get_session().post(
+                    config.WARCRAFTLOGS_API_URL,
+                    headers=headers,
+                    json={'query': query, 'variables': variables or {}}
+                ) as response:
+                    body = await response.read()
+                    status = response.status
+                    instrumentation.count('wcl.requests')
+                    instrumentation.count('wcl.bytes_received', len(body))
+
+            if status != 401 or attempt:
+                break
+            instrumentation.count('wcl.token_rejected')
+            await self._drop_token(token)
+
+        if status != 200:
+            instrumentation.count('wcl.errors')
+            raise Exception(f"GraphQL query failed: {body.decode('utf-8', 'replace')}")
+        data = json.loads(body)
+
+        if 'errors' in data:
+            instrumentation.count('wcl.errors')
+            raise Exception(f"GraphQL errors: {data['errors']}")
+
+        return data['data']
+
+    async def get_guild_reports(self, days_back=7, tenant=None):
+        """Get recent guild raid reports for a tenant, with fight lists attached."""
+        tenant = tenant or config.default_tenant()
+        start_time, end_time = week_window(days_back, self.now())
+
+        reports = []
+        async for _, page_reports in self.iter_guild_reports(start_time, end_time, tenant['zone_id'], tenant):
+            reports.extend(r for r in page_reports if start_time <= r['startTime'] <= end_time)
+        return reports
+
+    async def get_guild_report_page(self, start_time, end_time, page=1, zone_id=None, tenant=None,
+                                    limit=REPORT_PAGE_SIZE):
+        """Get one page of guild reports in [start_time, end_time], filtered server-side."""
+        tenant = tenant or config.default_tenant()
+        variables = guild_report_variables(tenant, start_time, end_time, page, zone_id, limit)
+        return parse_report_page(await self._graphql_query(GUILD_REPORTS_QUERY, variables), tenant)
+
+    async def get_report_fights(self, report_codes):
+        """Get boss-encounter fights for several reports in one aliased query."""
+        if not report_codes:
+            return {}
+
+        variables = {f'c{i}': code for i, code in enumerate(report_codes)}
+        result = await self._graphql_query(report_fights_query(len(report_codes)), variables)
+        return parse_report_fights(result, report_codes)
+
+    async def iter_guild_reports(self, start_time, end_time, zone_id=None, tenant=None, start_page=1):
+        """Async generator over (page, reports) with fight lists attached."""
+        page = start_page
+        while True:
+            reports, has_more = await self.get_guild_report_page(start_time, end_time, page, zone_id, tenant)
+            fights = await self.get_report_fights([report['code'] for report in reports])
+            for report in reports:
+                report['fights'] = fights.get(report['code'], [])
+            yield page, reports
+            if not has_more:
+                return
+            page += 1
+
+    async def get_actor_mappings(self, report_code):
+        """Get actor ID to name mappings for the report."""
+        try:
+            result = await self._graphql_query(ACTOR_MAPPINGS_QUERY, {'code': report_code})
+            return parse_actor_mappings(result)
+        except Exception as e:
+            print(f"  Warning: Could not fetch actor mappings: {e}")
+            return {}, {}
+
+    async def get_fight_details(self, report_code, fight_id):
+        """Get detailed fight information including DPS, HPS, and deaths."""
+        try:
+            result = await self._graphql_query(FIGHT_DETAILS_QUERY, {'code': report_code, 'fightIDs': [fight_id]})
+            return result.get('reportData', {}).get('report', {})
+        except Exception as e:
+            print(f"  Warning: Could not fetch details for fight {fight_id}: {e}")
+            return {}
+
+
+def new_parsed_data():
+    """Empty container for parsed rows, in the shape database.store_parsed_data expects."""
+    return {
         'raids': [],
         'encounters': [],
         'players': [],
         'deaths': []
     }
-    
-    for report in reports:
-        print(f"\nProcessing report: {report['title']}")
+
+def filter_team_reports(reports, tenant):
+    """Keep only reports owned by (or titled for) the tenant's raid team, if one is set."""
+    raid_team_filter = tenant['raid_team_filter']
+    if not raid_team_filter:
+        return reports
+
+    reports = [r for r in reports if (r.get('owner') or {}).get('name', '').lower() == raid_team_filter.lower()]
+    print(f"Filtered to {len(reports)} reports by owner '{raid_team_filter}'")
+
+    desired = raid_team_filter.lower()
+    return [
+        r for r in reports
+        if desired in (r.get('owner') or {}).get('name', '').lower()
+            or desired in r.get('title', '').lower()
+    ]
+
+def new_raid_data(report, tenant):
+    """Build the raids row for a report."""
+    return {
+        'raid_id': report['code'],
+        'raid_name': report['title'],
+        'start_time': report['startTime'],
+        'end_time': report['endTime'],
+        'zone_name': report.get('zone', {}).get('name') if report.get('zone') else None,
+        'tenant': tenant['key'],
+    }
+
+def select_fights(report, tenant):
+    """Get the report's boss fights that pass the boss and difficulty filters."""
+    difficulty_filter = tenant['difficulty_filter']
+
+    fights = []
+    for fight in report.get('fights', []):
+        boss_name = fight['name']
         
-        # Get actor and ability mappings for this report
-        print("  Fetching actor/ability mappings...")
-        actor_map, ability_map = api.get_actor_mappings(report['code'])
+        # Skip trash and non-boss fights
+        if boss_name == 'Trash':
+            continue
         
-        raid_data = {
-            'raid_id': report['code'],
-            'raid_name': report['title'],
-            'start_time': report['startTime'],
-            'end_time': report['endTime'],
-            'zone_name': report.get('zone', {}).get('name') if report.get('zone') else None,
-        }
+        # Filter by boss list if configured
+        if BOSS_FILTER and boss_name not in BOSS_FILTER:
+            print(f"  Skipping {boss_name} (not in boss filter)")
+            continue
+        
+        # Commenting out difficulty filter for now - can be re-enabled if needed, but many fights don't have difficulty set properly in WCL data
+        # Filter by difficulty if configured
+        if difficulty_filter is not None:
+            fight_difficulty = fight.get('difficulty', 0)
+            if fight_difficulty != difficulty_filter:
+                print(f"  Skipping {boss_name} (difficulty {fight_difficulty}, want {difficulty_filter})")
+                continue
+        
+        fights.append(fight)
 
-        report_has_valid_fights = False
-        for fight in report.get('fights', []):
-            boss_name = fight['name']
-            
-            # Skip trash and non-boss fights
-            if boss_name == 'Trash':
+    return fights
+
+@instrumentation.timed
+def parse_fight(report, fight, fight_details, actor_map, ability_map, parsed_data):
+    """Append one fight's encounter, player and death rows to parsed_data."""
+    boss_name = fight['name']
+    difficulty = DIFFICULTY_MAP.get(fight.get('difficulty'), 'Unknown')
+    print(f"  Processing fight: {boss_name} ({difficulty})")
+
+    encounter_data = {
+        'raid_id': report['code'],
+        'fight_id': fight['id'],
+        'boss_name': boss_name,
+        'difficulty': difficulty,
+        'is_kill': fight.get('kill', False),
+        'kill_time': fight.get('endTime'),
+        'kill_duration_ms': fight.get('endTime', 0) - fight.get('startTime', 0),
+        'wipe_count': 0 if fight.get('kill') else 1,
+        'fight_percentage': fight.get('fightPercentage'),  # boss health left, 0-100
+        'last_phase': fight.get('lastPhase'),
+    }
+    
+    parsed_data['encounters'].append(encounter_data)
+
+    # Parse DPS and healing only on kills — wipes skew averages and players complained lol
+    if not fight.get('kill'):
+        # Still parse deaths from wipes
+        death_events = fight_details.get('deaths', {}).get('data', [])
+        if death_events:
+            for death in death_events:
+                target_id = death.get('targetID', -1)
+                ability_id = death.get('killingAbilityGameID', 0)
+                player_name = actor_map.get(target_id, f'Unknown (ID: {target_id})')
+                ability_name = ability_map.get(ability_id) or ('Environmental / Unknown' if ability_id == 0 else f'Unknown (ID: {ability_id})')
+                parsed_data['deaths'].append({
+                    'raid_id': report['code'],
+                    'fight_id': fight['id'],
+                    'boss_name': boss_name,
+                    'difficulty': difficulty,
+                    'player_name': player_name,
+                    'ability_name': ability_name,
+                    'ability_id': ability_id,
+                    'timestamp': death.get('timestamp', 0)
+                })
+        return
+
+    # Build role-specific name → rankPercent lookups from the rankings endpoint
+    dps_rank_lookup = {}
+    heal_rank_lookup = {}
+    rankings_raw = fight_details.get('rankings', {})
+    for fight_rankings in rankings_raw.get('data', []):
+        roles = fight_rankings.get('roles', {})
+        for role_key, role_data in roles.items():
+            for char in role_data.get('characters', []):
+                name = char.get('name')
+                pct = char.get('rankPercent')
+                if name and pct is not None:
+                    if role_key == 'healers':
+                        heal_rank_lookup[name] = pct
+                    else:  # dps and tanks
+                        dps_rank_lookup[name] = pct
+
+    # Parse DPS data
+    dps_table = fight_details.get('table', {})
+    if dps_table and isinstance(dps_table, dict) and 'data' in dps_table:
+        entries = dps_table.get('data', {}).get('entries', [])
+        fight_duration = max((fight['endTime'] - fight['startTime']) / 1000, 1)
+
+        for entry in entries:
+            if entry.get('type') in ('NPC', 'Boss'):  # skip non-players - can add 'Pet' to exclde pets if its breaking it
                 continue
-            
-            # Filter by boss list if configured
-            if BOSS_FILTER and boss_name not in BOSS_FILTER:
-                print(f"  Skipping {boss_name} (not in boss filter)")
+            player_name = entry.get('name', 'Unknown')
+            if player_name not in dps_rank_lookup:  # skip healers/tanks ranked separately
                 continue
-            
-            # Commenting out difficulty filter for now - can be re-enabled if needed, but many fights don't have difficulty set properly in WCL data
-            # Filter by difficulty if configured
-            if config.DIFFICULTY_FILTER is not None:
-                fight_difficulty = fight.get('difficulty', 0)
-                if fight_difficulty != config.DIFFICULTY_FILTER:
-                    print(f"  Skipping {boss_name} (difficulty {fight_difficulty}, want {config.DIFFICULTY_FILTER})")
-                    continue
-            
-            report_has_valid_fights = True
-            difficulty = DIFFICULTY_MAP.get(fight.get('difficulty'), 'Unknown')
-            print(f"  Processing fight: {boss_name} ({difficulty})")
+            player_class = entry.get('type', 'Unknown')
+            spec = entry.get('icon', '').split('-')[-1] if entry.get('icon') else 'Unknown'
+            total_damage = entry.get('total', 0)
 
-            encounter_data = {
+            parsed_data['players'].append({
                 'raid_id': report['code'],
                 'fight_id': fight['id'],
                 'boss_name': boss_name,
                 'difficulty': difficulty,
-                'is_kill': fight.get('kill', False),
-                'kill_time': fight.get('endTime'),
-                'kill_duration_ms': fight.get('endTime', 0) - fight.get('startTime', 0),
-                'wipe_count': 0 if fight.get('kill') else 1
-            }
-            
-            parsed_data['encounters'].append(encounter_data)
-                      
-            fight_details = api.get_fight_details(report['code'], fight['id'])
-
-            # Parse DPS and healing only on kills — wipes skew averages and players complained lol
-            if not fight.get('kill'):
-                # Still parse deaths from wipes
-                death_events = fight_details.get('deaths', {}).get('data', [])
-                if death_events:
-                    for death in death_events:
-                        target_id = death.get('targetID', -1)
-                        ability_id = death.get('killingAbilityGameID', 0)
-                        player_name = actor_map.get(target_id, f'Unknown (ID: {target_id})')
-                        ability_name = ability_map.get(ability_id) or ('Environmental / Unknown' if ability_id == 0 else f'Unknown (ID: {ability_id})')
-                        parsed_data['deaths'].append({
-                            'raid_id': report['code'],
-                            'fight_id': fight['id'],
-                            'boss_name': boss_name,
-                            'difficulty': difficulty,
-                            'player_name': player_name,
-                            'ability_name': ability_name,
-                            'ability_id': ability_id,
-                            'timestamp': death.get('timestamp', 0)
-                        })
+                'player_name': player_name,
+                'player_class': player_class,
+                'spec': spec,
+                'role': 'DPS',
+                'dps': total_damage / fight_duration,
+                'total_damage': total_damage,
+                'percentile': dps_rank_lookup.get(player_name)
+            })
+
+    # Parse healing data
+    heal_table = fight_details.get('healingTable', {})
+    if heal_table and isinstance(heal_table, dict) and 'data' in heal_table:
+        entries = heal_table.get('data', {}).get('entries', [])
+        fight_duration = max((fight['endTime'] - fight['startTime']) / 1000, 1)
+        
+        for entry in entries:
+            if entry.get('type') in ('NPC', 'Boss'):  # skip non-players
+                continue
+            player_name = entry.get('name', 'Unknown')
+            if player_name not in heal_rank_lookup:  # skip DPS/tanks who incidentally healed
                 continue
+            player_class = entry.get('type', 'Unknown')
+            spec = entry.get('icon', '').split('-')[-1] if entry.get('icon') else 'Unknown'
+            total_healing = entry.get('total', 0)
+
+            parsed_data['players'].append({
+                'raid_id': report['code'],
+                'fight_id': fight['id'],
+                'boss_name': boss_name,
+                'difficulty': difficulty,
+                'player_name': player_name,
+                'player_class': player_class,
+                'spec': spec,
+                'role': 'Healer',
+                'hps': total_healing / fight_duration,
+                'total_healing': total_healing,
+                'percentile': heal_rank_lookup.get(player_name)
+            })
+
+    # Parse death data with proper name mapping
+    death_events = fight_details.get('deaths', {}).get('data', [])
+    if death_events:
+        for death in death_events:
+            target_id = death.get('targetID', -1)
+            ability_id = death.get('killingAbilityGameID', 0)
+            
+            player_name = actor_map.get(target_id, f'Unknown (ID: {target_id})')
+            ability_name = ability_map.get(ability_id) or ('Environmental / Unknown' if ability_id == 0 else f'Unknown (ID: {ability_id})')
+            
+            parsed_data['deaths'].append({
+                'raid_id': report['code'],
+                'fight_id': fight['id'],
+                'boss_name': boss_name,
+                'difficulty': difficulty,
+                'player_name': player_name,
+                'ability_name': ability_name,
+                'ability_id': ability_id,
+                'timestamp': death.get('timestamp', 0)
+            })
+
+def parse_report(api, report, parsed_data, tenant=None):
+    """Fetch fight details for one report and append its rows to parsed_data.
+
+    Returns True if the report had at least one fight that passed the filters.
+    """
+    tenant = tenant or config.default_tenant()
+
+    print(f"\nProcessing report: {report['title']}")
+    
+    # Get actor and ability mappings for this report
+    print("  Fetching actor/ability mappings...")
+    actor_map, ability_map = api.get_actor_mappings(report['code'])
+
+    fights = select_fights(report, tenant)
+    for fight in fights:
+        fight_details = api.get_fight_details(report['code'], fight['id'])
+        parse_fight(report, fight, fight_details, actor_map, ability_map, parsed_data)
+
+    if fights:
+        parsed_data['raids'].append(new_raid_data(report, tenant))
+    else:
+        print(f"  Skipping report {report['code']} - no valid raid fights found (likely M+ or wrong zone)")
+
+    return bool(fights)
+
+def fetch_weekly_data(api=None, tenant=None):
+    """Fetch and parse weekly raid data with detailed performance metrics.
+
+    Pass a shared api to reuse its token and connection pool across tenants.
+    """
+    api = api or WarcraftLogsAPI()
+    tenant = tenant or config.default_tenant()
+
+    reports = api.get_guild_reports(days_back=raid_week_days_back(api.now()), tenant=tenant)
+    
+    parsed_data = new_parsed_data()
+    
+    for report in reports:
+        parse_report(api, report, parsed_data, tenant)
+
+    return parsed_data
+
+async def parse_report_async(api, report, parsed_data, tenant=None):
+    """Async parse_report: mappings and every fight's details are fetched concurrently."""
+    tenant = tenant or config.default_tenant()
+
+    print(f"\nProcessing report: {report['title']}")
+    fights = select_fights(report, tenant)
+    import asyncio
+    (actor_map, ability_map), *details = await asyncio.gather(
+        api.get_actor_mappings(report['code']),
+        *(api.get_fight_details(report['code'], fight['id']) for fight in fights)
+    )
+
+    for fight, fight_details in zip(fights, details):
+        parse_fight(report, fight, fight_details, actor_map, ability_map, parsed_data)
+
+    if fights:
+        parsed_data['raids'].append(new_raid_data(report, tenant))
+    else:
+        print(f"  Skipping report {report['code']} - no valid raid fights found (likely M+ or wrong zone)")
+
+    return bool(fights)
+
+async def fetch_weekly_data_async(api=None, tenant=None):
+    """Async fetch_weekly_data over an AsyncWarcraftLogsAPI; reports are processed concurrently."""
+    import asyncio
+    tenant = tenant or config.default_tenant()
+    own_api = api is None
+    api = api or AsyncWarcraftLogsAPI()
+
+    try:
+        reports = await api.get_guild_reports(days_back=raid_week_days_back(api.now()), tenant=tenant)
 
-            # Build role-specific name → rankPercent lookups from the rankings endpoint
-            dps_rank_lookup = {}
-            heal_rank_lookup = {}
-            rankings_raw = fight_details.get('rankings', {})
-            for fight_rankings in rankings_raw.get('data', []):
-                roles = fight_rankings.get('roles', {})
-                for role_key, role_data in roles.items():
-                    for char in role_data.get('characters', []):
-                        name = char.get('name')
-                        pct = char.get('rankPercent')
-                        if name and pct is not None:
-                            if role_key == 'healers':
-                                heal_rank_lookup[name] = pct
-                            else:  # dps and tanks
-                                dps_rank_lookup[name] = pct
-
-            # Parse DPS data
-            dps_table = fight_details.get('table', {})
-            if dps_table and isinstance(dps_table, dict) and 'data' in dps_table:
-                entries = dps_table.get('data', {}).get('entries', [])
-                fight_duration = max((fight['endTime'] - fight['startTime']) / 1000, 1)
-
-                for entry in entries:
-                    if entry.get('type') in ('NPC', 'Boss'):  # skip non-players - can add 'Pet' to exclde pets if its breaking it
-                        continue
-                    player_name = entry.get('name', 'Unknown')
-                    if player_name not in dps_rank_lookup:  # skip healers/tanks ranked separately
-                        continue
-                    player_class = entry.get('type', 'Unknown')
-                    spec = entry.get('icon', '').split('-')[-1] if entry.get('icon') else 'Unknown'
-                    total_damage = entry.get('total', 0)
-
-                    parsed_data['players'].append({
-                        'raid_id': report['code'],
-                        'fight_id': fight['id'],
-                        'boss_name': boss_name,
-                        'difficulty': difficulty,
-                        'player_name': player_name,
-                        'player_class': player_class,
-                        'spec': spec,
-                        'role': 'DPS',
-                        'dps': total_damage / fight_duration,
-                        'total_damage': total_damage,
-                        'percentile': dps_rank_lookup.get(player_name)
-                    })
-
-            # Parse healing data
-            heal_table = fight_details.get('healingTable', {})
-            if heal_table and isinstance(heal_table, dict) and 'data' in heal_table:
-                entries = heal_table.get('data', {}).get('entries', [])
-                fight_duration = max((fight['endTime'] - fight['startTime']) / 1000, 1)
-                
-                for entry in entries:
-                    if entry.get('type') in ('NPC', 'Boss'):  # skip non-players
-                        continue
-                    player_name = entry.get('name', 'Unknown')
-                    if player_name not in heal_rank_lookup:  # skip DPS/tanks who incidentally healed
-                        continue
-                    player_class = entry.get('type', 'Unknown')
-                    spec = entry.get('icon', '').split('-')[-1] if entry.get('icon') else 'Unknown'
-                    total_healing = entry.get('total', 0)
-
-                    parsed_data['players'].append({
-                        'raid_id': report['code'],
-                        'fight_id': fight['id'],
-                        'boss_name': boss_name,
-                        'difficulty': difficulty,
-                        'player_name': player_name,
-                        'player_class': player_class,
-                        'spec': spec,
-                        'role': 'Healer',
-                        'hps': total_healing / fight_duration,
-                        'total_healing': total_healing,
-                        'percentile': heal_rank_lookup.get(player_name)
-                    })
-
-            # Parse death data with proper name mapping
-            death_events = fight_details.get('deaths', {}).get('data', [])
-            if death_events:
-                for death in death_events:
-                    target_id = death.get('targetID', -1)
-                    ability_id = death.get('killingAbilityGameID', 0)
-                    
-                    player_name = actor_map.get(target_id, f'Unknown (ID: {target_id})')
-                    ability_name = ability_map.get(ability_id) or ('Environmental / Unknown' if ability_id == 0 else f'Unknown (ID: {ability_id})')
-                    
-                    parsed_data['deaths'].append({
-                        'raid_id': report['code'],
-                        'fight_id': fight['id'],
-                        'boss_name': boss_name,
-                        'difficulty': difficulty,
-                        'player_name': player_name,
-                        'ability_name': ability_name,
-                        'ability_id': ability_id,
-                        'timestamp': death.get('timestamp', 0)
-                    })
-
-        if report_has_valid_fights:
-            parsed_data['raids'].append(raid_data)
-        else:
-            print(f"  Skipping report {report['code']} - no valid raid fights found (likely M+ or wrong zone)")
+        # Each report parses into its own container so concurrent tasks never interleave rows
+        per_report = [new_parsed_data() for _ in reports]
+        await asyncio.gather(*(
+            parse_report_async(api, report, report_data, tenant)
+            for report, report_data in zip(reports, per_report)
+        ))
+    finally:
+        if own_api:
+            await api.close()
 
+    parsed_data = new_parsed_data()
+    for report_data in per_report:
+        for key, rows in report_data.items():
+            parsed_data[key].extend(rows)
     return parsed_data
 
 if __name__ == '__main__':
@@ -1,8 +1,19 @@
 """Generate PowerPoint presentations from raid statistics."""
 import os
-from datetime import datetime, timedelta
+import re
+from datetime import datetime
+from html import escape
+import numpy as np
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.text import PP_ALIGN
+from pptx.util import Emu, Pt
+import analytics
 import database
 import config
+import death_analysis
+import instrumentation
+import progression
 
 CLASS_COLORS = {
     "DeathKnight": "#C41E3A",
@@ -23,6 +34,24 @@ CLASS_COLORS = {
 def get_class_color(player_class):
     return CLASS_COLORS.get(player_class, "#f5f5f5")
 
+def get_parse_color(parse):
+    """Get the WarcraftLogs rarity color for a parse percentile."""
+    if parse is None:
+        return "#a0a0a0"
+    if parse == 100:
+        return "#FFD000"   # gold
+    elif parse >= 99:
+        return "#E268A8"   # pink
+    elif parse >= 95:
+        return "#FF8000"   # orange
+    elif parse >= 75:
+        return "#680a94ff"   # purple 
+    elif parse >= 50:
+        return "#003cff"   # blue   
+    elif parse >= 25:
+        return "#1eff00"   # green
+    return "#a0a0a0"   # grey
+
 def get_logo_html():
     """Get HTML for guild logo."""
     import os
@@ -35,11 +64,7 @@ def get_week_range():
     """Get timestamps from midnight of the most recent past Wednesday to now.
     If today is Wednesday, uses last Wednesday so the full raid week is included.
     """
-    today = datetime.now()
-    days_back = (today.weekday() - 2) % 7 or 7  # 2 = Wednesday
-    week_start = (today - timedelta(days=days_back)).replace(hour=0, minute=0, second=0, microsecond=0)
-
-    return int(week_start.timestamp() * 1000), int(today.timestamp() * 1000)
+    return database.current_week_range()
 
 def format_duration(milliseconds):
     """Format milliseconds into MM:SS."""
@@ -48,6 +73,236 @@ def format_duration(milliseconds):
     seconds = seconds % 60
     return f"{minutes}:{seconds:02d}"
 
+# Chart rendering - weekly rows are pulled once, aggregated with NumPy and drawn as inline SVG
+CHART_PALETTE = ["#32CD32", "#D4AF37", "#3FC7EB", "#F48CBA", "#FF7C0A", "#8788EE", "#C41E3A", "#AAD372", "#FFF468"]
+
+@instrumentation.timed
+def load_chart_data(week_start, week_end, tenant=None):
+    """Load the week's performance samples and pulls into columnar NumPy arrays."""
+    perf = analytics.load_performance(week_start, week_end, tenant)
+    difficulty = np.where(perf['difficulty'] == '', '?', perf['difficulty']).astype(str)
+    perf['label'] = np.char.add(np.char.add(np.char.add(perf['boss'].astype(str), ' ('), difficulty), ')')
+
+    pulls = database.get_encounter_pulls(week_start, week_end, tenant)
+    pull = {
+        'boss': np.array([f"{row[0]} ({row[1] or '?'})" for row in pulls], dtype=object),
+        'is_kill': np.array([bool(row[2]) for row in pulls], dtype=bool),
+        # Boss health left when the pull ended - 0 on kills, NaN where WCL didn't report it
+        'boss_pct': np.array([0.0 if row[2] else (np.nan if row[5] is None else row[5]) for row in pulls],
+                             dtype=float),
+    }
+    return perf, pull
+
+def pull_ordinals(labels):
+    """Number each pull 1..n within its boss, assuming input is in chronological order."""
+    if labels.size == 0:
+        return np.array([], dtype=int)
+    _, group_idx = np.unique(labels, return_inverse=True)
+    order = np.argsort(group_idx, kind='stable')
+    counts = np.bincount(group_idx)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ordinals = np.empty(labels.size, dtype=int)
+    ordinals[order] = np.arange(labels.size) - np.repeat(starts, counts) + 1
+    return ordinals
+
+def short_number(value):
+    """Format a throughput value compactly for axis labels and summaries (e.g. 152k, 1.2M)."""
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.1f}M"
+    if value >= 1_000:
+        return f"{value / 1_000:.0f}k"
+    return f"{value:.0f}"
+
+def render_box_plot_svg(group_labels, counts, table, title, width=900, height=200):
+    """Render horizontal-axis box plots (min/p25/median/p75/max) as a compact SVG string."""
+    if len(group_labels) == 0:
+        return ''
+
+    left, right, top, bottom = 60, 10, 22, 34
+    plot_w, plot_h = width - left - right, height - top - bottom
+    vmax = float(table[:, -1].max()) or 1.0
+    scale = plot_h / vmax
+    slot = plot_w / len(group_labels)
+    box_w = min(slot * 0.5, 40)
+
+    def y(v):
+        return round(top + plot_h - v * scale, 1)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+        f'<text x="0" y="14" fill="#D4AF37" font-size="14" font-weight="bold">{title}</text>',
+        f'<line x1="{left}" y1="{top + plot_h}" x2="{width - right}" y2="{top + plot_h}" stroke="#404040"/>',
+    ]
+    for tick in np.linspace(0, vmax, 4)[1:]:
+        parts.append(f'<text x="{left - 6}" y="{y(tick) + 4}" fill="#a0a0a0" font-size="10" text-anchor="end">{short_number(tick)}</text>')
+        parts.append(f'<line x1="{left}" y1="{y(tick)}" x2="{width - right}" y2="{y(tick)}" stroke="#2d2d2d"/>')
+
+    for i, (label, count, (vmin, p25, med, p75, vmax_g)) in enumerate(zip(group_labels, counts, table)):
+        cx = round(left + slot * (i + 0.5), 1)
+        color = CHART_PALETTE[i % len(CHART_PALETTE)]
+        parts.append(
+            f'<line x1="{cx}" y1="{y(vmin)}" x2="{cx}" y2="{y(vmax_g)}" stroke="{color}"/>'
+            f'<rect x="{round(cx - box_w / 2, 1)}" y="{y(p75)}" width="{round(box_w, 1)}" '
+            f'height="{max(round(y(p25) - y(p75), 1), 1)}" fill="{color}" fill-opacity="0.35" stroke="{color}"/>'
+            f'<line x1="{round(cx - box_w / 2, 1)}" y1="{y(med)}" x2="{round(cx + box_w / 2, 1)}" y2="{y(med)}" stroke="#f5f5f5" stroke-width="2"/>'
+            f'<text x="{cx}" y="{top + plot_h + 14}" fill="#f5f5f5" font-size="10" text-anchor="middle">{escape(label[:22])}</text>'
+            f'<text x="{cx}" y="{top + plot_h + 26}" fill="#a0a0a0" font-size="9" text-anchor="middle">n={count}</text>'
+        )
+    parts.append('</svg>')
+    return ''.join(parts)
+
+def render_pull_progression_svg(labels, ordinals, boss_pct, is_kill, width=900, height=380):
+    """Render boss health left by pull number per boss; kills are filled markers at 0%, wipes hollow."""
+    if labels.size == 0:
+        return ''
+
+    left, right, top, bottom = 50, 190, 10, 30
+    plot_w, plot_h = width - left - right, height - top - bottom
+    max_pull = int(ordinals.max())
+
+    def x(n):
+        return round(left + (n - 1) / max(max_pull - 1, 1) * plot_w, 1)
+
+    def y(pct):
+        return round(top + plot_h - pct / 100 * plot_h, 1)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+        f'<line x1="{left}" y1="{top + plot_h}" x2="{left + plot_w}" y2="{top + plot_h}" stroke="#404040"/>',
+        f'<text x="{left + plot_w / 2}" y="{height - 4}" fill="#a0a0a0" font-size="10" text-anchor="middle">pull #</text>',
+    ]
+    for tick in (25, 50, 75, 100):
+        parts.append(f'<text x="{left - 6}" y="{y(tick) + 4}" fill="#a0a0a0" font-size="10" text-anchor="end">{tick}%</text>')
+        parts.append(f'<line x1="{left}" y1="{y(tick)}" x2="{left + plot_w}" y2="{y(tick)}" stroke="#2d2d2d"/>')
+
+    for i, boss in enumerate(np.unique(labels)):
+        mask = (labels == boss) & ~np.isnan(boss_pct)
+        color = CHART_PALETTE[i % len(CHART_PALETTE)]
+        xs, ys, kills = ordinals[mask], boss_pct[mask], is_kill[mask]
+        points = ' '.join(f'{x(n)},{y(pct)}' for n, pct in zip(xs, ys))
+        parts.append(f'<polyline points="{points}" fill="none" stroke="{color}" stroke-width="1.5"/>')
+        parts.extend(
+            f'<circle cx="{x(n)}" cy="{y(pct)}" r="3.5" fill="{color if kill else "#1a1a1a"}" stroke="{color}"/>'
+            for n, pct, kill in zip(xs, ys, kills)
+        )
+        kill_count = int(is_kill[labels == boss].sum())
+        best = f", best {ys.min():.0f}%" if ys.size and not kill_count else ''
+        parts.append(
+            f'<rect x="{left + plot_w + 14}" y="{top + i * 18}" width="10" height="10" fill="{color}"/>'
+            f'<text x="{left + plot_w + 30}" y="{top + i * 18 + 9}" fill="#f5f5f5" font-size="10">'
+            f'{escape(boss[:22])} ({kill_count}/{int((labels == boss).sum())}{best})</text>'
+        )
+    parts.append('</svg>')
+    return ''.join(parts)
+
+def render_sparkline_svg(series, width=160, height=34):
+    """Tiny 0-100% line chart; series is [(values, color)], NaN points are skipped."""
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">']
+    for values, color in series:
+        if values.size == 0:
+            continue
+        step = (width - 4) / max(values.size - 1, 1)
+        points = ' '.join(f'{round(2 + i * step, 1)},{round(2 + (height - 4) * (1 - value / 100), 1)}'
+                          for i, value in enumerate(values) if not np.isnan(value))
+        if points:
+            parts.append(f'<polyline points="{points}" fill="none" stroke="{color}" stroke-width="1.5"/>')
+    parts.append('</svg>')
+    return ''.join(parts)
+
+def render_phase_bars_svg(phase_counts, width=80, height=34):
+    """Mini histogram of the phase each pull ended in (P1 on the left)."""
+    if not phase_counts:
+        return ''
+    phases = range(1, max(phase_counts) + 1)
+    peak = max(phase_counts.values())
+    bar_w = width / len(phases)
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">']
+    for i, phase in enumerate(phases):
+        bar_h = round(phase_counts.get(phase, 0) / peak * (height - 12), 1)
+        parts.append(f'<rect x="{round(i * bar_w + 1, 1)}" y="{height - 10 - bar_h}" width="{round(bar_w - 2, 1)}" '
+                     f'height="{bar_h}" fill="{CHART_PALETTE[1]}"/>')
+        parts.append(f'<text x="{round((i + 0.5) * bar_w, 1)}" y="{height - 1}" fill="#a0a0a0" font-size="8" '
+                     f'text-anchor="middle">P{phase}</text>')
+    parts.append('</svg>')
+    return ''.join(parts)
+
+@instrumentation.timed
+def create_distribution_slide(perf):
+    """Create slide with per-boss DPS and HPS distribution box plots."""
+    dps_mask = perf['role'] == 'DPS'
+    hps_mask = perf['role'] == 'Healer'
+    dps_svg = render_box_plot_svg(*analytics.group_quantiles(perf['label'][dps_mask], perf['dps'][dps_mask]),
+                                  'DPS PER BOSS')
+    hps_svg = render_box_plot_svg(*analytics.group_quantiles(perf['label'][hps_mask], perf['hps'][hps_mask]),
+                                  'HPS PER BOSS')
+
+    if not dps_svg and not hps_svg:
+        return
+
+    logo_html = get_logo_html()
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+</head>
+<body class="col bg-surface" style="width: 960px; height: 540px; position: relative;">
+    <div style="position: absolute; top: 20px; right: 20px; z-index: 100;">
+        {logo_html}
+    </div>
+    <div style="width: 920px; margin: 0 20px; padding-top: 20px;" class="fit">
+        <h1 class="text-5xl text-primary" style="margin: 0; font-weight: bold;">THROUGHPUT SPREAD</h1>
+    </div>
+    <div style="margin: 8px 30px 0 30px;">
+        {dps_svg}
+        {hps_svg}
+    </div>
+    <div style="position: absolute; bottom: 20px; left: 20px; right: 20px;">
+        <div class="text-xs text-muted-foreground">
+            Box = 25th-75th percentile, line = median, whiskers = min/max - kills only
+        </div>
+    </div>
+</body>
+</html>"""
+
+    with open(os.path.join(config.SLIDES_DIR, 'slide7.html'), 'w') as f:
+        f.write(html)
+
+@instrumentation.timed
+def create_progression_slide(pull):
+    """Create slide charting boss health left by pull number per boss this week."""
+    if pull['boss'].size == 0:
+        return
+
+    ordinals = pull_ordinals(pull['boss'])
+    svg = render_pull_progression_svg(pull['boss'], ordinals, pull['boss_pct'], pull['is_kill'])
+
+    logo_html = get_logo_html()
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+</head>
+<body class="col bg-surface" style="width: 960px; height: 540px; position: relative;">
+    <div style="position: absolute; top: 20px; right: 20px; z-index: 100;">
+        {logo_html}
+    </div>
+    <div style="width: 920px; margin: 0 20px; padding-top: 20px;" class="fit">
+        <h1 class="text-5xl text-primary" style="margin: 0; font-weight: bold;">PULL PROGRESSION</h1>
+    </div>
+    <div style="margin: 16px 30px 0 30px;">
+        {svg}
+    </div>
+    <div style="position: absolute; bottom: 20px; left: 20px; right: 20px;">
+        <div class="text-xs text-muted-foreground">
+            Boss health left at the end of each pull this week - filled = kill, hollow = wipe - legend shows kills/pulls
+        </div>
+    </div>
+</body>
+</html>"""
+
+    with open(os.path.join(config.SLIDES_DIR, 'slide8.html'), 'w') as f:
+        f.write(html)
+
 def create_shared_css():
     """Create shared CSS file with WoW-themed design system."""
     css_content = """
@@ -82,6 +337,59 @@ def create_shared_css():
     with open(os.path.join(config.SLIDES_DIR, 'shared.css'), 'w') as f:
         f.write(css_content)
 
+def difficulty_heading(difficulty):
+    """' - HEROIC' style heading suffix for per-difficulty slides ('' when not split)."""
+    if not difficulty:
+        return ''
+    return f' <span class="text-3xl text-secondary">- {difficulty.upper()}</span>'
+
+def week_difficulties(boss_stats):
+    """Difficulties pulled this week, hardest first (Heroic when nothing was pulled)."""
+    present = {boss['difficulty'] for boss in boss_stats if boss['difficulty']}
+    ordered = [d for d in config.DIFFICULTY_ORDER if d in present]
+    return ordered + sorted(present - set(ordered)) or ['Heroic']
+
+def difficulty_sections(boss_stats, boss_mvps, leaderboards, perf, week_start, week_end):
+    """Per-difficulty inputs for the boss, performer, MVP and consistency slides.
+
+    Everything is split from the week's grouped query results, so more
+    difficulties add no database work. The hardest difficulty gets the plain
+    slideN.html names, the others slideN-<difficulty>.html.
+    """
+    sections = []
+    for i, difficulty in enumerate(week_difficulties(boss_stats)):
+        section = {
+            'difficulty': difficulty,
+            'suffix': '' if i == 0 else f'-{difficulty.lower()}',
+            'boss_stats': [boss for boss in boss_stats if boss['difficulty'] == difficulty],
+            'boss_mvps': [mvp for mvp in boss_mvps if mvp['difficulty'] == difficulty],
+            'dps_top': [], 'hps_top': [], 'dps_consistent': [], 'hps_consistent': [],
+        }
+        # Player rows are only stored for kills, so a difficulty that was only wiped on has none
+        if np.any(perf['difficulty'] == difficulty):
+            section.update({
+                'dps_top': leaderboards.get(('dps', difficulty), []),
+                'hps_top': leaderboards.get(('hps', difficulty), []),
+                'dps_consistent': analytics.get_consistency_leaderboard(week_start, week_end, 'dps', difficulty,
+                                                                        data=perf),
+                'hps_consistent': analytics.get_consistency_leaderboard(week_start, week_end, 'hps', difficulty,
+                                                                        data=perf),
+            })
+        sections.append(section)
+    return sections
+
+def clear_slides():
+    """Remove last run's slide files and their images.
+
+    Slides with no data this week (and dropped difficulties) aren't written, so
+    leftovers would otherwise reach the slideshow, the images and Discord. Every
+    slide is rewritten each run, so its images are re-rendered anyway.
+    """
+    for filename in os.listdir(config.SLIDES_DIR):
+        if re.match(r'slide\d+(-[a-z]+)?\.', filename):
+            os.remove(os.path.join(config.SLIDES_DIR, filename))
+
+@instrumentation.timed
 def create_title_slide(week_start, week_end):
     """Create the title slide."""
     start_date = datetime.fromtimestamp(week_start / 1000).strftime('%B %d')
@@ -122,6 +430,7 @@ def create_title_slide(week_start, week_end):
     with open(os.path.join(config.SLIDES_DIR, 'slide1.html'), 'w') as f:
         f.write(html)
 
+@instrumentation.timed
 def create_summary_slide(summary):
     """Create weekly summary slide."""
     html = f"""<!DOCTYPE html>
@@ -180,7 +489,8 @@ def create_summary_slide(summary):
     with open(os.path.join(config.SLIDES_DIR, 'slide2.html'), 'w') as f:
         f.write(html)
 
-def create_boss_breakdown_slide(boss_stats):
+@instrumentation.timed
+def create_boss_breakdown_slide(boss_stats, difficulty=None, suffix=''):
     """Create slide with boss kill/wipe breakdown."""
 
     boss_rows = ""
@@ -216,7 +526,7 @@ def create_boss_breakdown_slide(boss_stats):
         {logo_html}
     </div>
     <div style="width: 920px; margin: 0 20px; padding-top: 20px;" class="fit">
-        <h1 class="text-5xl text-primary" style="margin: 0; font-weight: bold;">BOSS BREAKDOWN</h1>
+        <h1 class="text-5xl text-primary" style="margin: 0; font-weight: bold;">BOSS BREAKDOWN{difficulty_heading(difficulty)}</h1>
     </div>
     
     <div style="margin: 0 32px;">
@@ -238,10 +548,11 @@ def create_boss_breakdown_slide(boss_stats):
 </body>
 </html>"""
     
-    with open(os.path.join(config.SLIDES_DIR, 'slide3.html'), 'w') as f:
+    with open(os.path.join(config.SLIDES_DIR, f'slide3{suffix}.html'), 'w') as f:
         f.write(html)
 
-def create_top_performers_slide(dps_top, hps_top, difficulty='Heroic'):
+@instrumentation.timed
+def create_top_performers_slide(dps_top, hps_top, difficulty='Heroic', suffix=''):
     """Create slide with top DPS and HPS performers."""
     dps_rows = ""
     for i, player in enumerate(dps_top[:5], 1):
@@ -305,9 +616,10 @@ def create_top_performers_slide(dps_top, hps_top, difficulty='Heroic'):
 </body>
 </html>"""
     
-    with open(os.path.join(config.SLIDES_DIR, 'slide4.html'), 'w') as f:
+    with open(os.path.join(config.SLIDES_DIR, f'slide4{suffix}.html'), 'w') as f:
         f.write(html)
 
+@instrumentation.timed
 def create_closing_slide():
     """Create closing slide."""
     logo_html = get_logo_html()
@@ -337,13 +649,13 @@ def create_closing_slide():
 </body>
 </html>"""
     
-    with open(os.path.join(config.SLIDES_DIR, 'slide7.html'), 'w') as f:
+    with open(os.path.join(config.SLIDES_DIR, 'slide99.html'), 'w') as f:
         f.write(html)
 
-def create_death_causes_slide(week_start, week_end):
+@instrumentation.timed
+def create_death_causes_slide(death_causes):
     """Create slide with top 10 death causes with Wowhead links."""
     logo_html = get_logo_html()
-    death_causes = database.get_top_death_causes(week_start, week_end, 10)
     
     if not death_causes:
         return
@@ -422,7 +734,8 @@ def create_death_causes_slide(week_start, week_end):
     with open(os.path.join(config.SLIDES_DIR, 'slide6.html'), 'w') as f:
         f.write(html)
 
-def create_boss_mvp_slide(boss_mvps):
+@instrumentation.timed
+def create_boss_mvp_slide(boss_mvps, difficulty=None, suffix=''):
     """Create slide showing top DPS and HPS performer per boss."""
     logo_html = get_logo_html()
 
@@ -430,29 +743,12 @@ def create_boss_mvp_slide(boss_mvps):
     for mvp in boss_mvps:
         player_name = mvp['player_name'] or '—'
         player_color = get_class_color(mvp['player_class']) if mvp['player_name'] else '#a0a0a0'
-        difficulty = mvp.get('difficulty') or ''
+        mvp_difficulty = mvp.get('difficulty') or ''
         parse = mvp['percentile']
         role = mvp.get('role', '')
 
-        if parse is not None:
-            parse_str = f"{parse:.0f}"
-            if parse == 100:
-                parse_color = "#FFD000"   # gold
-            elif parse >= 99:
-                parse_color = "#E268A8"   # pink
-            elif parse >= 95:
-                parse_color = "#FF8000"   # orange
-            elif parse >= 75:
-                parse_color = "#680a94ff"   # purple 
-            elif parse >= 50:
-                parse_color = "#003cff"   # blue   
-            elif parse >= 25:
-                parse_color = "#1eff00"   # green
-            else:
-                parse_color = "#a0a0a0"   # grey
-        else:
-            parse_str = "—"
-            parse_color = "#a0a0a0"
+        parse_str = f"{parse:.0f}" if parse is not None else "—"
+        parse_color = get_parse_color(parse)
 
         # Show the relevant stat
         if role == 'DPS' and mvp['dps']:
@@ -466,7 +762,7 @@ def create_boss_mvp_slide(boss_mvps):
         <div class="bg-muted" style="width: 289px; padding: 10px 12px; box-sizing: border-box;">
             <div style="margin: 0 0 6px 0; border-bottom: 2px solid var(--color-secondary); padding-bottom: 4px;">
                 <span class="text-base text-secondary" style="font-weight: bold;">{mvp['boss_name']}</span>
-                <span class="text-xs text-muted-foreground" style="margin-left: 6px;">{difficulty}</span>
+                <span class="text-xs text-muted-foreground" style="margin-left: 6px;">{mvp_difficulty}</span>
             </div>
             <div class="row" style="justify-content: space-between; align-items: center;">
                 <div>
@@ -491,7 +787,7 @@ def create_boss_mvp_slide(boss_mvps):
         {logo_html}
     </div>
     <div style="width: 920px; margin: 0 20px; padding-top: 20px;" class="fit">
-        <h1 class="text-5xl text-primary" style="margin: 0; font-weight: bold;">BOSS MVPs</h1>
+        <h1 class="text-5xl text-primary" style="margin: 0; font-weight: bold;">BOSS MVPs{difficulty_heading(difficulty)}</h1>
     </div>
     <div style="margin: 8px 20px 20px 20px; display: flex; flex-wrap: wrap; gap: 8px; flex: 1; align-content: flex-start;">
         {boss_cards}
@@ -499,17 +795,524 @@ def create_boss_mvp_slide(boss_mvps):
 </body>
 </html>"""
 
-    with open(os.path.join(config.SLIDES_DIR, 'slide5.html'), 'w') as f:
+    with open(os.path.join(config.SLIDES_DIR, f'slide5{suffix}.html'), 'w') as f:
+        f.write(html)
+
+# Native .pptx export - mirrors the HTML slides at the same 960x540 geometry
+PPTX_PX = 9525  # EMU per CSS pixel at 96 DPI
+PPTX_COLORS = {
+    'surface': '#1a1a1a',
+    'muted': '#2d2d2d',
+    'accent': '#2C1810',
+    'primary': '#32CD32',
+    'secondary': '#D4AF37',
+    'foreground': '#f5f5f5',
+    'muted_foreground': '#a0a0a0',
+}
+
+def _rgb(hex_color):
+    """Convert '#rrggbb' (or '#rrggbbaa') to a python-pptx RGBColor."""
+    return RGBColor.from_string(hex_color.lstrip('#')[:6].upper())
+
+def _pptx_blank_slide(prs):
+    """Add a blank slide with the dark surface background."""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    fill = slide.background.fill
+    fill.solid()
+    fill.fore_color.rgb = _rgb(PPTX_COLORS['surface'])
+    return slide
+
+def _pptx_rect(slide, x, y, w, h, color):
+    """Add a filled rectangle without an outline, positioned in CSS pixels."""
+    shape = slide.shapes.add_shape(1, Emu(x * PPTX_PX), Emu(y * PPTX_PX), Emu(w * PPTX_PX), Emu(h * PPTX_PX))
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = _rgb(color)
+    shape.line.fill.background()
+    shape.shadow.inherit = False
+    return shape
+
+def _pptx_text(slide, x, y, w, h, text, size=14, color=None, bold=False, align=PP_ALIGN.LEFT):
+    """Add a single-paragraph text box, positioned in CSS pixels."""
+    box = slide.shapes.add_textbox(Emu(x * PPTX_PX), Emu(y * PPTX_PX), Emu(w * PPTX_PX), Emu(h * PPTX_PX))
+    frame = box.text_frame
+    frame.word_wrap = True
+    paragraph = frame.paragraphs[0]
+    paragraph.alignment = align
+    run = paragraph.add_run()
+    run.text = str(text)
+    run.font.name = 'Arial'
+    run.font.size = Pt(size * 0.75)  # CSS px -> pt
+    run.font.bold = bold
+    run.font.color.rgb = _rgb(color or PPTX_COLORS['foreground'])
+    return box
+
+def _pptx_heading(slide, text, suffix=None):
+    """Add the slide heading used across the deck."""
+    _pptx_text(slide, 20, 20, 920, 60, text, size=48, color=PPTX_COLORS['primary'], bold=True)
+    if suffix:
+        _pptx_text(slide, 20, 80, 920, 36, suffix, size=24, color=PPTX_COLORS['secondary'], bold=True)
+
+def add_pptx_title_slide(prs, week_start, week_end):
+    """Add the title slide to the deck."""
+    start_date = datetime.fromtimestamp(week_start / 1000).strftime('%B %d')
+    end_date = datetime.fromtimestamp(week_end / 1000).strftime('%B %d, %Y')
+
+    slide = _pptx_blank_slide(prs)
+    _pptx_text(slide, 20, 150, 920, 110, config.GUILD_NAME.upper(), size=96,
+               color=PPTX_COLORS['primary'], bold=True, align=PP_ALIGN.CENTER)
+    _pptx_text(slide, 20, 270, 920, 50, 'Weekly Raid Report', size=36,
+               color=PPTX_COLORS['secondary'], bold=True, align=PP_ALIGN.CENTER)
+    _pptx_text(slide, 20, 330, 920, 40, f'{start_date} - {end_date}', size=24, align=PP_ALIGN.CENTER)
+    _pptx_text(slide, 20, 500, 920, 20, 'Prepared by Raid Leadership - Data from WarcraftLogs', size=12,
+               color=PPTX_COLORS['muted_foreground'], align=PP_ALIGN.CENTER)
+
+def add_pptx_summary_slide(prs, summary):
+    """Add the weekly summary slide to the deck."""
+    slide = _pptx_blank_slide(prs)
+    _pptx_heading(slide, 'WEEK OVERVIEW')
+
+    cards = [
+        (summary['total_raids'], 'Raid Sessions', PPTX_COLORS['primary'], PPTX_COLORS['primary']),
+        (summary['total_bosses_killed'], 'Bosses Killed', PPTX_COLORS['secondary'], PPTX_COLORS['secondary']),
+        (summary['total_wipes'], 'Total Wipes', PPTX_COLORS['accent'], '#ffffff'),
+    ]
+    card_width = (896 - 2 * 16) / 3
+    for i, (value, label, border_color, value_color) in enumerate(cards):
+        x = 32 + i * (card_width + 16)
+        _pptx_rect(slide, x, 110, card_width, 270, PPTX_COLORS['muted'])
+        _pptx_rect(slide, x, 110, 8, 270, border_color)
+        _pptx_text(slide, x + 32, 180, card_width - 48, 80, value, size=60, color=value_color, bold=True)
+        _pptx_text(slide, x + 32, 270, card_width - 48, 30, label, size=18)
+
+    _pptx_rect(slide, 32, 400, 896, 72, PPTX_COLORS['primary'])
+    _pptx_text(slide, 32, 418, 896, 40, f"{summary['total_raid_time_hours']:.1f} Hours of Raiding",
+               size=24, color='#ffffff', bold=True, align=PP_ALIGN.CENTER)
+
+def add_pptx_boss_breakdown_slide(prs, boss_stats, difficulty=None):
+    """Add the boss kill/wipe breakdown slide to the deck."""
+    slide = _pptx_blank_slide(prs)
+    _pptx_heading(slide, f'BOSS BREAKDOWN - {difficulty.upper()}' if difficulty else 'BOSS BREAKDOWN')
+
+    columns = [(48, 400, 'BOSS'), (448, 160, 'KILLS'), (608, 160, 'WIPES'), (768, 160, 'AVG TIME')]
+    _pptx_rect(slide, 32, 100, 896, 36, PPTX_COLORS['accent'])
+    for x, w, label in columns:
+        align = PP_ALIGN.LEFT if label == 'BOSS' else PP_ALIGN.CENTER
+        _pptx_text(slide, x, 104, w - 16, 28, label, size=14, color='#ffffff', bold=True, align=align)
+
+    for i, boss in enumerate(boss_stats[:8]):
+        y = 148 + i * 44
+        kill_time = format_duration(boss['avg_kill_time'] * 1000) if boss['avg_kill_time'] else 'N/A'
+        _pptx_rect(slide, 32, y, 896, 38, PPTX_COLORS['muted'])
+        _pptx_text(slide, 48, y + 4, 384, 30, f"{boss['boss']}  {boss.get('difficulty') or ''}", size=16, bold=True)
+        _pptx_text(slide, 448, y + 6, 144, 28, f"{boss['kills']} Kill{'s' if boss['kills'] != 1 else ''}",
+                   size=14, color=PPTX_COLORS['secondary'], align=PP_ALIGN.CENTER)
+        _pptx_text(slide, 608, y + 6, 144, 28, f"{boss['wipes']} Wipe{'s' if boss['wipes'] != 1 else ''}",
+                   size=14, color=PPTX_COLORS['muted_foreground'], align=PP_ALIGN.CENTER)
+        _pptx_text(slide, 768, y + 6, 144, 28, kill_time, size=14, align=PP_ALIGN.CENTER)
+
+def _pptx_ranking_column(slide, x, title, players):
+    """Add one ranked leaderboard column (used for DPS and HPS)."""
+    _pptx_text(slide, x, 130, 438, 36, title, size=24, color=PPTX_COLORS['secondary'], bold=True)
+    for i, player in enumerate(players[:5], 1):
+        y = 172 + (i - 1) * 50
+        _pptx_rect(slide, x, y, 438, 44, PPTX_COLORS['muted'])
+        _pptx_text(slide, x + 10, y + 6, 40, 32, f'#{i}', size=18, color=PPTX_COLORS['secondary'], bold=True)
+        _pptx_text(slide, x + 50, y + 8, 260, 30, player['name'], size=16, color=get_class_color(player['class']))
+        _pptx_text(slide, x + 310, y + 8, 118, 30, f"{player['avg']:,.0f}", size=16,
+                   color=PPTX_COLORS['primary'], bold=True, align=PP_ALIGN.RIGHT)
+
+def add_pptx_top_performers_slide(prs, dps_top, hps_top, difficulty='Heroic'):
+    """Add the top DPS/HPS performers slide to the deck."""
+    slide = _pptx_blank_slide(prs)
+    _pptx_heading(slide, 'PUMPERS OF THE WEEK', f'- {difficulty.upper()}')
+    _pptx_ranking_column(slide, 32, 'DPS RANKINGS', dps_top)
+    _pptx_ranking_column(slide, 490, 'HPS RANKINGS', hps_top)
+    _pptx_text(slide, 20, 500, 920, 20, 'Average performance across all encounters this week',
+               size=12, color=PPTX_COLORS['muted_foreground'])
+
+def add_pptx_boss_mvp_slide(prs, boss_mvps, difficulty=None):
+    """Add the per-boss MVP slide to the deck."""
+    slide = _pptx_blank_slide(prs)
+    _pptx_heading(slide, f'BOSS MVPs - {difficulty.upper()}' if difficulty else 'BOSS MVPs')
+
+    for i, mvp in enumerate(boss_mvps[:12]):
+        x = 20 + (i % 3) * 307
+        y = 100 + (i // 3) * 104
+        player_color = get_class_color(mvp['player_class']) if mvp['player_name'] else PPTX_COLORS['muted_foreground']
+        parse = mvp['percentile']
+        if mvp.get('role') == 'DPS' and mvp['dps']:
+            stat_str = f"{mvp['dps']:,.0f} DPS"
+        elif mvp.get('role') == 'Healer' and mvp['hps']:
+            stat_str = f"{mvp['hps']:,.0f} HPS"
+        else:
+            stat_str = ''
+
+        _pptx_rect(slide, x, y, 299, 96, PPTX_COLORS['muted'])
+        _pptx_rect(slide, x + 12, y + 34, 275, 2, PPTX_COLORS['secondary'])
+        _pptx_text(slide, x + 8, y + 4, 283, 28, f"{mvp['boss_name']}  {mvp.get('difficulty') or ''}",
+                   size=15, color=PPTX_COLORS['secondary'], bold=True)
+        _pptx_text(slide, x + 8, y + 42, 200, 24, mvp['player_name'] or '—', size=14, color=player_color, bold=True)
+        _pptx_text(slide, x + 8, y + 64, 200, 22, stat_str, size=12, color=PPTX_COLORS['muted_foreground'])
+        _pptx_text(slide, x + 200, y + 42, 88, 30, f'{parse:.0f}' if parse is not None else '—', size=20,
+                   color=get_parse_color(parse), bold=True, align=PP_ALIGN.RIGHT)
+
+def add_pptx_consistency_slide(prs, dps_consistent, hps_consistent, difficulty='Heroic'):
+    """Add the consistency leaderboard slide to the deck."""
+    if not dps_consistent and not hps_consistent:
+        return
+
+    slide = _pptx_blank_slide(prs)
+    _pptx_heading(slide, 'MR CONSISTENT', f'- {difficulty.upper()}')
+    for x, title, players in ((32, 'DPS', dps_consistent), (490, 'HEALERS', hps_consistent)):
+        _pptx_text(slide, x, 130, 438, 36, title, size=24, color=PPTX_COLORS['secondary'], bold=True)
+        for i, player in enumerate(players[:5], 1):
+            y = 172 + (i - 1) * 56
+            _pptx_rect(slide, x, y, 438, 50, PPTX_COLORS['muted'])
+            _pptx_text(slide, x + 10, y + 8, 40, 32, f'#{i}', size=18, color=PPTX_COLORS['secondary'], bold=True)
+            _pptx_text(slide, x + 50, y + 2, 280, 26, player['name'], size=16, color=get_class_color(player['class']))
+            _pptx_text(slide, x + 50, y + 26, 280, 20, f"median {player['median']:,.0f} - p75 {player['p75']:,.0f}",
+                       size=12, color=PPTX_COLORS['muted_foreground'])
+            _pptx_text(slide, x + 330, y + 10, 98, 30, f"±{player['cv'] * 100:.1f}%", size=16,
+                       color=PPTX_COLORS['primary'], bold=True, align=PP_ALIGN.RIGHT)
+
+def add_pptx_death_causes_slide(prs, death_causes):
+    """Add the top 10 death causes slide to the deck."""
+    if not death_causes:
+        return
+
+    slide = _pptx_blank_slide(prs)
+    _pptx_heading(slide, 'TOP 10 KILLERS')
+
+    for i, death in enumerate(death_causes[:10]):
+        x = 32 if i < 5 else 490
+        y = 100 + (i % 5) * 76
+        ability_display = death['ability'][:30] + "..." if len(death['ability']) > 30 else death['ability']
+        _pptx_rect(slide, x, y, 438, 68, PPTX_COLORS['muted'])
+        _pptx_text(slide, x + 10, y + 6, 40, 30, f'#{i + 1}', size=18, color=PPTX_COLORS['primary'], bold=True)
+        _pptx_text(slide, x + 50, y + 8, 300, 28, ability_display, size=16)
+        _pptx_text(slide, x + 350, y + 8, 78, 28, f"{death['deaths']}×", size=16,
+                   color=PPTX_COLORS['secondary'], bold=True, align=PP_ALIGN.RIGHT)
+        _pptx_text(slide, x + 50, y + 38, 300, 22, (death.get('boss') or '')[:20], size=12,
+                   color=PPTX_COLORS['muted_foreground'])
+
+def add_pptx_progression_slide(prs, bosses):
+    """Add the season progression slide to the deck."""
+    if not bosses:
+        return
+
+    slide = _pptx_blank_slide(prs)
+    _pptx_heading(slide, 'SEASON PROGRESSION')
+    for i, progress in enumerate(bosses[:8]):
+        y = 96 + i * 52
+        _pptx_rect(slide, 32, y, 896, 46, PPTX_COLORS['muted'])
+        _pptx_text(slide, 42, y + 2, 480, 24, progress['boss'], size=15, color=PPTX_COLORS['secondary'], bold=True)
+        _pptx_text(slide, 42, y + 24, 480, 20, f"{progress['difficulty'] or ''} - {progress['pulls']} pulls, "
+                   f"{progress['kills']} kills", size=11, color=PPTX_COLORS['muted_foreground'])
+        detail = f"killed on pull {progress['first_kill_pull']}" if progress['first_kill_pull'] else \
+            f"best on pull {progress['best_pull']}" if progress['best_pull'] else ''
+        _pptx_text(slide, 560, y + 24, 358, 20, detail, size=11, color=PPTX_COLORS['muted_foreground'],
+                   align=PP_ALIGN.RIGHT)
+        _pptx_text(slide, 560, y + 2, 358, 24, progression_status(progress), size=16, bold=True,
+                   color=PPTX_COLORS['primary'] if progress['kills'] else PPTX_COLORS['secondary'],
+                   align=PP_ALIGN.RIGHT)
+
+def add_pptx_death_timeline_slide(prs, timeline):
+    """Add the death timeline slide to the deck."""
+    if not timeline or not timeline['pulls']:
+        return
+
+    slide = _pptx_blank_slide(prs)
+    _pptx_heading(slide, 'DEATH TIMELINE')
+    columns = (
+        (32, 'FIRST TO DIE', [(row['player'], f"{row['share'] * 100:.0f}% of pulls", f"{row['first_deaths']}×")
+                              for row in timeline['first_deaths'][:5]]),
+        (330, 'WIPE STARTERS', [(row['player'], f"{row['ability'][:30]} - {row['boss'][:20]}", f"{row['wipes']}×")
+                                for row in timeline['wipe_causes'][:5]]),
+        (628, 'WHEN THEY HIT', [(row['ability'][:26], f"{row['deaths']} deaths - {row['boss'][:20]}",
+                                 format_duration(row['median'])) for row in timeline['ability_timing'][:5]]),
+    )
+    for x, title, rows in columns:
+        _pptx_text(slide, x, 100, 290, 30, title, size=18, color=PPTX_COLORS['secondary'], bold=True)
+        for i, (name, detail, value) in enumerate(rows):
+            y = 136 + i * 62
+            _pptx_rect(slide, x, y, 290, 56, PPTX_COLORS['muted'])
+            _pptx_text(slide, x + 8, y + 4, 210, 24, name, size=14)
+            _pptx_text(slide, x + 8, y + 28, 274, 22, detail, size=10, color=PPTX_COLORS['muted_foreground'])
+            _pptx_text(slide, x + 210, y + 4, 72, 24, value, size=14, color=PPTX_COLORS['primary'], bold=True,
+                       align=PP_ALIGN.RIGHT)
+
+@instrumentation.timed
+def create_pptx_deck(week_start, week_end, summary, sections, death_causes, progress=None, timeline=None):
+    """Build the weekly deck as a native .pptx file in OUTPUT_DIR and return its path.
+
+    The SVG chart slides (throughput spread and pull progression, slide7/slide8)
+    are HTML-only - the deck carries the table slides.
+    """
+    prs = Presentation()
+    prs.slide_width = Emu(960 * PPTX_PX)
+    prs.slide_height = Emu(540 * PPTX_PX)
+    prs.core_properties.title = config.PRESENTATION_TITLE
+    prs.core_properties.subject = config.PRESENTATION_SUBTITLE
+
+    add_pptx_title_slide(prs, week_start, week_end)
+    add_pptx_summary_slide(prs, summary)
+    # Same order as the HTML deck: each slide type for every difficulty, hardest first
+    for section in sections:
+        add_pptx_boss_breakdown_slide(prs, section['boss_stats'], section['difficulty'])
+    for section in sections:
+        add_pptx_top_performers_slide(prs, section['dps_top'], section['hps_top'], section['difficulty'])
+    for section in sections:
+        add_pptx_boss_mvp_slide(prs, section['boss_mvps'], section['difficulty'])
+    add_pptx_death_causes_slide(prs, death_causes)
+    for section in sections:
+        add_pptx_consistency_slide(prs, section['dps_consistent'], section['hps_consistent'], section['difficulty'])
+    add_pptx_progression_slide(prs, progress or [])
+    add_pptx_death_timeline_slide(prs, timeline)
+
+    week_label = datetime.fromtimestamp(week_start / 1000).strftime('%Y-%m-%d')
+    tenant_label = f'{config.TENANT}-' if config.TENANT else ''
+    filepath = os.path.join(config.OUTPUT_DIR, f'raid-stats-{tenant_label}{week_label}.pptx')
+    prs.save(filepath)
+    print(f"✓ Created {filepath}")
+    return filepath
+
+@instrumentation.timed
+def create_consistency_slide(dps_consistent, hps_consistent, difficulty='Heroic', suffix=''):
+    """Create slide with the most consistent DPS and healers of the week."""
+    if not dps_consistent and not hps_consistent:
+        return
+
+    def make_rows(players, metric_label):
+        rows = ""
+        for i, player in enumerate(players[:5], 1):
+            rows += f"""
+            <div class="row bg-muted" style="padding: 10px 14px; margin: 0 0 6px 0; align-items: center;">
+                <div class="text-lg text-secondary" style="width: 30px; font-weight: bold; margin: 0;">#{i}</div>
+                <div style="flex: 1; margin: 0;">
+                    <div class="text-base" style="color: {get_class_color(player['class'])};">{player['name']}</div>
+                    <div class="text-xs text-muted-foreground">median {player['median']:,.0f} - p75 {player['p75']:,.0f} {metric_label}</div>
+                </div>
+                <div class="text-base text-primary" style="width: 90px; text-align: right; font-weight: bold; margin: 0;">
+                    ±{player['cv'] * 100:.1f}%
+                </div>
+            </div>
+            """
+        return rows
+
+    logo_html = get_logo_html()
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+</head>
+<body class="col bg-surface" style="width: 960px; height: 540px; position: relative;">
+    <div style="position: absolute; top: 20px; right: 20px; z-index: 100;">
+        {logo_html}
+    </div>
+    <div style="width: 920px; margin: 0 20px; padding-top: 20px;" class="fit">
+        <h1 class="text-5xl text-primary" style="margin: 0; font-weight: bold;">MR CONSISTENT <span class="text-3xl text-secondary">- {difficulty.upper()}</span></h1>
+    </div>
+
+    <div class="row fill-height" style="margin: 0 32px; gap: 20px; align-items: stretch;">
+        <div style="flex: 1;">
+            <div class="text-2xl text-secondary" style="margin: 0 0 12px 0; font-weight: bold;">
+                DPS
+            </div>
+            {make_rows(dps_consistent, 'DPS')}
+        </div>
+
+        <div style="flex: 1;">
+            <div class="text-2xl text-secondary" style="margin: 0 0 12px 0; font-weight: bold;">
+                HEALERS
+            </div>
+            {make_rows(hps_consistent, 'HPS')}
+        </div>
+    </div>
+
+    <div style="position: absolute; bottom: 20px; left: 20px; right: 20px;">
+        <div class="text-xs text-muted-foreground">
+            Lowest kill-to-kill variation (boss-normalised CV) among players at or above their spec average - min 3 kills
+        </div>
+    </div>
+</body>
+</html>"""
+
+    with open(os.path.join(config.SLIDES_DIR, f'slide9{suffix}.html'), 'w') as f:
+        f.write(html)
+
+def render_timing_bar_svg(timing, scale_ms, width=150, height=14):
+    """p25-p75 bar with a median tick on a 0..scale_ms time-into-pull axis."""
+    def x(ms):
+        return round(ms / max(scale_ms, 1) * (width - 4) + 2, 1)
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<line x1="2" y1="{height / 2}" x2="{width - 2}" y2="{height / 2}" stroke="#404040"/>'
+        f'<rect x="{x(timing["p25"])}" y="3" width="{max(x(timing["p75"]) - x(timing["p25"]), 1)}" height="{height - 6}" '
+        f'fill="{CHART_PALETTE[4]}" opacity="0.6"/>'
+        f'<line x1="{x(timing["median"])}" y1="1" x2="{x(timing["median"])}" y2="{height - 1}" stroke="#f5f5f5" stroke-width="2"/>'
+        '</svg>'
+    )
+
+@instrumentation.timed
+def create_death_timeline_slide(timeline):
+    """Create slide with first deaths, wipe-causing deaths and when each ability kills."""
+    if not timeline['pulls']:
+        return
+
+    first_rows = ""
+    for row in timeline['first_deaths'][:5]:
+        first_rows += f"""
+            <div class="row bg-muted" style="padding: 6px 10px; margin: 0 0 4px 0; align-items: center;">
+                <div class="text-sm" style="flex: 1; margin: 0;">{escape(row['player'])}</div>
+                <div class="text-sm text-primary" style="font-weight: bold; margin: 0;">{row['first_deaths']}×</div>
+                <div class="text-xs text-muted-foreground" style="width: 44px; text-align: right; margin: 0;">{row['share'] * 100:.0f}%</div>
+            </div>
+            """
+
+    cause_rows = ""
+    for row in timeline['wipe_causes'][:5]:
+        cause_rows += f"""
+            <div class="bg-muted" style="padding: 4px 10px; margin: 0 0 4px 0;">
+                <div class="row" style="justify-content: space-between;">
+                    <span class="text-sm">{escape(row['player'])}</span>
+                    <span class="text-sm text-secondary" style="font-weight: bold;">{row['wipes']}×</span>
+                </div>
+                <div class="text-xs text-muted-foreground">{escape(row['ability'][:30])} - {escape(row['boss'][:22])}</div>
+            </div>
+            """
+
+    timing = timeline['ability_timing'][:6]
+    scale_ms = max((row['p75'] for row in timing), default=0)
+    timing_rows = ""
+    for row in timing:
+        timing_rows += f"""
+            <div class="bg-muted" style="padding: 4px 10px; margin: 0 0 4px 0;">
+                <div class="row" style="justify-content: space-between;">
+                    <span class="text-sm">{escape(row['ability'][:24])}</span>
+                    <span class="text-xs text-muted-foreground">{row['deaths']} deaths</span>
+                </div>
+                <div class="row" style="justify-content: space-between; align-items: center;">
+                    {render_timing_bar_svg(row, scale_ms)}
+                    <span class="text-xs text-muted-foreground">{format_duration(row['median'])}</span>
+                </div>
+            </div>
+            """
+
+    logo_html = get_logo_html()
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+</head>
+<body class="col bg-surface" style="width: 960px; height: 540px; position: relative;">
+    <div style="position: absolute; top: 20px; right: 20px; z-index: 100;">
+        {logo_html}
+    </div>
+    <div style="width: 920px; margin: 0 20px; padding-top: 20px;" class="fit">
+        <h1 class="text-5xl text-primary" style="margin: 0; font-weight: bold;">DEATH TIMELINE</h1>
+    </div>
+
+    <div class="row fill-height" style="margin: 0 32px; gap: 16px; align-items: stretch;">
+        <div style="flex: 1;">
+            <div class="text-xl text-secondary" style="margin: 0 0 8px 0; font-weight: bold;">FIRST TO DIE</div>
+            {first_rows}
+        </div>
+        <div style="flex: 1;">
+            <div class="text-xl text-secondary" style="margin: 0 0 8px 0; font-weight: bold;">WIPE STARTERS</div>
+            {cause_rows}
+        </div>
+        <div style="flex: 1;">
+            <div class="text-xl text-secondary" style="margin: 0 0 8px 0; font-weight: bold;">WHEN THEY HIT</div>
+            {timing_rows}
+        </div>
+    </div>
+
+    <div style="position: absolute; bottom: 20px; left: 20px; right: 20px;">
+        <div class="text-xs text-muted-foreground">
+            {timeline['pulls']} pulls with deaths, {timeline['wipes']} wipes ({timeline['called_wipes']} called) - wipe starter = first death of the cascade that ended the pull - bars show the middle half of death times, tick = median
+        </div>
+    </div>
+</body>
+</html>"""
+
+    with open(os.path.join(config.SLIDES_DIR, 'slide11.html'), 'w') as f:
         f.write(html)
 
+def progression_status(progress):
+    """'Killed' or the best boss health left so far."""
+    if progress['kills']:
+        return 'Killed'
+    if progress['best_percentage'] is None:
+        return '—'
+    return f"{progress['best_percentage']:.1f}%"
+
+@instrumentation.timed
+def create_season_progression_slide(bosses):
+    """Create slide with season-long progression for the most recently pulled bosses."""
+    if not bosses:
+        return
+
+    rows = ""
+    for progress in bosses:
+        curve = progress['curve']
+        status = progression_status(progress)
+        status_color = 'var(--color-primary)' if progress['kills'] else 'var(--color-secondary)'
+        to_kill = f"killed on pull {progress['first_kill_pull']}" if progress['first_kill_pull'] else \
+            f"best on pull {progress['best_pull']}" if progress['best_pull'] else ''
+        sparkline = render_sparkline_svg([(curve['best'], CHART_PALETTE[0]), (curve['trend'], CHART_PALETTE[2])])
+        rows += f"""
+        <div class="row bg-muted" style="padding: 4px 12px; margin: 0 0 4px 0; align-items: center; gap: 12px;">
+            <div style="flex: 1; margin: 0;">
+                <div class="text-base text-secondary" style="font-weight: bold;">{escape(progress['boss'])}</div>
+                <div class="text-xs text-muted-foreground">{progress['difficulty'] or ''} - {progress['pulls']} pulls, {progress['kills']} kills</div>
+            </div>
+            <div style="width: 130px; text-align: right; margin: 0;">
+                <div class="text-lg" style="color: {status_color}; font-weight: bold;">{status}</div>
+                <div class="text-xs text-muted-foreground">{to_kill}</div>
+            </div>
+            <div style="margin: 0;">{render_phase_bars_svg(progress['phase_counts'])}</div>
+            <div style="margin: 0;">{sparkline}</div>
+        </div>
+        """
+
+    logo_html = get_logo_html()
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+</head>
+<body class="col bg-surface" style="width: 960px; height: 540px; position: relative;">
+    <div style="position: absolute; top: 20px; right: 20px; z-index: 100;">
+        {logo_html}
+    </div>
+    <div style="width: 920px; margin: 0 20px; padding-top: 20px;" class="fit">
+        <h1 class="text-5xl text-primary" style="margin: 0; font-weight: bold;">SEASON PROGRESSION</h1>
+    </div>
+    <div style="margin: 8px 32px 0 32px;">
+        {rows}
+    </div>
+    <div style="position: absolute; bottom: 20px; left: 20px; right: 20px;">
+        <div class="text-xs text-muted-foreground">
+            Phase each pull ended in - best boss % so far (green) and {progression.TREND_WINDOW}-pull average wipe % (blue) across the season
+        </div>
+    </div>
+</body>
+</html>"""
+
+    with open(os.path.join(config.SLIDES_DIR, 'slide10.html'), 'w') as f:
+        f.write(html)
+
+@instrumentation.timed
 def create_slideshow():
     """Create an HTML slideshow viewer."""
     import os
     
     # Get list of slides
-    slides = sorted([f for f in os.listdir(config.SLIDES_DIR) if f.startswith('slide') and f.endswith('.html')])
+    slides = [os.path.basename(path) for path in config.slide_files(config.SLIDES_DIR)]
     
-    slide_list = ',\n            '.join([f"'slides/{s}'" for s in slides])
+    slides_url = config.SLIDES_DIR.replace(os.sep, '/')
+    slide_list = ',\n            '.join([f"'{slides_url}/{s}'" for s in slides])
     
     html = f"""<!DOCTYPE html>
 <html>
@@ -563,7 +1366,7 @@ def create_slideshow():
 </head>
 <body>
     <div id="slideContainer">
-        <iframe id="slideFrame" src="slides/{slides[0]}"></iframe>
+        <iframe id="slideFrame" src="{slides_url}/{slides[0]}"></iframe>
     </div>
     
     <div class="slide-counter">
@@ -627,51 +1430,68 @@ def create_slideshow():
 </body>
 </html>"""
     
-    with open('slideshow.html', 'w', encoding='utf-8') as f:
+    with open(config.SLIDESHOW_PATH, 'w', encoding='utf-8') as f:
         f.write(html)
     
-    print("✓ Created slideshow.html")
+    print(f"✓ Created {config.SLIDESHOW_PATH}")
 
 def generate_presentation():
-    """Main function to generate the PowerPoint presentation."""
+    """Main function to generate the PowerPoint presentation.
+
+    Renders for config.TENANT; wrap in config.tenant_context() to render another team.
+    """
     print("Generating PowerPoint presentation...")
+    tenant = config.TENANT
     
     # Get week range
     week_start, week_end = get_week_range()
     
     # Get data from database
-    summary = database.get_weekly_summary(week_start, week_end)
-    boss_stats = database.get_boss_statistics(week_start, week_end)
-    boss_mvps = database.get_boss_mvps(week_start, week_end)
-    difficulty = 'Heroic'
-    dps_top = database.get_top_performers(week_start, week_end, 'dps', 5, difficulty)
-    hps_top = database.get_top_performers(week_start, week_end, 'hps', 5, difficulty)
+    summary = database.get_weekly_summary(week_start, week_end, tenant)
+    boss_stats = database.get_boss_statistics(week_start, week_end, tenant)
+    boss_mvps = database.get_boss_mvps(week_start, week_end, tenant)
+    leaderboards = database.get_leaderboards(week_start, 5, tenant)
+    death_causes = database.get_top_death_causes(week_start, week_end, 10, tenant)
+    perf, pull = load_chart_data(week_start, week_end, tenant)
+    sections = difficulty_sections(boss_stats, boss_mvps, leaderboards, perf, week_start, week_end)
+    progress = progression.load_progression(tenant)
+    timeline = death_analysis.load_death_timeline(week_start, week_end, tenant)
     
     print(f"Summary: {summary}")
     print(f"Boss stats: {len(boss_stats)} bosses")
-    print(f"Top DPS: {len(dps_top)} players")
-    print(f"Top HPS: {len(hps_top)} players")
+    for section in sections:
+        print(f"{section['difficulty']}: top DPS {len(section['dps_top'])} players, "
+              f"top HPS {len(section['hps_top'])} players")
     
     # Create output directory
     os.makedirs(config.OUTPUT_DIR, exist_ok=True)
     
     # Create CSS
     create_shared_css()
+    clear_slides()
     
     # Create slides
     create_title_slide(week_start, week_end)
     create_summary_slide(summary)
-    create_boss_breakdown_slide(boss_stats)
-    create_top_performers_slide(dps_top, hps_top, difficulty)
-    create_boss_mvp_slide(boss_mvps)
-    create_death_causes_slide(week_start, week_end)
+    for section in sections:
+        difficulty, suffix = section['difficulty'], section['suffix']
+        create_boss_breakdown_slide(section['boss_stats'], difficulty, suffix)
+        create_top_performers_slide(section['dps_top'], section['hps_top'], difficulty, suffix)
+        create_boss_mvp_slide(section['boss_mvps'], difficulty, suffix)
+        create_consistency_slide(section['dps_consistent'], section['hps_consistent'], difficulty, suffix)
+    create_death_causes_slide(death_causes)
+    create_distribution_slide(perf)
+    create_progression_slide(pull)
+    create_season_progression_slide(progress)
+    create_death_timeline_slide(timeline)
 
     # create_closing_slide() # closing slide is lame so I'm skipping it for now, can add back later if we want
     
     create_slideshow()
     
     print("HTML slides created successfully!")
-    print("Run the conversion with: NODE_PATH=\"$(npm root -g)\" node convert.js")
+
+    return create_pptx_deck(week_start, week_end, summary, sections, death_causes, progress, timeline)
 
 if __name__ == '__main__':
     generate_presentation()
@@ -0,0 +1,121 @@
+"""Run instrumentation: timing spans and counters, written out as a JSON run report.
+
+Spans aggregate by name (calls, total, max), so wrapping something called
+thousands of times - a store_* row insert, a fight parse - stays cheap:
+
+    with instrumentation.span('stage.fetch'):
+        ...
+
+    @instrumentation.timed          # span named after the function, e.g. database.get_boss_mvps
+    def get_boss_mvps(...):
+
+    instrumentation.count('wcl.requests')
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+import config
+
+CO_COROUTINE = 0x80  # inspect.CO_COROUTINE, without importing inspect at startup
+
+_lock = threading.Lock()
+_spans = {}
+_counters = {}
+_started = time.time()
+
+def reset():
+    """Forget everything recorded so far and restart the run clock."""
+    global _started
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _started = time.time()
+
+def record_span(name, elapsed_ms):
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            _spans[name] = {'calls': 1, 'total_ms': elapsed_ms, 'max_ms': elapsed_ms}
+        else:
+            stats['calls'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+@contextmanager
+def span(name):
+    """Time the enclosed block under `name` (failed blocks are timed too)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, (time.perf_counter() - started) * 1000)
+
+def timed(func):
+    """Decorator: record every call of func as a span named module.function."""
+    name = f'{func.__module__}.{func.__name__}'
+
+    if func.__code__.co_flags & CO_COROUTINE:
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+def count(name, amount=1):
+    """Add to a counter (requests, bytes, cache hits, rows...)."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+def snapshot():
+    """Current spans (slowest total first) and counters."""
+    with _lock:
+        spans = {
+            name: {'calls': s['calls'], 'total_ms': round(s['total_ms'], 3), 'max_ms': round(s['max_ms'], 3),
+                   'mean_ms': round(s['total_ms'] / s['calls'], 3)}
+            for name, s in sorted(_spans.items(), key=lambda item: -item[1]['total_ms'])
+        }
+        return {'spans': spans, 'counters': dict(sorted(_counters.items()))}
+
+def write_run_report(status=0, extra=None, output_dir=None):
+    """Write output/run-report-<timestamp>.json and append a one-line summary to run-history.jsonl.
+
+    Returns the report path.
+    """
+    output_dir = output_dir or config.OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    finished = time.time()
+    report = {
+        'started_at': datetime.fromtimestamp(_started).isoformat(timespec='seconds'),
+        'finished_at': datetime.fromtimestamp(finished).isoformat(timespec='seconds'),
+        'duration_ms': round((finished - _started) * 1000, 1),
+        'status': status,
+        **(extra or {}),
+        **snapshot(),
+    }
+
+    path = os.path.join(output_dir, f"run-report-{datetime.fromtimestamp(_started):%Y-%m-%d-%H%M%S}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    # Stage totals only, one line per run, for trending runtime over the season
+    history = {
+        'started_at': report['started_at'],
+        'duration_ms': report['duration_ms'],
+        'status': status,
+        'stages': {name: s['total_ms'] for name, s in report['spans'].items() if name.startswith('stage.')},
+        'counters': report['counters'],
+    }
+    with open(os.path.join(output_dir, 'run-history.jsonl'), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(history) + '\n')
+
+    return path
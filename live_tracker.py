@@ -0,0 +1,226 @@
+"""Follow tonight's live-logged report, ingesting each pull as it lands.
+
+Every pull is stored as soon as WarcraftLogs has it (database.store_pull), so
+the bot's /player, /boss and /top answer from live data, and a short summary
+(kill or wipe %, deaths, top parses) goes to the Discord channel:
+
+    python live_tracker.py                 # find the live report and follow it until the raid ends
+    python live_tracker.py --report CODE   # follow one report
+    python live_tracker.py --once          # one poll, then exit (cron / debugging)
+    python live_tracker.py --dry-run       # print summaries instead of posting them
+
+A poll asks for the next LIVE_FIGHT_WINDOW fight IDs after the last one seen,
+so it costs one small request whether it's the first pull of the night or the
+three hundredth. New pulls add one fight-details request each. When the report
+hasn't grown for LIVE_IDLE_MINUTES the raid is over: the week's leaderboards
+(/top) are rebuilt once, and the tracker goes back to looking for a new one.
+"""
+import argparse
+import sys
+import time
+import config
+import database
+import discord_bot
+import fetch_data
+import instrumentation
+import progression
+from generate_pptx import format_duration, short_number
+
+LOOKBACK_HOURS = 12  # how far back a report can have started and still be tonight's
+DISCOVERY_SECONDS = 120  # between report-list checks while no raid is live
+
+def top_damage(fight, fight_details, limit=3):
+    """(name, dps) of the top damage dealers in a pull, from the damage table (works for wipes)."""
+    duration = max((fight['endTime'] - fight['startTime']) / 1000, 1)
+    table = fight_details.get('table') or {}
+    entries = table.get('data', {}).get('entries', []) if isinstance(table, dict) else []
+    players = [entry for entry in entries if entry.get('type') not in ('NPC', 'Boss', 'Pet')]
+    players.sort(key=lambda entry: -entry.get('total', 0))
+    return [(entry.get('name', 'Unknown'), entry.get('total', 0) / duration) for entry in players[:limit]]
+
+def format_pull_summary(fight, pull_number, parsed_data, fight_details, max_deaths=3):
+    """Compact Discord message for one pull."""
+    boss = f"**{fight['name']}** ({fetch_data.DIFFICULTY_MAP.get(fight.get('difficulty'), 'Unknown')})"
+    duration = format_duration(fight['endTime'] - fight['startTime'])
+    if fight.get('kill'):
+        lines = [f"✅ {boss} pull {pull_number} - **KILL** in {duration}"]
+    else:
+        boss_hp = fight.get('fightPercentage')
+        at = f" at {boss_hp:.1f}%" if boss_hp is not None else ''
+        lines = [f"⚔️ {boss} pull {pull_number} - wipe{at} after {duration}"]
+
+    deaths = sorted(parsed_data['deaths'], key=lambda death: death['timestamp'])
+    if deaths:
+        shown = ', '.join(f"{death['player_name']} ({death['ability_name']})" for death in deaths[:max_deaths])
+        more = f" +{len(deaths) - max_deaths} more" if len(deaths) > max_deaths else ''
+        lines.append(f"💀 {len(deaths)} death(s): {shown}{more}")
+    else:
+        lines.append("💀 No deaths")
+
+    ranked = sorted((row for row in parsed_data['players'] if row.get('percentile') is not None),
+                    key=lambda row: -row['percentile'])[:3]
+    if ranked:
+        lines.append("🏆 Top parses: " + ', '.join(f"{row['player_name']} {row['percentile']:.0f}" for row in ranked))
+    else:
+        damage = top_damage(fight, fight_details)
+        if damage:
+            lines.append("🏆 Top DPS: " + ', '.join(f"{name} {short_number(dps)}" for name, dps in damage))
+    return '\n'.join(lines)
+
+class LiveTracker:
+    """Polls one tenant's live report and ingests its pulls in order."""
+
+    def __init__(self, api=None, tenant=None, post=None, window=fetch_data.LIVE_FIGHT_WINDOW):
+        self.api = api or fetch_data.WarcraftLogsAPI()
+        self.tenant = tenant or config.default_tenant()
+        self.post = post or discord_bot.send_channel_message
+        self.window = window
+        self.started_at = int(self.api.now().timestamp() * 1000)
+        self.detach()
+
+    def detach(self):
+        """Forget the current report (the raid ended), rebuilding leaderboards if it added pulls."""
+        if getattr(self, 'pulls_stored', 0):
+            database.refresh_leaderboards([self.report['code']])
+        self.pulls_stored = 0
+        self.report = None
+        self.last_fight_id = 0
+        self.last_activity = None
+        self.actor_map, self.ability_map = {}, {}
+        self.pull_counts = {}
+
+    def attach(self, report):
+        """Start following a report from its first fight.
+
+        Pulls that ended before the tracker started are ingested but not posted,
+        so restarting mid-raid catches the database up without spamming the channel.
+        """
+        self.detach()
+        self.report = dict(report)
+        self.last_activity = time.monotonic()
+        self.actor_map, self.ability_map = self.api.get_actor_mappings(report['code'])
+        print(f"✓ Following {report['title']} ({report['code']})")
+
+    def find_live_report(self):
+        """The guild's most recently started report that is still growing, or None."""
+        now = int(self.api.now().timestamp() * 1000)
+        reports, _ = self.api.get_guild_report_page(now - LOOKBACK_HOURS * 3600 * 1000, now, 1,
+                                                    self.tenant['zone_id'], self.tenant, limit=5)
+        idle_ms = config.LIVE_IDLE_MINUTES * 60 * 1000
+        live = [report for report in reports if report['endTime'] >= now - idle_ms]
+        return max(live, key=lambda report: report['startTime']) if live else None
+
+    def poll(self):
+        """Fetch and ingest every fight logged since the last poll. Returns the pulls processed."""
+        pulls = 0
+        with instrumentation.span('live.poll'):
+            while True:
+                instrumentation.count('live.polls')
+                report, fights = self.api.get_fights_after(self.report['code'], self.last_fight_id, self.window)
+                if report.get('endTime', 0) > self.report['endTime']:
+                    self.report.update(report)
+                    self.last_activity = time.monotonic()
+
+                for fight in fights:
+                    # trash has encounterID 0; a failed pull leaves the cursor on it for the next poll
+                    if fight.get('encounterID') != 0 and fetch_data.select_fights({'fights': [fight]}, self.tenant):
+                        self.process_pull(fight)
+                        pulls += 1
+                    self.last_fight_id = fight['id']
+
+                if len(fights) < self.window:  # a full window may have more behind it
+                    return pulls
+
+    def process_pull(self, fight):
+        """Ingest one boss pull and post its summary."""
+        code = self.report['code']
+        fight_details = self.api.get_fight_details(code, fight['id'])
+        if not fight_details:
+            raise Exception(f"No details for fight {fight['id']} yet")
+
+        # Someone who joined mid-raid isn't in the actor list fetched at attach time
+        death_ids = {death.get('targetID') for death in fight_details.get('deaths', {}).get('data', [])}
+        if death_ids - self.actor_map.keys():
+            self.actor_map, self.ability_map = self.api.get_actor_mappings(code)
+
+        parsed_data = fetch_data.new_parsed_data()
+        parsed_data['raids'].append(fetch_data.new_raid_data(self.report, self.tenant))
+        fetch_data.parse_fight(self.report, fight, fight_details, self.actor_map, self.ability_map, parsed_data)
+        database.store_pull(parsed_data)
+        progression.update_progression([code])
+        self.pulls_stored += 1
+        instrumentation.count('live.pulls')
+
+        key = (fight['name'], fight.get('difficulty'))
+        self.pull_counts[key] = self.pull_counts.get(key, 0) + 1
+        if self.report['startTime'] + fight['endTime'] < self.started_at:
+            return  # catching up on a pull from before we started
+
+        summary = format_pull_summary(fight, self.pull_counts[key], parsed_data, fight_details)
+        print(summary)
+        self.post(summary)
+
+    def run(self, once=False):
+        """Follow live reports until interrupted (or for a single poll with once=True)."""
+        next_discovery = 0
+        while True:
+            if self.report is None and time.monotonic() >= next_discovery:
+                report = self.find_live_report()
+                next_discovery = time.monotonic() + DISCOVERY_SECONDS
+                if report:
+                    self.attach(report)
+                elif once:
+                    print("No live report found.")
+
+            if self.report is not None:
+                try:
+                    self.poll()
+                except Exception as e:
+                    print(f"✗ Poll failed, retrying next interval: {e}")
+                if time.monotonic() - self.last_activity > config.LIVE_IDLE_MINUTES * 60:
+                    print(f"✓ {self.report['title']} has been idle for {config.LIVE_IDLE_MINUTES} minutes - raid over")
+                    self.detach()
+
+            if once:
+                if self.report is not None:
+                    self.detach()  # this process won't see the raid end
+                return
+            time.sleep(config.LIVE_POLL_SECONDS)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ingest and announce pulls from a live-logged raid.')
+    parser.add_argument('--tenant', help='tenant key from TENANTS_FILE (defaults to the first)')
+    parser.add_argument('--report', help='follow this report code instead of looking for the live one')
+    parser.add_argument('--once', action='store_true', help='poll once and exit')
+    parser.add_argument('--dry-run', action='store_true', help="print pull summaries but don't post them")
+    args = parser.parse_args(argv)
+
+    config.validate_config()
+    database.init_database()
+
+    tenant = config.find_tenant(args.tenant)
+    if tenant is None:
+        print(f"✗ Unknown tenant '{args.tenant}'")
+        return 1
+
+    post = discord_bot.send_channel_message
+    if args.dry_run or not (config.DISCORD_BOT_TOKEN and config.DISCORD_CHANNEL_ID):
+        if not args.dry_run:
+            print("Discord configuration missing - summaries will only be printed.")
+        post = lambda summary: True
+
+    tracker = LiveTracker(tenant=tenant, post=post)
+    if args.report:
+        # Title, start and end time are filled in by the first poll
+        tracker.attach({'code': args.report, 'title': args.report, 'startTime': 0, 'endTime': 0})
+
+    try:
+        tracker.run(once=args.once)
+    except KeyboardInterrupt:
+        if tracker.report is not None:
+            tracker.detach()
+        print("\nStopped.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,8 @@
 """Main orchestration script for WoW raid stats automation."""
+import argparse
 import sys
 import config
-import database
-import fetch_data
-import generate_pptx
+import instrumentation
 
 
 def apply_inline_css():
@@ -123,16 +122,27 @@ body {
     print("✓ Applied CSS styling and Wowhead tooltips to slides")
 
 
-def main():
-    """Main execution flow."""
+def tenant_label(tenant):
+    """Human-readable label for log lines."""
+    return tenant['key'] or tenant['guild_name']
+
+
+def run_pipeline(render_only=False):
+    """Fetch, store and render for every tenant. Returns the exit status.
+
+    Modules are imported by the stage that needs them, so --render-only never
+    loads the WarcraftLogs client and its HTTP stack.
+    """
     print("=" * 60)
     print("WoW Raid Stats PowerPoint Generator")
     print("=" * 60)
     
     # Validate configuration
     try:
-        config.validate_config()
-        print("✓ Configuration validated")
+        config.validate_config(require_credentials=not render_only)
+        tenants = config.load_tenants()
+        instrumentation.count('tenants', len(tenants))
+        print(f"✓ Configuration validated ({len(tenants)} team(s))")
     except ValueError as e:
         print(f"✗ Configuration error: {e}")
         print("\nPlease create a .env file with required variables.")
@@ -141,101 +151,107 @@ def main():
     
     # Initialize database
     print("\nInitializing database...")
+    import database
     database.init_database()
     print("✓ Database ready")
     
-    # Fetch raid data
-    print("\nFetching raid data from WarcraftLogs...")
-    try:
-        data = fetch_data.fetch_weekly_data()
-        print(f"✓ Fetched {len(data['raids'])} raids")
-        print(f"✓ Fetched {len(data['encounters'])} encounters")
-        print(f"✓ Fetched {len(data['players'])} player records")
-    except Exception as e:
-        print(f"✗ Error fetching data: {e}")
-        return 1
-    
-    # Store data in database
-    print("\nStoring data in database...")
-    try:
-        import sqlite3
-        conn = sqlite3.connect(config.DATABASE_PATH)
-        cursor = conn.cursor()
+    if render_only:
+        print("\nSkipping fetch and store (--render-only) - rendering what's already in the database")
+    else:
+        # Fetch raid data - one client (token + connection pool) shared by every tenant
+        print("\nFetching raid data from WarcraftLogs...")
+        from concurrent.futures import ThreadPoolExecutor
+        import fetch_data
+        try:
+            with instrumentation.span('stage.fetch'):
+                api = fetch_data.WarcraftLogsAPI()
+                api.ensure_token()
+                with ThreadPoolExecutor(max_workers=len(tenants)) as pool:
+                    results = list(pool.map(lambda tenant: fetch_data.fetch_weekly_data(api, tenant), tenants))
+            for tenant, data in zip(tenants, results):
+                print(f"✓ [{tenant_label(tenant)}] Fetched {len(data['raids'])} raids, "
+                      f"{len(data['encounters'])} encounters, {len(data['players'])} player records")
+        except Exception as e:
+            print(f"✗ Error fetching data: {e}")
+            return 1
         
-        # Delete existing data for these raid_ids to prevent duplicates
-        raid_ids = [raid['raid_id'] for raid in data['raids']]
-        if raid_ids:
-            placeholders = ','.join('?' * len(raid_ids))
-            print(f"  Cleaning existing data for {len(raid_ids)} raid(s)...")
-            
-            cursor.execute(f'DELETE FROM deaths WHERE raid_id IN ({placeholders})', raid_ids)
-            cursor.execute(f'DELETE FROM player_performance WHERE raid_id IN ({placeholders})', raid_ids)
-            cursor.execute(f'DELETE FROM encounters WHERE raid_id IN ({placeholders})', raid_ids)
-            cursor.execute(f'DELETE FROM raids WHERE raid_id IN ({placeholders})', raid_ids)
+        # Store data in database - sequentially, SQLite has a single writer
+        print("\nStoring data in database...")
+        import progression
+        try:
+            for tenant, data in zip(tenants, results):
+                with instrumentation.span('stage.store'):
+                    database.store_parsed_data(data)
+                    progression.update_progression([raid['raid_id'] for raid in data['raids']])
+                print(f"✓ [{tenant_label(tenant)}] Data stored successfully")
+                print(f"  - {len(data['raids'])} raids")
+                print(f"  - {len(data['encounters'])} encounters")
+                print(f"  - {len(data['players'])} player records")
+                print(f"  - {len(data['deaths'])} death events")
+        except Exception as e:
+            print(f"✗ Error storing data: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+    
+    # Generate PowerPoint - one slide set per tenant
+    print("\nGenerating PowerPoint presentation...")
+    import generate_pptx
+    for tenant in tenants:
+        with config.tenant_context(tenant):
+            try:
+                with instrumentation.span('stage.render'):
+                    generate_pptx.generate_presentation()
+                print(f"✓ [{tenant_label(tenant)}] PowerPoint generated")
+            except Exception as e:
+                print(f"✗ Error generating presentation: {e}")
+                import traceback
+                traceback.print_exc()
+                return 1
             
-            conn.commit()
-        
-        conn.close()
-        
-        # Store raids first
-        for raid in data['raids']:
-            database.store_raid(raid)
-        
-        # Store encounters and create encounter_id map
-        encounter_map = {}  # (raid_id, boss_name, fight_id) -> encounter_id
-        for encounter in data['encounters']:
-            encounter_id = database.store_encounter(encounter)
-            key = (encounter['raid_id'], encounter['boss_name'], encounter.get('fight_id'))
-            encounter_map[key] = encounter_id
-        
-        # Store player performance with encounter_id
-        for player in data['players']:
-            key = (player['raid_id'], player['boss_name'], player.get('fight_id'))
-            player['encounter_id'] = encounter_map.get(key)
-            database.store_player_performance(player)
-        
-        # Store deaths
-        print(f"  Storing {len(data['deaths'])} deaths...")
-        for death in data['deaths']:
+            with instrumentation.span('stage.inline_css'):
+                apply_inline_css()
+
+            # Images are for Discord and gh-pages previews - a failure here shouldn't fail the run
+            import rasterise
             try:
-                database.store_death(death)
+                with instrumentation.span('stage.rasterise'):
+                    rasterise.rasterise_slides()
             except Exception as e:
-                print(f"    Error storing death: {e}")
-                print(f"    Death data: {death}")
-                break  # Stop after first error to see it
-        
-        print("✓ Data stored successfully")
-        print(f"  - {len(data['raids'])} raids")
-        print(f"  - {len(data['encounters'])} encounters")
-        print(f"  - {len(data['players'])} player records")
-        print(f"  - {len(data['deaths'])} death events")
-    except Exception as e:
-        print(f"✗ Error storing data: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-    
-    # Generate PowerPoint
-    print("\nGenerating PowerPoint presentation...")
-    try:
-        generate_pptx.generate_presentation()
-        print("✓ PowerPoint generation prepared")
-    except Exception as e:
-        print(f"✗ Error generating presentation: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-    
-    apply_inline_css()
+                print(f"✗ [{tenant_label(tenant)}] Could not render slide images: {e}")
 
     print("\n" + "=" * 60)
     print("Next steps:")
     print("1. View slides: explorer slides")
-    print("2. Convert to PowerPoint (when ready)")
+    print(f"2. Share the deck: {config.OUTPUT_DIR}/*.pptx")
     print("=" * 60)
     
     return 0
 
+def main(argv=None):
+    """Main execution flow; always leaves a JSON run report in OUTPUT_DIR."""
+    parser = argparse.ArgumentParser(description='Fetch raid data and generate the weekly stats deck.')
+    parser.add_argument('--profile', action='store_true',
+                        help='sample the run and write a hotspot report + collapsed stacks to OUTPUT_DIR')
+    parser.add_argument('--render-only', action='store_true',
+                        help="skip the WarcraftLogs fetch and re-render from the existing database")
+    args = parser.parse_args(argv)
+
+    instrumentation.reset()
+    status = 1
+    try:
+        if args.profile:
+            import profiling  # only loaded on request, so normal runs pay nothing
+            status = profiling.profile_call(lambda: run_pipeline(args.render_only))
+        else:
+            status = run_pipeline(args.render_only)
+        return status
+    finally:
+        report_path = instrumentation.write_run_report(status, {
+            'wcl_mode': config.WCL_MODE,
+            'render_only': args.render_only,
+        })
+        print(f"Run report: {report_path}")
+
 if __name__ == '__main__':
-    import sys
     sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Season boss progression: best pull so far, pulls to kill, phases reached and wipe trends.
+
+Each boss/difficulty a tenant has pulled has a boss_progression row. That row
+is the fold of every pull so far, in order. After an ingest, update_progression
+folds in just the new (not yet numbered) pulls and numbers them
+(encounters.pull_number). If a stored pull is older than the last one folded
+in - the weekly re-fetch replaces the whole week - it replays that one boss
+from its first pull instead.
+"""
+import numpy as np
+import analytics
+import database
+import instrumentation
+
+TREND_WINDOW = 5  # wipes in the rolling wipe-percentage average
+
+def new_progress(boss, difficulty):
+    return {
+        'boss': boss,
+        'difficulty': difficulty,
+        'pulls': 0,
+        'kills': 0,
+        'best_percentage': None,
+        'best_pull': None,
+        'first_kill_pull': None,
+        'first_kill_time': None,
+        'phase_counts': {},
+        'last_pull_end': None,
+    }
+
+def fold_pull(progress, pull_end, is_kill, fight_percentage, last_phase):
+    """Advance progress by one pull; returns the pull's season number."""
+    progress['pulls'] += 1
+    number = progress['pulls']
+    boss_left = 0.0 if is_kill else fight_percentage
+
+    if boss_left is not None and (progress['best_percentage'] is None or boss_left < progress['best_percentage']):
+        progress['best_percentage'] = boss_left
+        progress['best_pull'] = number
+    if is_kill:
+        progress['kills'] += 1
+        if progress['first_kill_pull'] is None:
+            progress['first_kill_pull'] = number
+            progress['first_kill_time'] = pull_end
+    if last_phase is not None:
+        progress['phase_counts'][last_phase] = progress['phase_counts'].get(last_phase, 0) + 1
+    progress['last_pull_end'] = pull_end
+    return number
+
+def fold_pulls(progress, pulls):
+    """Fold get_progression_pulls rows into progress; returns encounter id -> season pull number."""
+    pull_numbers = {}
+    for encounter_id, pull_end, is_kill, fight_percentage, last_phase, _ in pulls:
+        pull_numbers[encounter_id] = fold_pull(progress, pull_end, bool(is_kill), fight_percentage, last_phase)
+    instrumentation.count('progression.pulls_folded', len(pull_numbers))
+    return pull_numbers
+
+@instrumentation.timed
+def update_progression(raid_ids):
+    """Fold the pulls of freshly stored raids into boss_progression. Returns the bosses updated."""
+    stored = {}
+    updated = 0
+    for tenant, boss, difficulty, earliest_end in database.get_progression_groups(raid_ids):
+        if tenant not in stored:
+            stored[tenant] = {(p['boss'], p['difficulty']): p for p in database.get_boss_progression(tenant)}
+        progress = stored[tenant].get((boss, difficulty))
+
+        if progress is None or progress['last_pull_end'] is None or earliest_end <= progress['last_pull_end']:
+            # New boss, or pulls we've already counted were re-stored - replay this boss from the start
+            progress = new_progress(boss, difficulty)
+            pulls = database.get_progression_pulls(tenant, boss, difficulty)
+            instrumentation.count('progression.rebuilds')
+        else:
+            pulls = database.get_progression_pulls(tenant, boss, difficulty, after=progress['last_pull_end'])
+
+        pull_numbers = fold_pulls(progress, pulls)
+        database.save_boss_progression(tenant, progress, pull_numbers)
+        updated += 1
+    return updated
+
+def pull_curve(pulls):
+    """Season curve arrays for one boss from get_progression_pulls rows.
+
+    boss_pct is the health left per pull (0 on kills), best the best-so-far line,
+    and trend the mean of the last TREND_WINDOW wipe percentages (NaN on kills).
+    """
+    is_kill = np.array([bool(row[2]) for row in pulls], dtype=bool)
+    boss_pct = np.array([0.0 if kill else (np.nan if row[3] is None else row[3])
+                         for row, kill in zip(pulls, is_kill)], dtype=float)
+    best = np.fmin.accumulate(boss_pct) if boss_pct.size else boss_pct
+    wipe_pct = np.where(is_kill, np.nan, boss_pct)
+    return {
+        'pull': np.arange(1, len(pulls) + 1),
+        'is_kill': is_kill,
+        'boss_pct': boss_pct,
+        'best': best,
+        'trend': analytics.rolling_mean(np.zeros(len(pulls), dtype=np.int64), wipe_pct, TREND_WINDOW),
+    }
+
+@instrumentation.timed
+def load_progression(tenant=None, limit=8):
+    """The tenant's most recently pulled bosses with their stored progression and season curves."""
+    bosses = database.get_boss_progression(tenant)[:limit]
+    for progress in bosses:
+        progress['curve'] = pull_curve(database.get_progression_pulls(tenant, progress['boss'], progress['difficulty']))
+    return bosses
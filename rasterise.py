@@ -0,0 +1,118 @@
+"""Render the HTML slides to images for Discord and gh-pages.
+
+Each slides/slideN.html is screenshotted by a locally installed headless
+Chrome/Chromium (CHROME_PATH, or the first of BROWSERS found on PATH), so it
+runs offline and needs no Python browser bindings. Slides render in parallel,
+one browser process each. Written next to the slides so they deploy with them:
+
+    slideN.png          full-size 960x540 screenshot (discord_bot.py publish posts the key ones)
+    slideN.thumb.webp   THUMB_WIDTH-wide thumbnail
+    contact-sheet.png   every slide in a SHEET_COLUMNS-wide grid
+
+Thumbnails and the contact sheet need Pillow. Slides whose PNG is newer than
+their HTML aren't rendered again.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import config
+
+BROWSERS = ['chromium', 'chromium-browser', 'google-chrome', 'google-chrome-stable', 'chrome', 'msedge']
+SLIDE_SIZE = (960, 540)
+THUMB_WIDTH = 320
+SHEET_COLUMNS = 3
+SHEET_GAP = 8
+RENDER_TIMEOUT = 60  # seconds per slide
+
+def find_browser():
+    """Path of the headless-capable browser to use, or None."""
+    if config.CHROME_PATH:
+        return config.CHROME_PATH
+    return next((path for path in map(shutil.which, BROWSERS) if path), None)
+
+def render_slide(browser, html_path, png_path):
+    """Screenshot one slide at SLIDE_SIZE. Raises if the browser produced nothing."""
+    width, height = SLIDE_SIZE
+    with tempfile.TemporaryDirectory(prefix='rasterise-') as profile_dir:  # parallel browsers can't share a profile
+        command = [
+            browser, '--headless=new', '--disable-gpu', '--hide-scrollbars', '--mute-audio',
+            '--force-device-scale-factor=1', f'--window-size={width},{height}',
+            f'--user-data-dir={profile_dir}', f'--screenshot={os.path.abspath(png_path)}',
+            'file://' + os.path.abspath(html_path),
+        ]
+        if hasattr(os, 'geteuid') and os.geteuid() == 0:
+            command.insert(1, '--no-sandbox')  # Chrome refuses to sandbox as root (containers)
+        subprocess.run(command, capture_output=True, timeout=RENDER_TIMEOUT)
+
+    if not os.path.exists(png_path) or os.path.getmtime(png_path) < os.path.getmtime(html_path):
+        raise Exception(f"{browser} did not render {os.path.basename(html_path)}")
+    return png_path
+
+def make_thumbnail(png_path):
+    """Write slideN.thumb.webp next to the PNG."""
+    from PIL import Image
+    thumb_path = png_path[:-len('.png')] + '.thumb.webp'
+    with Image.open(png_path) as image:
+        height = round(image.height * THUMB_WIDTH / image.width)
+        image.convert('RGB').resize((THUMB_WIDTH, height), Image.LANCZOS).save(thumb_path, 'WEBP', quality=80)
+    return thumb_path
+
+def make_contact_sheet(png_paths, sheet_path, scale=0.5):
+    """Tile the slides into one image, SHEET_COLUMNS across."""
+    from PIL import Image
+    width, height = (round(size * scale) for size in SLIDE_SIZE)
+    rows = -(-len(png_paths) // SHEET_COLUMNS)
+    columns = min(len(png_paths), SHEET_COLUMNS)
+    sheet = Image.new('RGB', (columns * (width + SHEET_GAP) + SHEET_GAP, rows * (height + SHEET_GAP) + SHEET_GAP),
+                      '#1a1a1a')
+    for i, path in enumerate(png_paths):
+        with Image.open(path) as image:
+            tile = image.convert('RGB').resize((width, height), Image.LANCZOS)
+        row, column = divmod(i, SHEET_COLUMNS)
+        sheet.paste(tile, (SHEET_GAP + column * (width + SHEET_GAP), SHEET_GAP + row * (height + SHEET_GAP)))
+    sheet.save(sheet_path, optimize=True)
+    return sheet_path
+
+def rasterise_slides(slides_dir=None, workers=None):
+    """Render every slide in slides_dir (default SLIDES_DIR). Returns the PNG paths, [] if no browser."""
+    slides_dir = slides_dir or config.SLIDES_DIR
+    browser = find_browser()
+    if not browser:
+        print("  No headless Chrome/Chromium found (set CHROME_PATH) - skipping slide images")
+        return []
+
+    html_paths = config.slide_files(slides_dir)
+    png_paths = [path[:-len('.html')] + '.png' for path in html_paths]
+    stale = [(html, png) for html, png in zip(html_paths, png_paths)
+             if not os.path.exists(png) or os.path.getmtime(png) < os.path.getmtime(html)]
+
+    failed = set()
+    if stale:
+        with ThreadPoolExecutor(max_workers=workers or min(len(stale), os.cpu_count() or 1, 4)) as pool:
+            futures = {png: pool.submit(render_slide, browser, html, png) for html, png in stale}
+            for png, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"  ✗ {e}")
+                    failed.add(png)
+
+    rendered = [png for png in png_paths if png not in failed and os.path.exists(png)]
+    if not rendered:
+        return []
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers or min(len(rendered), os.cpu_count() or 1)) as pool:
+            list(pool.map(make_thumbnail, rendered))
+        make_contact_sheet(rendered, os.path.join(slides_dir, 'contact-sheet.png'))
+    except ImportError:
+        print("  Pillow not installed - skipping thumbnails and contact sheet")
+
+    print(f"✓ Rendered {len(stale) - len(failed)} of {len(html_paths)} slide image(s) in {slides_dir}")
+    return rendered
+
+if __name__ == '__main__':
+    sys.exit(0 if rasterise_slides(sys.argv[1] if len(sys.argv) > 1 else None) else 1)
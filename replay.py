@@ -0,0 +1,95 @@
+"""Record/replay of WarcraftLogs GraphQL responses for offline runs and benchmarks.
+
+In record mode every live response is written to the fixtures directory; in
+replay mode responses are served from disk with optional injected latency and
+errors, so the fetch pipeline runs deterministically with no network:
+
+    WCL_MODE=record python fetch_data.py   # once, with real credentials
+    WCL_MODE=replay python fetch_data.py   # any time after, offline
+
+The recording's wall-clock time is saved in manifest.json and replayed as the
+client's "now", so week windows (and therefore request variables) line up.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+import config
+
+MODES = ('live', 'record', 'replay')
+
+def fixture_key(query, variables):
+    """Stable key for a request: whitespace-normalised query plus sorted variables."""
+    normalised = ' '.join(query.split())
+    payload = json.dumps({'query': normalised, 'variables': variables or {}}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+class FixtureStore:
+    """Directory of recorded responses, one JSON file per distinct request."""
+
+    def __init__(self, fixtures_dir=None, mode='replay', latency_ms=None, error_rate=None, seed=None, recorded_at=None):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"FixtureStore mode must be 'record' or 'replay', not '{mode}'")
+        self.fixtures_dir = fixtures_dir or config.WCL_FIXTURES_DIR
+        self.mode = mode
+        self.latency_ms = config.WCL_REPLAY_LATENCY_MS if latency_ms is None else latency_ms
+        self.error_rate = config.WCL_REPLAY_ERROR_RATE if error_rate is None else error_rate
+        self._random = random.Random(config.WCL_REPLAY_SEED if seed is None else seed)
+        self._lock = threading.Lock()
+        self.manifest_path = os.path.join(self.fixtures_dir, 'manifest.json')
+
+        if mode == 'record':
+            os.makedirs(self.fixtures_dir, exist_ok=True)
+            self.recorded_at = recorded_at or time.time()
+            with open(self.manifest_path, 'w', encoding='utf-8') as f:
+                json.dump({'recorded_at': self.recorded_at}, f)
+        else:
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self.recorded_at = json.load(f)['recorded_at']
+            except (OSError, ValueError, KeyError):
+                raise Exception(f"No fixture recording found in {self.fixtures_dir} - run once with WCL_MODE=record")
+
+    def now(self):
+        """The recording's clock, so time-windowed requests match what was recorded."""
+        return datetime.fromtimestamp(self.recorded_at)
+
+    def path_for(self, query, variables):
+        return os.path.join(self.fixtures_dir, f'{fixture_key(query, variables)}.json')
+
+    def record(self, query, variables, data):
+        """Save one live response."""
+        path = self.path_for(query, variables)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'query': ' '.join(query.split()), 'variables': variables or {}, 'data': data}, f)
+        os.replace(tmp_path, path)
+
+    def next_delay(self):
+        """Seconds of injected latency for the next replayed request."""
+        return self.latency_ms / 1000
+
+    def replay(self, query, variables):
+        """Load a recorded response, raising like a failed live request if injected to."""
+        with self._lock:
+            fail = self.error_rate and self._random.random() < self.error_rate
+        if fail:
+            raise Exception("GraphQL query failed: injected replay error")
+
+        path = self.path_for(query, variables)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)['data']
+        except OSError:
+            raise Exception(f"GraphQL query failed: no recorded response for {os.path.basename(path)}")
+
+def fixture_store_for(mode):
+    """FixtureStore for record/replay modes, None for live."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown WCL_MODE '{mode}', expected one of: {', '.join(MODES)}")
+    if mode == 'live':
+        return None
+    return FixtureStore(mode=mode)
@@ -0,0 +1,109 @@
+"""In-memory cache of the current raid week's aggregates, for the Discord bot.
+
+The whole week is loaded from the database once, on async_db's read pool, and
+served from memory until the database file changes (main.py or the live
+tracker finished an ingest) or a new raid week starts. Checking for changes
+is a single os.stat, so a cached reply never touches SQLite.
+"""
+import asyncio
+import os
+import sqlite3
+import time
+import async_db
+import config
+import database
+
+TOP_LIMIT = 10
+
+def load_week_stats(tenant=None, now=None):
+    """Query every aggregate the bot serves for the current raid week (blocking)."""
+    week_start, week_end = database.current_week_range(now)
+    samples = database.get_performance_samples(week_start, week_end, tenant)
+
+    players = {}
+    for _, _, boss, difficulty, name, player_class, spec, role, dps, hps, percentile in samples:
+        player = players.setdefault(name.lower(), {
+            'name': name, 'class': player_class, 'spec': spec, 'role': role, 'bosses': {}, 'deaths': 0,
+        })
+        best = player['bosses'].setdefault((boss, difficulty), {'pulls': 0, 'dps': 0, 'hps': 0, 'percentile': None})
+        best['pulls'] += 1
+        best['dps'] = max(best['dps'], dps or 0)
+        best['hps'] = max(best['hps'], hps or 0)
+        if percentile is not None:
+            best['percentile'] = max(best['percentile'] or 0, percentile)
+
+    for row in database.get_player_death_count(week_start, week_end, tenant):
+        player = players.get(row['player'].lower())
+        if player:
+            player['deaths'] = row['deaths']
+
+    mvps = {}
+    for mvp in database.get_boss_mvps(week_start, week_end, tenant):
+        mvps.setdefault((mvp['boss_name'], mvp['difficulty']), []).append(mvp)
+
+    return {
+        'week_start': week_start,
+        'loaded_at': time.time(),
+        'summary': database.get_weekly_summary(week_start, week_end, tenant),
+        'bosses': database.get_boss_statistics(week_start, week_end, tenant),
+        'mvps': mvps,
+        'top': database.get_leaderboards(week_start, TOP_LIMIT, tenant),
+        'death_causes': database.get_top_death_causes(week_start, week_end, TOP_LIMIT, tenant),
+        'players': players,
+    }
+
+class StatsCache:
+    """The current week's stats for one tenant, reloaded on the read pool when stale."""
+
+    def __init__(self, tenant=None, loader=None, db=None):
+        self.tenant = tenant
+        self.db = db or async_db.AsyncDatabase()
+        self.loader = loader or (lambda: self.db.call(load_week_stats, tenant))
+        self._stats = None
+        self._key = None
+        self._lock = asyncio.Lock()
+
+    def current_key(self):
+        """(raid week, database mtime) - changes when a new week starts or an ingest commits."""
+        try:
+            db_mtime = os.stat(config.DATABASE_PATH).st_mtime_ns
+        except OSError:
+            db_mtime = None
+        return database.current_week_range()[0], db_mtime
+
+    def invalidate(self):
+        """Force a reload on the next request (call after an in-process ingest)."""
+        self._key = None
+
+    async def get(self):
+        """The cached stats, reloading first if the database or week changed.
+
+        If a reload fails or times out (say, mid-ingest) the previous week's copy
+        is served until the next change; with nothing cached the error propagates.
+        """
+        key = self.current_key()
+        if key != self._key:
+            async with self._lock:
+                if key != self._key:  # another request may have reloaded while we waited
+                    try:
+                        self._stats = await self.loader()
+                        self._key = key
+                    except (asyncio.TimeoutError, sqlite3.Error) as e:
+                        if self._stats is None:
+                            raise
+                        print(f"✗ Stats reload failed, serving cached copy: {e!r}")
+        return self._stats
+
+def find_player(stats, name):
+    """Exact (case-insensitive) match first, then a unique prefix."""
+    players = stats['players']
+    name = name.strip().lower()
+    if name in players:
+        return players[name]
+    matches = [player for key, player in players.items() if key.startswith(name)]
+    return matches[0] if len(matches) == 1 else None
+
+def find_boss(stats, name):
+    """Boss rows (one per difficulty) whose name contains `name`, case-insensitive."""
+    name = name.strip().lower()
+    return [boss for boss in stats['bosses'] if name in boss['boss'].lower()]
@@ -0,0 +1,335 @@
+"""Synthetic raid-week generator for scale testing and benchmarks.
+
+Builds WarcraftLogs-shaped reports (fights, masterData, damage/healing tables,
+rankings and death events) for seeded, progressing raid teams, then runs them
+through fetch_data's own parser so the parsed_data rows are exactly what a real
+fetch would store:
+
+    python synthetic_data.py --weeks 26 --teams 2 --raiders 30 --pulls 200 --db synthetic.db
+"""
+import argparse
+import contextlib
+import io
+import random
+import string
+import sys
+from datetime import datetime, timedelta
+import config
+import database
+import fetch_data
+import progression
+
+# (class, spec, role) - tanks are ranked with DPS, as on WarcraftLogs
+SPECS = [
+    ('Warrior', 'Protection', 'Tank'), ('Paladin', 'Protection', 'Tank'), ('DeathKnight', 'Blood', 'Tank'),
+    ('DemonHunter', 'Vengeance', 'Tank'), ('Druid', 'Guardian', 'Tank'), ('Monk', 'Brewmaster', 'Tank'),
+    ('Priest', 'Holy', 'Healer'), ('Priest', 'Discipline', 'Healer'), ('Paladin', 'Holy', 'Healer'),
+    ('Druid', 'Restoration', 'Healer'), ('Shaman', 'Restoration', 'Healer'), ('Monk', 'Mistweaver', 'Healer'),
+    ('Evoker', 'Preservation', 'Healer'),
+    ('Mage', 'Fire', 'DPS'), ('Mage', 'Frost', 'DPS'), ('Mage', 'Arcane', 'DPS'),
+    ('Warlock', 'Destruction', 'DPS'), ('Warlock', 'Affliction', 'DPS'), ('Warlock', 'Demonology', 'DPS'),
+    ('Hunter', 'BeastMastery', 'DPS'), ('Hunter', 'Marksmanship', 'DPS'), ('Hunter', 'Survival', 'DPS'),
+    ('Rogue', 'Assassination', 'DPS'), ('Rogue', 'Outlaw', 'DPS'), ('Rogue', 'Subtlety', 'DPS'),
+    ('Warrior', 'Fury', 'DPS'), ('Warrior', 'Arms', 'DPS'), ('DeathKnight', 'Unholy', 'DPS'),
+    ('DeathKnight', 'Frost', 'DPS'), ('Paladin', 'Retribution', 'DPS'), ('Shaman', 'Elemental', 'DPS'),
+    ('Shaman', 'Enhancement', 'DPS'), ('Druid', 'Balance', 'DPS'), ('Druid', 'Feral', 'DPS'),
+    ('Priest', 'Shadow', 'DPS'), ('DemonHunter', 'Havoc', 'DPS'), ('Monk', 'Windwalker', 'DPS'),
+    ('Evoker', 'Devastation', 'DPS'), ('Evoker', 'Augmentation', 'DPS'),
+]
+
+# Per-second output of an average player on a pull, by role
+BASE_DPS = {'DPS': 950_000, 'Tank': 420_000, 'Healer': 120_000}
+BASE_HPS = {'DPS': 25_000, 'Tank': 60_000, 'Healer': 640_000}
+
+DIFFICULTY_IDS = {name: difficulty_id for difficulty_id, name in fetch_data.DIFFICULTY_MAP.items()}
+
+MECHANICS = [
+    'Shadow Eruption', 'Crushing Slam', 'Void Bolt', 'Searing Beam', 'Annihilate', 'Falling Debris',
+    'Soul Rend', 'Cosmic Barrage', 'Umbral Detonation', 'Blinding Light', 'Devouring Maw', 'Ashen Wake',
+]
+
+NAME_SYLLABLES = ['ka', 'thor', 'lyn', 'dra', 'vel', 'mor', 'sha', 'rin', 'zul', 'bel', 'tor', 'ael', 'nix', 'gor', 'wyn']
+
+def raider_name(rng, taken):
+    """A unique pronounceable character name."""
+    while True:
+        name = ''.join(rng.choice(NAME_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        if name not in taken:
+            taken.add(name)
+            return name
+
+def make_roster(rng, size=30):
+    """Roster of raiders with a fixed spec and skill (1.0 = average for their spec)."""
+    tanks = max(2, size // 15)
+    healers = max(2, size // 5)
+    roles = ['Tank'] * tanks + ['Healer'] * healers + ['DPS'] * (size - tanks - healers)
+    taken = set()
+    roster = []
+    for actor_id, role in enumerate(roles, start=1):
+        player_class, spec, _ = rng.choice([s for s in SPECS if s[2] == role])
+        roster.append({
+            'id': actor_id,
+            'name': raider_name(rng, taken),
+            'class': player_class,
+            'spec': spec,
+            'role': role,
+            'skill': min(max(rng.gauss(1.0, 0.12), 0.6), 1.4),
+        })
+    return roster
+
+def boss_mechanics(boss_index):
+    """(ability_id, ability_name) pairs that kill players on a boss."""
+    return [
+        (1_200_000 + boss_index * 10 + k, MECHANICS[(boss_index * 3 + k) % len(MECHANICS)])
+        for k in range(4)
+    ]
+
+def report_code(rng):
+    return ''.join(rng.choice(string.ascii_letters + string.digits) for _ in range(16))
+
+class SyntheticTeam:
+    """A raid team that learns each boss over the weeks it pulls it."""
+
+    def __init__(self, seed=0, raiders=30, bosses=None, difficulty='Heroic', guild_name='SyntheticGuild',
+                 tenant_key=None, pulls_to_learn=12):
+        self.rng = random.Random(seed)
+        self.roster = make_roster(self.rng, raiders)
+        self.bosses = list(bosses or fetch_data.BOSS_FILTER)
+        self.difficulty = difficulty
+        self.guild_name = guild_name
+        self.tenant_key = tenant_key
+        # Pulls needed for a reasonable kill chance grows with boss order
+        self.pulls_needed = {boss: pulls_to_learn * (i + 1) for i, boss in enumerate(self.bosses)}
+        self.learned = {boss: 0 for boss in self.bosses}
+
+    def kill_chance(self, boss):
+        progress = self.learned[boss] / self.pulls_needed[boss]
+        return min(max(progress * progress, 0.02), 0.95)
+
+    def fight_details(self, boss_index, fight, attending):
+        """Damage/healing tables, rankings and death events for one pull."""
+        rng = self.rng
+        duration_s = (fight['endTime'] - fight['startTime']) / 1000
+        mechanics = boss_mechanics(boss_index)
+        damage, healing, rankings = [], [], {'tanks': [], 'dps': [], 'healers': []}
+
+        for raider in attending:
+            performance = raider['skill'] * rng.gauss(1.0, 0.08)
+            icon = f"{raider['class']}-{raider['spec']}"
+            damage.append({'name': raider['name'], 'type': raider['class'], 'icon': icon,
+                           'total': int(BASE_DPS[raider['role']] * performance * duration_s)})
+            healing.append({'name': raider['name'], 'type': raider['class'], 'icon': icon,
+                            'total': int(BASE_HPS[raider['role']] * performance * duration_s)})
+            percentile = min(max(50 + (performance - 1.0) * 220 + rng.gauss(0, 6), 1), 100)
+            role_key = {'Tank': 'tanks', 'Healer': 'healers', 'DPS': 'dps'}[raider['role']]
+            rankings[role_key].append({'name': raider['name'], 'rankPercent': round(percentile, 1)})
+
+        # Wipes end with most of the raid dead, kills cost a couple of players at most
+        death_count = rng.randint(0, 3) if fight['kill'] else rng.randint(len(attending) // 3, len(attending))
+        victims = rng.sample(attending, min(death_count, len(attending)))
+        deaths = []
+        for i, raider in enumerate(victims):
+            ability_id = 0 if rng.random() < 0.03 else rng.choice(mechanics)[0]
+            # After the first couple of deaths a wipe cascades through the rest of the raid
+            earliest = fight['startTime'] if fight['kill'] or i < 2 else max(fight['startTime'], fight['endTime'] - 15000)
+            deaths.append({
+                'targetID': raider['id'],
+                'killingAbilityGameID': ability_id,
+                'timestamp': rng.randint(earliest, fight['endTime']),
+            })
+        deaths.sort(key=lambda death: death['timestamp'])
+
+        return {
+            'table': {'data': {'entries': damage}},
+            'healingTable': {'data': {'entries': healing}},
+            'rankings': {'data': [{'roles': {k: {'characters': v} for k, v in rankings.items()}}] if fight['kill'] else []},
+            'deaths': {'data': deaths},
+        }
+
+    def raid_night(self, night_start, pulls):
+        """One night's report with `pulls` boss pulls, progressing through the bosses in order.
+
+        Returns a dict with the report (as GUILD_REPORTS_QUERY + fights return it),
+        its masterData and the FIGHT_DETAILS_QUERY result for every fight.
+        """
+        rng = self.rng
+        attending = [raider for raider in self.roster if rng.random() < 0.92] or self.roster
+        difficulty_id = DIFFICULTY_IDS[self.difficulty]
+        fights, details, killed = [], {}, set()
+        clock_ms = 0
+
+        for fight_id in range(1, pulls + 1):
+            boss_index = next((i for i, boss in enumerate(self.bosses) if boss not in killed), None)
+            if boss_index is None:  # full clear - start another run through
+                killed.clear()
+                boss_index = 0
+            boss = self.bosses[boss_index]
+
+            kill = rng.random() < self.kill_chance(boss)
+            self.learned[boss] += 1
+            duration_ms = rng.randint(300_000, 420_000) if kill else rng.randint(45_000, 360_000)
+            progress = self.learned[boss] / self.pulls_needed[boss]
+            boss_hp = 0.0 if kill else round(min(max((1 - progress) * 100 * rng.uniform(0.6, 1.1), 0.5), 100), 2)
+            fight = {
+                'id': fight_id,
+                'encounterID': 3000 + boss_index,
+                'name': boss,
+                'difficulty': difficulty_id,
+                'kill': kill,
+                'fightPercentage': boss_hp,
+                'lastPhase': 1 + (boss_hp < 70) + (boss_hp < 35),  # three phases, split by boss health
+                'startTime': clock_ms,
+                'endTime': clock_ms + duration_ms,
+            }
+            fights.append(fight)
+            details[fight_id] = self.fight_details(boss_index, fight, attending)
+            if kill:
+                killed.add(boss)
+            clock_ms += duration_ms + rng.randint(60_000, 150_000)
+
+        start_ms = int(night_start.timestamp() * 1000)
+        abilities = [
+            {'gameID': ability_id, 'name': name}
+            for i in range(len(self.bosses)) for ability_id, name in boss_mechanics(i)
+        ]
+        return {
+            'report': {
+                'code': report_code(rng),
+                'title': f"{self.guild_name} {self.difficulty} {night_start:%Y-%m-%d}",
+                'owner': {'name': self.guild_name},
+                'startTime': start_ms,
+                'endTime': start_ms + clock_ms,
+                'zone': {'name': 'Synthetic Raid'},
+                'fights': fights,
+            },
+            'masterData': {
+                'actors': [{'id': r['id'], 'name': r['name'], 'type': 'Player', 'subType': r['class']} for r in self.roster],
+                'abilities': abilities,
+            },
+            'details': details,
+        }
+
+    def raid_week(self, week_start, pulls=120, nights=2):
+        """Raid-night reports for a week starting on `week_start` (a Wednesday)."""
+        night_offsets = [0, 1, 5, 6, 2, 3, 4][:max(1, min(nights, 7))]
+        per_night = [pulls // len(night_offsets) + (1 if i < pulls % len(night_offsets) else 0)
+                     for i in range(len(night_offsets))]
+        return [
+            self.raid_night(week_start.replace(hour=20, minute=0, second=0, microsecond=0) + timedelta(days=offset), count)
+            for offset, count in zip(night_offsets, per_night) if count
+        ]
+
+def parse_reports(reports, tenant_key=None):
+    """Turn synthetic reports into parsed_data with fetch_data's parser (its progress output is discarded)."""
+    parsed_data = fetch_data.new_parsed_data()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for night in reports:
+            report = night['report']
+            actor_map, ability_map = fetch_data.parse_actor_mappings({'reportData': {'report': {'masterData': night['masterData']}}})
+            parsed_data['raids'].append(fetch_data.new_raid_data(report, {'key': tenant_key}))
+            for fight in report['fights']:
+                fetch_data.parse_fight(report, fight, night['details'][fight['id']], actor_map, ability_map, parsed_data)
+    return parsed_data
+
+def graphql_responder(nights):
+    """Stand-in for the WarcraftLogs GraphQL endpoint that serves synthetic raid nights.
+
+    Returns respond(query, variables), answering the report list, fight list,
+    live fight window, masterData and fight details queries fetch_data makes -
+    enough to record a fixture set for replay benchmarks.
+    """
+    by_code = {night['report']['code']: night for night in nights}
+
+    def respond(query, variables=None):
+        variables = variables or {}
+        if 'reports(' in query:
+            start, end = variables.get('startTime') or 0, variables.get('endTime') or float('inf')
+            reports = [
+                {key: value for key, value in night['report'].items() if key != 'fights'}
+                for night in nights if start <= night['report']['startTime'] <= end
+            ]
+            return {'reportData': {'reports': {'data': reports, 'has_more_pages': False}}}
+        if 'fights(killType' in query:
+            return {'reportData': {
+                alias.replace('c', 'r', 1): {'fights': by_code[code]['report']['fights']}
+                for alias, code in variables.items()
+            }}
+        if 'fights(fightIDs' in query:
+            report = by_code[variables['code']]['report']
+            wanted = set(variables['fightIDs'])
+            return {'reportData': {'report': {
+                **{key: value for key, value in report.items() if key != 'fights'},
+                'fights': [fight for fight in report['fights'] if fight['id'] in wanted],
+            }}}
+        if 'masterData' in query:
+            return {'reportData': {'report': {'masterData': by_code[variables['code']]['masterData']}}}
+        details = by_code[variables['code']]['details']
+        return {'reportData': {'report': details[variables['fightIDs'][0]]}}
+
+    return respond
+
+def last_wednesday(now=None):
+    """Midnight at the start of the raid week the reports cover (database.current_week_range).
+
+    On a Wednesday that is the previous Wednesday, so generated weeks land
+    where main.py and the slides look for them.
+    """
+    return datetime.fromtimestamp(database.current_week_range(now)[0] / 1000)
+
+def generate_season(weeks=1, teams=1, raiders=30, pulls=120, nights=2, difficulty='Heroic', seed=0, end_week=None):
+    """Yield (tenant_key, week_start, reports) for every team and week, oldest week first.
+
+    With one team the tenant key is None (the classic single-team run); with more,
+    teams are keyed team-1, team-2, ... so they can be rendered separately.
+    """
+    end_week = end_week or last_wednesday()
+    first_week = end_week - timedelta(weeks=weeks - 1)
+    squads = [
+        SyntheticTeam(seed=seed * 1000 + t, raiders=raiders, difficulty=difficulty,
+                      guild_name=f'SyntheticGuild{t + 1}' if teams > 1 else 'SyntheticGuild',
+                      tenant_key=f'team-{t + 1}' if teams > 1 else None)
+        for t in range(teams)
+    ]
+    for w in range(weeks):
+        week_start = first_week + timedelta(weeks=w)
+        for squad in squads:
+            yield squad.tenant_key, week_start, squad.raid_week(week_start, pulls, nights)
+
+def generate_week(raiders=30, pulls=120, nights=2, difficulty='Heroic', seed=0, week_start=None, tenant_key=None):
+    """parsed_data for a single synthetic raid week."""
+    team = SyntheticTeam(seed=seed, raiders=raiders, difficulty=difficulty, tenant_key=tenant_key)
+    return parse_reports(team.raid_week(week_start or last_wednesday(), pulls, nights), tenant_key)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fill a database with synthetic raid weeks.')
+    parser.add_argument('--weeks', type=int, default=1, help='raid weeks to generate, ending with the current one')
+    parser.add_argument('--teams', type=int, default=1, help='raid teams (tenants team-1, team-2, ... when > 1)')
+    parser.add_argument('--raiders', type=int, default=30, help='roster size per team')
+    parser.add_argument('--pulls', type=int, default=120, help='boss pulls per team per week')
+    parser.add_argument('--nights', type=int, default=2, help='raid nights per week')
+    parser.add_argument('--difficulty', default='Heroic', choices=sorted(DIFFICULTY_IDS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--db', help=f'database to fill (default {config.DATABASE_PATH})')
+    args = parser.parse_args(argv)
+
+    if args.db:
+        config.DATABASE_PATH = args.db
+    database.init_database()
+
+    raids = pulls = 0
+    for tenant_key, week_start, reports in generate_season(args.weeks, args.teams, args.raiders, args.pulls,
+                                                           args.nights, args.difficulty, args.seed):
+        parsed_data = parse_reports(reports, tenant_key)
+        with contextlib.redirect_stdout(io.StringIO()):
+            database.store_parsed_data(parsed_data)
+            progression.update_progression([raid['raid_id'] for raid in parsed_data['raids']])
+        raids += len(parsed_data['raids'])
+        pulls += len(parsed_data['encounters'])
+        print(f"  {tenant_key or 'default'} week of {week_start:%Y-%m-%d}: {len(parsed_data['encounters'])} pulls, "
+              f"{len(parsed_data['players'])} player rows, {len(parsed_data['deaths'])} deaths")
+
+    print(f"✓ Stored {raids} synthetic raid(s), {pulls} pulls in {config.DATABASE_PATH}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())